@@ -1,10 +1,70 @@
 from fastapi import Header, HTTPException
 from jose import jwt, JWTError
 from jose.exceptions import ExpiredSignatureError
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
+import time
 from app.config import settings
 
+
+# ✅ 검증 완료 토큰 캐시 (토큰 → (sub, exp))
+#   - jwt.decode로 서명/클레임 검증에 성공한 토큰만 저장
+#   - exp가 지나면 조회 시점에 제거 → 만료 토큰은 다시 decode 경로로 가서 401
+#   - 크기 상한 초과 시 가장 오래 안 쓰인 항목부터 제거 (LRU)
+class VerifiedTokenCache:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evicted = 0
+
+    def get(self, token: str, now: Optional[float] = None) -> Optional[str]:
+        entry = self._data.get(token)
+        if entry is None:
+            self.misses += 1
+            return None
+        sub, exp = entry
+        if exp <= (now or time.time()):
+            del self._data[token]
+            self.expired += 1
+            self.misses += 1
+            return None
+        self._data.move_to_end(token)
+        self.hits += 1
+        return sub
+
+    def put(self, token: str, sub: str, exp: float) -> None:
+        if self.max_entries <= 0:
+            return
+        self._data[token] = (sub, exp)
+        self._data.move_to_end(token)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+            self.evicted += 1
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._data),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "expired": self.expired,
+            "evicted": self.evicted,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+token_cache = VerifiedTokenCache(settings.jwt_cache_max_entries)
+
+
+def get_token_cache_stats() -> Dict[str, Any]:
+    return token_cache.stats()
+
+
 # ✅ JWT 토큰 생성
 def create_access_token(
     user: Dict[str, Any],
@@ -37,6 +97,11 @@ async def get_current_user_id(authorization: str = Header(...)) -> str:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        # 이미 검증한 토큰이면 decode 생략 (만료 시각 전까지만)
+        cached_sub = token_cache.get(token)
+        if cached_sub:
+            return cached_sub
+
         payload = jwt.decode(
             token,
             settings.jwt_secret,
@@ -55,6 +120,11 @@ async def get_current_user_id(authorization: str = Header(...)) -> str:
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
+        # exp가 있는 토큰만 캐시 (만료 시각에 맞춰 제거 가능해야 함)
+        exp = payload.get("exp")
+        if isinstance(exp, (int, float)):
+            token_cache.put(token, user_id, float(exp))
+
         return user_id
 
     except ExpiredSignatureError:
@@ -6,8 +6,110 @@ class Settings(BaseSettings):
     jwt_secret: str
     jwt_algorithm: str = "HS256"
     access_token_expire_minutes: int = 60
+    jwt_cache_max_entries: int = 10000       # 검증 완료 토큰 캐시 크기 (0이면 비활성)
     openai_api_key: str
 
+    # ---- MongoDB 커넥션 풀 (Atlas 커넥션 한도에 맞춰 조정)
+    mongo_max_pool_size: int = 50
+    mongo_min_pool_size: int = 5
+    mongo_max_idle_time_ms: int | None = 300000
+    mongo_wait_queue_timeout_ms: int | None = 5000   # 풀 고갈 시 대기 상한
+    mongo_compressors: str | None = None              # 예: "zstd,zlib" (zstd는 zstandard 패키지 필요)
+    mongo_prewarm_connections: int | None = None      # None이면 mongo_min_pool_size만큼 미리 연결
+
+    # ---- OpenAI 호출 튜닝 (비동기 클라이언트 / 동시성 제한)
+    openai_model: str = "gpt-4o"
+    openai_base_url: str | None = None       # 로컬 가짜 서버/프록시 테스트용
+    llm_max_concurrency: int = 32            # 워커당 동시에 진행할 수 있는 LLM 호출 수
+    llm_timeout_seconds: float = 20.0        # 호출 1건당 타임아웃
+    llm_max_connections: int = 64            # httpx 커넥션 풀 크기 (keep-alive 재사용)
+    llm_max_retries: int = 1
+
+    # ---- 감정 분석 출력 형식 ("json_schema" | "json_object" | "text")
+    analysis_output_mode: str = "json_schema"
+    analysis_max_output_tokens: int = 300     # 판정 3필드 + 짧은 문장 2개면 충분
+
+    # ---- 감정 분석 LLM 보호 (차단기 / 지연 SLO / 헤징)
+    analysis_timeout_seconds: float = 12.0   # 분석 1건 전체 상한 (헤지 포함)
+    llm_slo_seconds: float = 8.0             # 성공해도 이보다 느리면 차단기에는 실패로 집계
+    llm_breaker_window: int = 20             # 최근 N건 기준 실패율
+    llm_breaker_min_calls: int = 5
+    llm_breaker_failure_rate: float = 0.5
+    llm_breaker_open_seconds: float = 30.0
+    llm_hedge_enabled: bool = False          # p95를 넘긴 요청에 두 번째 요청 (비용 최대 2배)
+    llm_hedge_quantile: float = 0.95
+    llm_hedge_min_delay_seconds: float = 1.0
+
+    # ---- 로컬 감정 분류기 (scripts/train_emotion_classifier.py로 학습, 미지정 시 LLM만 사용)
+    emotion_classifier_path: str | None = None
+    emotion_classifier_min_confidence: float = 0.9
+
+    # ---- 감정 분석 파이프라인 ("sync": 요청 안에서 분석 / "deferred": 저장 후 백그라운드 분석)
+    analysis_mode: str = "sync"
+    analysis_workers: int = 4                 # 워커(프로세스)당 분석 코루틴 수
+    analysis_max_attempts: int = 5
+    analysis_job_lease_seconds: int = 120     # 작업 점유 시간 (워커 비정상 종료 시 재할당)
+    analysis_poll_interval_seconds: float = 2.0
+    import_analysis_rate_per_sec: float = 1.0 # 가져온 일기의 감정 분석 예약 속도
+    import_batch_size: int = 500
+    import_max_rows: int = 5000
+    import_max_bytes: int = 10 * 1024 * 1024
+
+    # ---- 동기 분석 입장 제어 (POST /diary/diary, sync 모드)
+    admission_enabled: bool = True
+    admission_user_rate_per_min: float = 10.0     # 사용자별 분당 분석 요청 수 (0이면 제한 없음)
+    admission_user_burst: int = 5
+    admission_max_in_flight: int = 32             # 워커당 동시에 분석 중인 요청 수
+    admission_max_queue: int = 64                 # 입장 대기 상한 (초과 시 즉시 거절)
+    admission_queue_timeout_seconds: float = 2.0
+    admission_overload_action: str = "defer"      # 과부하 시 "reject"(429) | "defer"(지연 분석으로 저장)
+
+    # ---- 감정 분석 결과 캐시 (메모리 LRU + Mongo TTL)
+    analysis_cache_enabled: bool = True
+    analysis_cache_max_entries: int = 2048
+    analysis_cache_ttl_seconds: int = 60 * 60 * 24 * 30
+
+    # ---- argon2 비밀번호 해시 (None이면 passlib 기본값)
+    argon2_time_cost: int | None = None
+    argon2_memory_cost: int | None = None     # KiB
+    argon2_parallelism: int | None = None
+    password_hash_workers: int = 4            # 해시/검증 전용 스레드 수
+    password_hash_max_queue: int = 64         # 초과 시 503
+
+    # ---- 일기 목록 페이지네이션
+    diary_page_default_size: int = 20
+    diary_page_max_size: int = 100
+    diary_range_max_days: int = 92          # GET /diary/range 한 번에 조회 가능한 최대 일수
+
+    # ---- 본문 검색 (n-gram 역색인)
+    search_default_limit: int = 20
+    search_max_limit: int = 50
+    search_min_match_ratio: float = 0.5     # 질의 n-gram 중 이 비율 이상 일치해야 결과에 포함
+
+    # ---- 비슷한 일기 (로컬 해시 n-gram TF-IDF 벡터)
+    similar_vector_dim: int = 512            # 바꾸면 scripts/diary_vectors.py rebuild 필요
+    similar_default_limit: int = 5
+    similar_max_limit: int = 20
+    similar_min_score: float = 0.1
+    similar_cache_max_users: int = 256       # 사용자별 행렬 캐시 (프로세스 내 LRU)
+    similar_cache_max_mb: int = 256
+
+    # ---- 통계/안전 응답 캐시 ("memory" | "mongo" | "off")
+    response_cache_backend: str = "memory"
+    response_cache_max_entries: int = 10000
+    response_cache_ttl_seconds: int = 600
+
+    # ---- 지표 (GET /metrics, Prometheus 텍스트 형식)
+    metrics_enabled: bool = True
+    metrics_mongo_commands: bool = True       # MongoDB 명령별 소요 시간 (CommandListener)
+
+    # ---- 로그 (큐 + 전용 스레드, JSON 한 줄)
+    log_level: str = "INFO"
+    log_format: str = "json"                  # "json" | "text"(로컬 개발용)
+    log_queue_size: int = 10000               # 가득 차면 버림 (요청을 막지 않음)
+    log_hot_sample_rate: float = 0.1          # 요청마다 나오는 INFO 이하 이벤트(access, LLM 응답 등) 기록 비율
+    log_redact_fields: str = "text,feedback,reason,content,password,token,authorization"
+
     class Config:
         env_file = ".env"
         extra ="allow"
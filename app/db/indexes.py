@@ -0,0 +1,97 @@
+# app/db/indexes.py
+import logging
+from typing import Dict, List
+
+from pymongo import IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# ==================================================
+# ✅ 인덱스 관리자
+#   - 각 모델 모듈의 INDEXES 선언을 모아 startup에서 생성/조정
+#   - 이미 같은 정의가 있으면 건너뜀 (멱등)
+#   - 같은 이름/같은 키인데 옵션이 다르면 삭제 후 재생성
+# ==================================================
+_OPTION_KEYS = ("unique", "sparse", "expireAfterSeconds", "partialFilterExpression")
+
+
+def declared_indexes() -> Dict[str, List[IndexModel]]:
+    """컬렉션명 → IndexModel 목록"""
+    import app.models.diary as diary_model
+    import app.models.user as user_model
+    import app.models.analysis_job as job_model
+    import app.models.rollup as rollup_model
+    import app.models.search_index as search_index
+    import app.models.diary_vector as vector_model
+    import app.services.analysis_cache as analysis_cache
+    import app.services.response_cache as response_cache
+
+    return {
+        "diaries": diary_model.INDEXES,
+        "users": user_model.INDEXES,
+        "analysis_jobs": job_model.INDEXES,
+        rollup_model.ROLLUP_COLLECTION: rollup_model.INDEXES,
+        search_index.SEARCH_COLLECTION: search_index.INDEXES,
+        vector_model.VECTOR_COLLECTION: vector_model.INDEXES,
+        analysis_cache.CACHE_COLLECTION: analysis_cache.INDEXES,
+        response_cache.RESPONSE_CACHE_COLLECTION: response_cache.INDEXES,
+    }
+
+
+def _key_of(spec) -> list:
+    return [(k, int(v) if isinstance(v, (int, float)) else v) for k, v in spec]
+
+
+def _matches(existing: dict, wanted: dict) -> bool:
+    if _key_of(existing["key"]) != _key_of(wanted["key"].items()):
+        return False
+    return all(existing.get(k) == wanted.get(k) for k in _OPTION_KEYS)
+
+
+async def _reconcile_collection(col, models: List[IndexModel]) -> Dict[str, str]:
+    results: Dict[str, str] = {}
+    existing = await col.index_information()
+
+    for model in models:
+        wanted = model.document
+        name = wanted["name"]
+
+        if name in existing and _matches(existing[name], wanted):
+            results[name] = "ok"
+            continue
+
+        # 이름이 같거나 키가 같은 기존 인덱스는 정의가 달라졌으므로 교체
+        stale = [
+            n for n, info in existing.items()
+            if n != "_id_" and (n == name or _key_of(info["key"]) == _key_of(wanted["key"].items()))
+        ]
+        try:
+            for n in stale:
+                await col.drop_index(n)
+            await col.create_indexes([model])
+            results[name] = "replaced" if stale else "created"
+        except OperationFailure as e:
+            # 예: unique 인덱스인데 중복 데이터가 있음 → 서버 기동은 계속
+            results[name] = f"failed: {e.details.get('errmsg', str(e)) if e.details else e}"
+            logger.warning("인덱스 생성 실패 %s.%s: %s", col.name, name, results[name])
+
+    return results
+
+
+async def ensure_indexes(db) -> Dict[str, Dict[str, str]]:
+    """모든 선언 인덱스를 생성/조정하고 컬렉션별 결과를 반환"""
+    if db is None:
+        raise RuntimeError("❌ MongoDB 연결 전 상태입니다. connect_to_mongo() 실행 필요")
+
+    report: Dict[str, Dict[str, str]] = {}
+    for coll_name, models in declared_indexes().items():
+        report[coll_name] = await _reconcile_collection(db[coll_name], models)
+
+    changed = {
+        c: {n: r for n, r in res.items() if r != "ok"}
+        for c, res in report.items()
+    }
+    changed = {c: r for c, r in changed.items() if r}
+    logger.info("인덱스 확인 완료", extra={"fields": {"changed": changed}})
+    return report
@@ -1,19 +1,165 @@
 # app/db/mongo.py
+import asyncio
+import logging
 import os
+import threading
+from collections import deque
+
 import certifi
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
 from pymongo.server_api import ServerApi
 from pymongo.errors import ServerSelectionTimeoutError, ConfigurationError
 from dotenv import load_dotenv
 
+from app.config import settings
+from app.services import metrics
+
+logger = logging.getLogger(__name__)
+
 load_dotenv()
 
-MONGO_URI = os.getenv("MONGO_URI")  # Render에서도 동일한 키로 설정
+MONGO_URI = os.getenv("MONGO_URI") or os.getenv("MONGODB_URI")  # Render에서도 동일한 키로 설정
 DB_NAME = os.getenv("MONGODB_DB", "diary")  # URI와 통일
 
+# 워커(프로세스)당 단 하나의 클라이언트/커넥션 풀
 client: AsyncIOMotorClient | None = None
 db = None
 
+
+# ==================================================
+# ✅ 커넥션 풀 통계 (체크아웃 대기 시간 등)
+#   - pymongo 풀 이벤트는 드라이버 스레드에서 호출되므로 락으로 보호
+# ==================================================
+class PoolStatsListener(monitoring.ConnectionPoolListener):
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._recent_waits = deque(maxlen=1024)  # 최근 체크아웃 대기(ms)
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checkouts = 0
+            self.checkout_failures = 0
+            self.checked_out = 0
+            self.total_wait_ms = 0.0
+            self.max_wait_ms = 0.0
+            self.connections_created = 0
+            self.connections_closed = 0
+            self._recent_waits.clear()
+
+    # --- 체크아웃/반납
+    def connection_check_out_started(self, event):
+        pass
+
+    def connection_checked_out(self, event):
+        wait_ms = (getattr(event, "duration", 0.0) or 0.0) * 1000
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.total_wait_ms += wait_ms
+            self.max_wait_ms = max(self.max_wait_ms, wait_ms)
+            self._recent_waits.append(wait_ms)
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out = max(0, self.checked_out - 1)
+
+    # --- 커넥션 생성/종료
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        with self._lock:
+            self.connections_closed += 1
+
+    # --- 풀 수명주기
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._recent_waits)
+            p95 = waits[int(len(waits) * 0.95) - 1] if waits else 0.0
+            return {
+                "max_pool_size": settings.mongo_max_pool_size,
+                "min_pool_size": settings.mongo_min_pool_size,
+                "open_connections": self.connections_created - self.connections_closed,
+                "checked_out": self.checked_out,
+                "checkouts": self.checkouts,
+                "checkout_failures": self.checkout_failures,
+                "avg_wait_ms": round(self.total_wait_ms / self.checkouts, 3) if self.checkouts else 0.0,
+                "p95_wait_ms": round(p95, 3),
+                "max_wait_ms": round(self.max_wait_ms, 3),
+            }
+
+
+pool_stats = PoolStatsListener()
+
+
+# ==================================================
+# ✅ 명령별 소요 시간 (컬렉션 × 명령 이름)
+#   - 시작 이벤트에서 컬렉션 이름만 기억 → 완료/실패 이벤트의 duration_micros 사용
+#   - 기록은 metrics의 스레드별 샤드 → 드라이버 스레드에서도 락 없음
+# ==================================================
+mongo_command_duration = metrics.histogram(
+    "mongo_command_duration_seconds", "MongoDB 명령 소요 시간", ("collection", "command"), buckets=metrics.DB_BUCKETS,
+)
+mongo_command_failures = metrics.counter(
+    "mongo_command_failures_total", "실패한 MongoDB 명령 수", ("collection", "command"),
+)
+
+# 컬렉션 이름이 첫 필드 값이 아닌 명령
+_COLLECTION_FIELD = {"getMore": "collection"}
+_SKIP_COMMANDS = {"ping", "hello", "isMaster", "ismaster", "endSessions", "saslStart", "saslContinue", "buildInfo"}
+
+
+class CommandMetricsListener(monitoring.CommandListener):
+    def __init__(self):
+        self._collections: dict = {}   # (request_id, connection_id) → 컬렉션 (dict 단일 연산은 GIL로 원자적)
+
+    def started(self, event):
+        if event.command_name in _SKIP_COMMANDS:
+            return
+        field = _COLLECTION_FIELD.get(event.command_name, event.command_name)
+        coll = event.command.get(field)
+        self._collections[(event.request_id, event.connection_id)] = coll if isinstance(coll, str) else "-"
+
+    def _finish(self, event, failed: bool):
+        coll = self._collections.pop((event.request_id, event.connection_id), None)
+        if coll is None:
+            return
+        mongo_command_duration.observe(event.duration_micros / 1e6, coll, event.command_name)
+        if failed:
+            mongo_command_failures.inc(coll, event.command_name)
+
+    def succeeded(self, event):
+        self._finish(event, False)
+
+    def failed(self, event):
+        self._finish(event, True)
+
+
+command_metrics = CommandMetricsListener()
+
+
 def _assert_env():
     if not MONGO_URI:
         raise RuntimeError(
@@ -24,6 +170,42 @@ def _assert_env():
             "Atlas SRV URI가 아닙니다. mongodb+srv:// 형태로 넣어주세요."
         )
 
+
+def _pool_options() -> dict:
+    opts = {
+        "maxPoolSize": settings.mongo_max_pool_size,
+        "minPoolSize": settings.mongo_min_pool_size,
+    }
+    if settings.mongo_max_idle_time_ms is not None:
+        opts["maxIdleTimeMS"] = settings.mongo_max_idle_time_ms
+    if settings.mongo_wait_queue_timeout_ms is not None:
+        opts["waitQueueTimeoutMS"] = settings.mongo_wait_queue_timeout_ms
+    if settings.mongo_compressors:
+        opts["compressors"] = settings.mongo_compressors
+    return opts
+
+
+def get_db():
+    if db is None:
+        raise RuntimeError("❌ MongoDB 연결 전 상태입니다. connect_to_mongo() 실행 필요")
+    return db
+
+
+async def _prewarm(n: int) -> None:
+    """동시 ping으로 커넥션을 n개까지 미리 맺어 첫 요청의 TLS 핸드셰이크 지연 제거"""
+    if n <= 1:
+        return
+    await asyncio.gather(*(client.admin.command("ping") for _ in range(n)), return_exceptions=True)
+
+
+_CONNECT_CHECKLIST = [
+    "Atlas Network Access에 Render Outbound IP 또는 0.0.0.0/0 추가",
+    "requirements.txt: motor/pymongo/dnspython/certifi 최신",
+    "MONGO_URI 값 정확, 특수문자 인코딩, 공백/따옴표 없음",
+    "tlsCAFile=certifi.where() 지정",
+]
+
+
 async def connect_to_mongo():
     global client, db
     _assert_env()
@@ -40,27 +222,34 @@ async def connect_to_mongo():
             connectTimeoutMS=5000,
             socketTimeoutMS=20000,
             retryWrites=True,
+            event_listeners=[pool_stats, command_metrics] if settings.metrics_mongo_commands else [pool_stats],
+            **_pool_options(),
         )
 
         # 서버 선택(핸드셰이크) 단계에서 빨리 실패하도록 ping 수행
         await client.admin.command("ping")
 
+        prewarm = settings.mongo_prewarm_connections
+        await _prewarm(settings.mongo_min_pool_size if prewarm is None else prewarm)
+
         db = client[DB_NAME]
-        print(f"✅ MongoDB Atlas 연결 성공: DB={DB_NAME}, CA={certifi.where()}")
+        logger.info("MongoDB Atlas 연결 성공", extra={"fields": {
+            "db": DB_NAME,
+            "ca": certifi.where(),
+            "pool_min": settings.mongo_min_pool_size,
+            "pool_max": settings.mongo_max_pool_size,
+        }})
     except (ServerSelectionTimeoutError, ConfigurationError) as e:
-        print("❌ MongoDB 연결 실패(ServerSelection):", str(e))
-        print("   - 체크리스트:")
-        print("     1) Atlas Network Access에 Render Outbound IP 또는 0.0.0.0/0 추가")
-        print("     2) requirements.txt: motor/pymongo/dnspython/certifi 최신")
-        print("     3) MONGO_URI 값 정확, 특수문자 인코딩, 공백/따옴표 없음")
-        print("     4) tlsCAFile=certifi.where() 지정")
+        logger.error("MongoDB 연결 실패(ServerSelection): %s", e, extra={"fields": {"checklist": _CONNECT_CHECKLIST}})
         raise
     except Exception as e:
-        print("❌ MongoDB 연결 실패(기타):", str(e))
+        logger.error("MongoDB 연결 실패(기타): %s", e)
         raise
 
 async def close_mongo_connection():
-    global client
+    global client, db
     if client:
         client.close()
-        print("❎ MongoDB 연결 종료")
+        client = None
+        db = None
+        logger.info("MongoDB 연결 종료")
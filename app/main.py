@@ -1,4 +1,5 @@
 # app/main.py
+import logging
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.openapi.utils import get_openapi
@@ -6,14 +7,23 @@ from dotenv import load_dotenv
 import importlib.metadata as md
 
 
+from app.config import settings
+from app.services.metrics import MetricsMiddleware
+from app.services.structured_log import RequestIdMiddleware, setup_logging, shutdown_logging
+
 # MongoDB 연결 관련
 from app.db.mongo import connect_to_mongo, close_mongo_connection
+from app.services.llm_client import close_llm_client
 
 # -----------------------------------------------------
 # 환경 변수 로드
 # -----------------------------------------------------
 load_dotenv()
 
+# 구조화 로그 (큐 + 전용 스레드) — 다른 모듈이 로그를 남기기 전에 설치
+setup_logging()
+logger = logging.getLogger("app.main")
+
 app = FastAPI(title="Emotion Diary API")
 
 # -----------------------------------------------------
@@ -27,6 +37,15 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# -----------------------------------------------------
+# 요청 지표 (GET /metrics) — 순수 ASGI 미들웨어
+# -----------------------------------------------------
+if settings.metrics_enabled:
+    app.add_middleware(MetricsMiddleware)
+
+# 요청 ID (X-Request-ID) — 가장 바깥에 두어 모든 로그에 요청 ID가 붙도록
+app.add_middleware(RequestIdMiddleware)
+
 # -----------------------------------------------------
 # 기본 라우트
 # -----------------------------------------------------
@@ -50,11 +69,7 @@ def _ver(pkg: str) -> str:
 @app.on_event("startup")
 async def startup():
     # 패키지 버전 출력(디버깅용)
-    print(
-        "[versions]",
-        "passlib=", _ver("passlib"),
-        "argon2-cffi=", _ver("argon2-cffi"),
-    )
+    logger.info("versions", extra={"fields": {"passlib": _ver("passlib"), "argon2-cffi": _ver("argon2-cffi")}})
 
     # DB 연결
     await connect_to_mongo()
@@ -71,11 +86,29 @@ async def startup():
     app.include_router(stats.router)              # prefix는 /stats (routes 내부에서 지정)
     app.include_router(resources.router)          # prefix는 /resources (routes 내부에서 지정)
     app.include_router(safety.router)              # prefix는 /safety (routes 내부에서 지정)
+    if settings.metrics_enabled:
+        from app.routes.metrics import router as metrics_router
+        app.include_router(metrics_router, tags=["Health"])
+
+    # 모델별로 선언된 인덱스 생성/조정 (멱등)
+    from app.db.indexes import ensure_indexes
+    import app.db.mongo as mongo
+    await ensure_indexes(mongo.db)
+
+    # 지연 분석 모드용 백그라운드 워커 (analysis_workers=0 이면 비활성)
+    from app.services.analysis_worker import start_analysis_workers
+    await start_analysis_workers()
 
 @app.on_event("shutdown")
 async def shutdown():
+    from app.services.analysis_worker import stop_analysis_workers
+    await stop_analysis_workers()
+    await close_llm_client()
+    from app.services.password_hasher import shutdown_hasher
+    shutdown_hasher()
     await close_mongo_connection()
-    print("❎ MongoDB 연결 해제")
+    logger.info("MongoDB 연결 해제")
+    shutdown_logging()
 
 # -----------------------------------------------------
 # Swagger (OpenAPI) JWT 인증 설정
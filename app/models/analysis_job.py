@@ -0,0 +1,126 @@
+# app/models/analysis_job.py
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, IndexModel, ReturnDocument
+from pymongo.errors import BulkWriteError
+
+import app.db.mongo as mongo
+
+# ==================================================
+# ✅ 감정 분석 작업 큐 (Mongo 컬렉션 기반, 내구성 보장)
+#   - _id = 대상 일기의 _id → 같은 일기는 한 번만 큐잉
+#   - status: queued → running → (삭제) / failed
+# ==================================================
+INDEXES = [
+    IndexModel([("status", ASCENDING), ("available_at", ASCENDING)], name="status_available_at"),
+    IndexModel([("status", ASCENDING), ("lease_until", ASCENDING)], name="status_lease_until"),
+]
+
+
+def get_job_collection():
+    if mongo.db is None:
+        raise RuntimeError("❌ MongoDB 연결 전 상태입니다. connect_to_mongo() 실행 필요")
+    return mongo.db["analysis_jobs"]
+
+
+# ==================================================
+# ✅ 작업 등록 (멱등)
+# ==================================================
+async def enqueue_job(diary_id: ObjectId, user_id: str, available_at: Optional[datetime] = None) -> None:
+    col = get_job_collection()
+    now = datetime.utcnow()
+    await col.update_one(
+        {"_id": diary_id},
+        {"$setOnInsert": {
+            "user_id": user_id,
+            "status": "queued",
+            "attempts": 0,
+            "last_error": None,
+            "created_at": now,
+            "available_at": available_at or now,
+        }},
+        upsert=True,
+    )
+
+
+# ==================================================
+# ✅ 작업 일괄 등록 (가져오기용: available_at을 분산해 처리 속도 제한)
+# ==================================================
+async def enqueue_jobs_bulk(jobs: List[Tuple[ObjectId, str, datetime]]) -> None:
+    """jobs: (diary_id, user_id, available_at) — 이미 있는 작업은 무시"""
+    if not jobs:
+        return
+    col = get_job_collection()
+    now = datetime.utcnow()
+    try:
+        await col.insert_many(
+            [{
+                "_id": diary_id,
+                "user_id": user_id,
+                "status": "queued",
+                "attempts": 0,
+                "last_error": None,
+                "created_at": now,
+                "available_at": available_at,
+            } for diary_id, user_id, available_at in jobs],
+            ordered=False,
+        )
+    except BulkWriteError as e:
+        # 중복(_id) 외의 오류만 전파
+        if any(err.get("code") != 11000 for err in e.details.get("writeErrors", [])):
+            raise
+
+
+# ==================================================
+# ✅ 다음 작업 점유 (queued 이거나, 점유 시간이 만료된 running)
+# ==================================================
+async def claim_next_job(worker_id: str, lease_seconds: int) -> Optional[dict]:
+    col = get_job_collection()
+    now = datetime.utcnow()
+    return await col.find_one_and_update(
+        {"$or": [
+            {"status": "queued", "available_at": {"$lte": now}},
+            {"status": "running", "lease_until": {"$lt": now}},
+        ]},
+        {
+            "$set": {
+                "status": "running",
+                "worker": worker_id,
+                "lease_until": now + timedelta(seconds=lease_seconds),
+            },
+            "$inc": {"attempts": 1},
+        },
+        sort=[("available_at", 1)],
+        return_document=ReturnDocument.AFTER,
+    )
+
+
+# ==================================================
+# ✅ 작업 완료 → 큐에서 제거
+# ==================================================
+async def complete_job(job_id: ObjectId) -> None:
+    col = get_job_collection()
+    await col.delete_one({"_id": job_id})
+
+
+# ==================================================
+# ✅ 작업 실패 기록 (retry_at이 있으면 재시도 대기, 없으면 최종 실패)
+# ==================================================
+async def fail_job(job_id: ObjectId, error: str, retry_at: Optional[datetime] = None) -> None:
+    col = get_job_collection()
+    update = {"last_error": error[:500], "lease_until": None}
+    if retry_at is not None:
+        update.update({"status": "queued", "available_at": retry_at})
+    else:
+        update.update({"status": "failed", "failed_at": datetime.utcnow()})
+    await col.update_one({"_id": job_id}, {"$set": update})
+
+
+# ==================================================
+# ✅ 작업 조회 (상태 폴링용, 본인 것만)
+# ==================================================
+async def get_job(diary_id: ObjectId, user_id: str) -> Optional[dict]:
+    col = get_job_collection()
+    return await col.find_one({"_id": diary_id, "user_id": user_id})
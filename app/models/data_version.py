@@ -0,0 +1,33 @@
+# app/models/data_version.py
+from pymongo import ReturnDocument
+
+import app.db.mongo as mongo
+
+# ==================================================
+# ✅ 사용자별 데이터 버전
+#   - 일기 쓰기(생성/분석 반영/수정/삭제) 때마다 +1
+#   - 응답 캐시 키에 포함 → 버전이 바뀌면 이전 캐시는 자연히 무효
+#   - Mongo에 두므로 여러 워커 프로세스가 같은 버전을 봄
+# ==================================================
+VERSION_COLLECTION = "user_data_versions"
+
+
+def get_version_collection():
+    if mongo.db is None:
+        raise RuntimeError("❌ MongoDB 연결 전 상태입니다. connect_to_mongo() 실행 필요")
+    return mongo.db[VERSION_COLLECTION]
+
+
+async def get_data_version(user_id: str) -> int:
+    doc = await get_version_collection().find_one({"_id": user_id}, {"v": 1})
+    return doc.get("v", 0) if doc else 0
+
+
+async def bump_data_version(user_id: str) -> int:
+    doc = await get_version_collection().find_one_and_update(
+        {"_id": user_id},
+        {"$inc": {"v": 1}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER,
+    )
+    return doc["v"]
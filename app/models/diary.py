@@ -1,17 +1,67 @@
 # app/models/diary.py
-from app.db.mongo import db
-from app.schemas.diary import DiaryCreate, DiaryResponse
+import logging
+import app.db.mongo as mongo
+from app.schemas.diary import (
+    DiaryCreate, DiaryResponse, DiarySummary, DiaryPage, DiaryCalendarEntry, DiarySearchHit, SimilarDiary,
+)
 from datetime import datetime, date as _date
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional, Tuple
 from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReturnDocument
+from pymongo.errors import BulkWriteError
+import app.models.rollup as rollup_model
+import app.models.search_index as search_index
+import app.models.diary_vector as vector_model
+from app.models.data_version import bump_data_version
+import base64
+import json
+
+logger = logging.getLogger(__name__)
+
+# ==================================================
+# ✅ 인덱스 선언 (startup에서 app.db.indexes.ensure_indexes가 생성/조정)
+# ==================================================
+INDEXES = [
+    # 목록/페이지네이션/날짜 조회: {user_id, date} + (date, _id) 정렬
+    IndexModel([("user_id", ASCENDING), ("date", DESCENDING), ("_id", DESCENDING)], name="user_date_id"),
+    # 통계(주간/월간/위험도): {user_id, created_at >= }
+    IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING)], name="user_created_at"),
+    # 위험 일기 목록: {user_id, risk_level in} 정렬 created_at
+    IndexModel(
+        [("user_id", ASCENDING), ("risk_level", ASCENDING), ("created_at", DESCENDING)],
+        name="user_risk_created_at",
+    ),
+    # 지연 분석 복구: pending 문서만 (부분 인덱스)
+    IndexModel(
+        [("analysis_status", ASCENDING), ("created_at", ASCENDING)],
+        name="pending_analysis",
+        partialFilterExpression={"analysis_status": "pending"},
+    ),
+]
+
 
 # ==================================================
 # ✅ 안전한 컬렉션 접근
 # ==================================================
 def get_diary_collection():
-    if db is None:
+    if mongo.db is None:
         raise RuntimeError("❌ MongoDB 연결 전 상태입니다. connect_to_mongo() 실행 필요")
-    return db["diaries"]
+    return mongo.db["diaries"]
+
+
+# ==================================================
+# ✅ 쓰기 후처리: 일별 집계 증분 + 사용자 데이터 버전 증가(응답 캐시 무효화)
+# ==================================================
+async def _on_diary_changed(before: Optional[dict], after: Optional[dict]) -> None:
+    await rollup_model.apply_rollup_delta(before, after)
+    await search_index.sync_diary(before, after)
+    await vector_model.sync_diary(before, after)
+    user_id = (after or before or {}).get("user_id")
+    if user_id:
+        try:
+            await bump_data_version(user_id)
+        except Exception as e:
+            logger.warning("데이터 버전 갱신 실패: %s", e)
 
 
 # ==================================================
@@ -72,10 +122,50 @@ def serialize(d: dict) -> dict:
         "feedback": d.get("feedback", "감정 분석에 실패했습니다."),
         "risk_level": d.get("risk_level", "none"),  # ✅ 위험도 저장/반환
         "risk_resources": _normalize_risk_resources(d.get("risk_resources")),
+        "analysis_status": d.get("analysis_status", "done"),
+        "analysis_source": d.get("analysis_source"),
+        "created_at": d.get("created_at"),
+    }
+
+
+# ==================================================
+# ✅ 직렬화: Mongo 문서 -> DiarySummary dict (목록용 경량)
+# ==================================================
+SUMMARY_PROJECTION = {"text": 0, "reason": 0, "feedback": 0, "risk_resources": 0}
+
+
+def serialize_summary(d: dict) -> dict:
+    return {
+        "id": str(d["_id"]),
+        "user_id": d["user_id"],
+        "date": _to_datetime(d.get("date")),
+        "emotion": d.get("emotion", {"label": "알수없음", "emoji": "❓"}),
+        "analyzed_emotion": d.get("analyzed_emotion", {"label": "분석실패", "emoji": "❓"}),
+        "score": d.get("score", 5),
+        "risk_level": d.get("risk_level", "none"),
+        "analysis_status": d.get("analysis_status", "done"),
         "created_at": d.get("created_at"),
     }
 
 
+# ==================================================
+# ✅ 페이지 커서: (date, _id) → 불투명 문자열
+# ==================================================
+def encode_cursor(date_value: datetime, oid: ObjectId) -> str:
+    raw = json.dumps({"d": date_value.isoformat(), "i": str(oid)}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, ObjectId]:
+    """잘못된 커서면 ValueError"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        raw = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return datetime.fromisoformat(raw["d"]), ObjectId(raw["i"])
+    except Exception:
+        raise ValueError("잘못된 커서입니다.")
+
+
 # ==================================================
 # ✅ 일기 생성
 # ==================================================
@@ -88,6 +178,8 @@ async def create_diary(
     feedback: str,
     risk_level: str = "none",                 # ✅ analyze_emotion() 결과에서 전달
     risk_resources: List[dict] | None = None, # ✅ 타입 정정: List[dict]
+    analysis_version: Optional[str] = None,   # 프롬프트 버전 (재분석 대상 선별용)
+    analysis_source: str = "llm",             # llm | local (로컬 간이 분석은 재분석 대상)
 ) -> DiaryResponse:
     col = get_diary_collection()
 
@@ -102,6 +194,10 @@ async def create_diary(
     data["risk_level"] = risk_level
     if risk_resources is not None:                   # ✅ 항상 정규화 후 저장
         data["risk_resources"] = _normalize_risk_resources(risk_resources)
+    if analysis_version is not None:
+        data["analysis_version"] = analysis_version
+    data["analysis_status"] = "done"
+    data["analysis_source"] = analysis_source
     data["created_at"] = datetime.utcnow()
 
     # date 필드 정규화 (항상 datetime으로)
@@ -109,9 +205,138 @@ async def create_diary(
 
     res = await col.insert_one(data)
     data["_id"] = res.inserted_id
+    await _on_diary_changed(None, data)
     return DiaryResponse(**serialize(data))
 
 
+# ==================================================
+# ✅ 일기 선저장 (감정 분석은 백그라운드 워커가 채움)
+# ==================================================
+def build_pending_doc(user_id: str, diary: DiaryCreate) -> dict:
+    """
+    analysis_status="pending" 문서 생성 (저장 전).
+    분석 결과 필드는 자리표시 값으로 채워 두고 apply_analysis()에서 덮어씁니다.
+    """
+    data = diary.model_dump()
+    data["user_id"] = user_id
+    data["emotion"] = diary.emotion.model_dump()
+    data["analyzed_emotion"] = {"label": "분석중", "emoji": "⏳"}
+    data["reason"] = ""
+    data["score"] = 5
+    data["feedback"] = ""
+    data["risk_level"] = "none"
+    data["analysis_status"] = "pending"
+    data["created_at"] = datetime.utcnow()
+    data["date"] = _to_datetime(data.get("date"))
+    return data
+
+
+async def create_pending_diary(user_id: str, diary: DiaryCreate) -> DiaryResponse:
+    """
+    analysis_status="pending"으로 즉시 저장.
+    """
+    col = get_diary_collection()
+
+    data = build_pending_doc(user_id, diary)
+    res = await col.insert_one(data)
+    data["_id"] = res.inserted_id
+    await _on_diary_changed(None, data)
+    return DiaryResponse(**serialize(data))
+
+
+# ==================================================
+# ✅ 일기 일괄 저장 (가져오기용, 순서 없는 insert_many)
+# ==================================================
+async def insert_diaries_bulk(docs: List[dict]) -> Tuple[List[dict], dict]:
+    """
+    (저장된 문서 목록, {docs 인덱스: 오류 메시지}) 반환.
+    ordered=False → 한 건이 실패해도 나머지는 저장됩니다.
+    """
+    if not docs:
+        return [], {}
+    col = get_diary_collection()
+    failed: dict = {}
+    try:
+        await col.insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        for err in e.details.get("writeErrors", []):
+            failed[err["index"]] = err.get("errmsg", "저장 실패")
+
+    inserted = [d for i, d in enumerate(docs) if i not in failed]
+    if inserted:
+        try:
+            await rollup_model.apply_rollup_deltas((None, d) for d in inserted)
+        except Exception as e:
+            # 일기는 이미 저장됨 → rollups 점검 스크립트(check --fix)로 복구
+            logger.warning("일괄 저장 rollup 반영 실패: %s", e)
+        try:
+            await search_index.index_diaries(inserted)
+        except Exception as e:
+            logger.warning("일괄 저장 검색 색인 실패: %s", e)
+        try:
+            await vector_model.index_diaries(inserted)
+        except Exception as e:
+            logger.warning("일괄 저장 벡터 색인 실패: %s", e)
+        for uid in {d["user_id"] for d in inserted}:
+            await bump_data_version(uid)
+    return inserted, failed
+
+
+# ==================================================
+# ✅ 분석 결과 반영 (백그라운드 워커용)
+# ==================================================
+def analysis_update_fields(analysis: dict, status: str = "done") -> dict:
+    """analyze_emotion() 결과 → 일기 문서 $set 필드 (워커/재분석 스크립트 공용)"""
+    fields = {
+        "analyzed_emotion": analysis["analyzed_emotion"],
+        "reason": analysis.get("reason", ""),
+        "score": analysis.get("score", 5),
+        "feedback": analysis.get("feedback", ""),
+        "risk_level": analysis.get("risk_level", "none"),
+        "risk_resources": _normalize_risk_resources(analysis.get("risk_resources")),
+        "analysis_status": status,
+        "analyzed_at": datetime.utcnow(),
+    }
+    if analysis.get("analysis_version"):
+        fields["analysis_version"] = analysis["analysis_version"]
+    fields["analysis_source"] = analysis.get("analysis_source", "llm")
+    return fields
+
+
+async def apply_analysis(diary_id: ObjectId, analysis: dict, status: str = "done") -> bool:
+    col = get_diary_collection()
+    fields = analysis_update_fields(analysis, status)
+    before = await col.find_one_and_update(
+        {"_id": diary_id},
+        {"$set": fields},
+        return_document=ReturnDocument.BEFORE,
+    )
+    if before is None:
+        return False
+    await _on_diary_changed(before, {**before, **fields})
+    return True
+
+
+# ==================================================
+# ✅ 원본 문서 조회 (내부용: 워커/스크립트)
+# ==================================================
+async def get_raw_diary(diary_id: ObjectId) -> Optional[dict]:
+    col = get_diary_collection()
+    return await col.find_one({"_id": diary_id})
+
+
+# ==================================================
+# ✅ 분석 대기 중으로 남아있는 일기 (작업 유실 복구용)
+# ==================================================
+async def find_pending_diaries(created_before: datetime, limit: int = 500) -> List[dict]:
+    col = get_diary_collection()
+    cursor = col.find(
+        {"analysis_status": "pending", "created_at": {"$lt": created_before}},
+        {"_id": 1, "user_id": 1},
+    ).limit(limit)
+    return await cursor.to_list(None)
+
+
 # ==================================================
 # ✅ 사용자 전체 일기 조회 (최신순)
 # ==================================================
@@ -123,6 +348,66 @@ async def get_user_diaries(user_id: str) -> List[DiaryResponse]:
     return items
 
 
+# ==================================================
+# ✅ 사용자 전체 일기 스트리밍 (내보내기용, 오래된 순)
+#   - 커서 배치 단위로만 메모리에 올림 → 일기 수와 무관하게 일정한 메모리
+# ==================================================
+async def iter_user_diaries(user_id: str, batch_size: int = 200) -> AsyncIterator[DiaryResponse]:
+    col = get_diary_collection()
+    cursor = (
+        col.find({"user_id": user_id})
+        .sort([("date", ASCENDING), ("_id", ASCENDING)])
+        .batch_size(batch_size)
+    )
+    async for doc in cursor:
+        yield DiaryResponse(**serialize(doc))
+
+
+# ==================================================
+# ✅ 사용자 일기 페이지 조회 (최신순, (date, _id) 키셋 페이지네이션)
+# ==================================================
+async def get_user_diaries_page(
+    user_id: str,
+    limit: int,
+    cursor: Optional[str] = None,
+    summary: bool = False,
+) -> DiaryPage:
+    """
+    skip 없이 마지막 (date, _id) 이후만 조회 → 계정 나이와 무관하게 일정한 비용.
+    limit + 1건을 읽어 다음 페이지 존재 여부를 판단합니다.
+    """
+    col = get_diary_collection()
+
+    query: dict = {"user_id": user_id}
+    if cursor:
+        c_date, c_id = decode_cursor(cursor)
+        query["$or"] = [
+            {"date": {"$lt": c_date}},
+            {"date": c_date, "_id": {"$lt": c_id}},
+        ]
+
+    projection = SUMMARY_PROJECTION if summary else None
+    docs = await (
+        col.find(query, projection)
+        .sort([("date", -1), ("_id", -1)])
+        .limit(limit + 1)
+        .to_list(None)
+    )
+
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    if summary:
+        items = [DiarySummary(**serialize_summary(d)) for d in docs]
+    else:
+        items = [DiaryResponse(**serialize(d)) for d in docs]
+
+    next_cursor = None
+    if has_more and docs:
+        last = docs[-1]
+        next_cursor = encode_cursor(_to_datetime(last.get("date")), last["_id"])
+    return DiaryPage(items=items, next_cursor=next_cursor)
+
+
 # ==================================================
 # ✅ 특정 ID로 일기 조회 (본인 것만)
 # ==================================================
@@ -132,18 +417,151 @@ async def get_diary_by_id(user_id: str, diary_id: str) -> Optional[DiaryResponse
         doc = await col.find_one({"_id": ObjectId(diary_id), "user_id": user_id})
         return DiaryResponse(**serialize(doc)) if doc else None
     except Exception as e:
-        print(f"❌ get_diary_by_id 오류: {e}")
+        logger.warning("get_diary_by_id 오류: %s", e, extra={"fields": {"diary_id": diary_id}})
         return None
 
 
 # ==================================================
 # ✅ 특정 날짜의 일기 조회 (정확 일치)
 # ==================================================
-async def get_diary_by_date(user_id: str, target_date: datetime) -> Optional[DiaryResponse]:
+async def get_diary_by_date(user_id: str, target_date) -> Optional[DiaryResponse]:
+    """
+    Asia/Seoul 기준 해당 날짜(00:00~24:00)의 일기 중 가장 늦은 것
+    (자정 정확히 저장되지 않은 일기도 찾도록 등호 대신 범위 조건)
+    """
+    col = get_diary_collection()
+    day = target_date.date() if isinstance(target_date, datetime) else target_date
+    lo, hi = rollup_model.local_day_bounds(day, day)
+    docs = await (
+        col.find({"user_id": user_id, "date": {"$gte": lo, "$lt": hi}})
+        .sort([("date", -1), ("_id", -1)])
+        .limit(1)
+        .to_list(1)
+    )
+    return DiaryResponse(**serialize(docs[0])) if docs else None
+
+
+# ==================================================
+# ✅ 달력 범위 조회 (from~to, Asia/Seoul 일 단위, 경량 projection)
+#   {user_id, date 범위} → user_date_id 인덱스 하나로 처리
+# ==================================================
+CALENDAR_PROJECTION = {"date": 1, "emotion.emoji": 1, "analyzed_emotion.label": 1, "risk_level": 1}
+
+
+async def get_diaries_in_range(user_id: str, start: _date, end: _date) -> List[DiaryCalendarEntry]:
     col = get_diary_collection()
-    target = _to_datetime(target_date)
-    doc = await col.find_one({"user_id": user_id, "date": target})
-    return DiaryResponse(**serialize(doc)) if doc else None
+    lo, hi = rollup_model.local_day_bounds(start, end)
+    cursor = col.find(
+        {"user_id": user_id, "date": {"$gte": lo, "$lt": hi}},
+        CALENDAR_PROJECTION,
+    ).sort([("date", 1), ("_id", 1)])
+
+    entries: List[DiaryCalendarEntry] = []
+    async for d in cursor:
+        entries.append(DiaryCalendarEntry(
+            id=str(d["_id"]),
+            day=rollup_model.local_day(_to_datetime(d.get("date"))),
+            emoji=(d.get("emotion") or {}).get("emoji", "❓"),
+            analyzed_label=(d.get("analyzed_emotion") or {}).get("label", "분석실패"),
+            risk_level=d.get("risk_level", "none"),
+        ))
+    return entries
+
+
+# ==================================================
+# ✅ 본문 검색 (n-gram 역색인 → 순위 → 원문에서 스니펫)
+# ==================================================
+SEARCH_PROJECTION = {"date": 1, "text": 1, "emotion": 1, "analyzed_emotion": 1, "risk_level": 1}
+_SNIPPET_RADIUS = 40
+
+
+def make_snippet(text: str, query: str, radius: int = _SNIPPET_RADIUS) -> str:
+    """질의(없으면 가장 긴 질의 단어 → 질의 2-gram)가 처음 나온 위치 주변"""
+    text = text or ""
+    low = search_index.normalize(text)
+    needles = [search_index.normalize(query).strip()]
+    needles += sorted(search_index.tokenize(query), key=len, reverse=True)
+    needles += search_index.extract_grams(query, limit=64)
+
+    pos, size = -1, 0
+    for needle in needles:
+        if needle and (pos := low.find(needle)) >= 0:
+            size = len(needle)
+            break
+    if pos < 0:
+        return text[:radius * 2] + ("…" if len(text) > radius * 2 else "")
+
+    start = max(0, pos - radius)
+    end = min(len(text), pos + size + radius)
+    return ("…" if start > 0 else "") + text[start:end] + ("…" if end < len(text) else "")
+
+
+async def search_diaries(user_id: str, query: str, limit: int, min_ratio: float) -> List[DiarySearchHit]:
+    ranked = await search_index.search(user_id, query, limit, min_ratio=min_ratio)
+    if not ranked:
+        return []
+
+    col = get_diary_collection()
+    docs = {
+        d["_id"]: d
+        async for d in col.find({"_id": {"$in": [oid for oid, _ in ranked]}, "user_id": user_id}, SEARCH_PROJECTION)
+    }
+    hits: List[DiarySearchHit] = []
+    for oid, score in ranked:
+        d = docs.get(oid)
+        if d is None:   # 색인만 남은 경우 (삭제 직후 등)
+            continue
+        hits.append(DiarySearchHit(
+            id=str(oid),
+            date=_to_datetime(d.get("date")),
+            emotion=d.get("emotion", {"label": "알수없음", "emoji": "❓"}),
+            analyzed_emotion=d.get("analyzed_emotion", {"label": "분석실패", "emoji": "❓"}),
+            risk_level=d.get("risk_level", "none"),
+            score=score,
+            snippet=make_snippet(d.get("text", ""), query),
+        ))
+    return hits
+
+
+# ==================================================
+# ✅ 비슷한 지난 일기 (로컬 벡터 코사인 유사도)
+# ==================================================
+_PREVIEW_CHARS = 80
+
+
+async def get_similar_diaries(user_id: str, diary_id: str, limit: int) -> Optional[List[SimilarDiary]]:
+    """기준 일기가 없으면 None"""
+    from app.services.similar_diaries import find_similar
+
+    col = get_diary_collection()
+    oid = ObjectId(diary_id)
+    base = await col.find_one({"_id": oid, "user_id": user_id}, {"text": 1})
+    if base is None:
+        return None
+
+    ranked = await find_similar(user_id, oid, base.get("text", ""), limit)
+    if not ranked:
+        return []
+    docs = {
+        d["_id"]: d
+        async for d in col.find({"_id": {"$in": [i for i, _ in ranked]}, "user_id": user_id}, SEARCH_PROJECTION)
+    }
+    out: List[SimilarDiary] = []
+    for i, score in ranked:
+        d = docs.get(i)
+        if d is None:
+            continue
+        text = d.get("text", "")
+        out.append(SimilarDiary(
+            id=str(i),
+            date=_to_datetime(d.get("date")),
+            emotion=d.get("emotion", {"label": "알수없음", "emoji": "❓"}),
+            analyzed_emotion=d.get("analyzed_emotion", {"label": "분석실패", "emoji": "❓"}),
+            risk_level=d.get("risk_level", "none"),
+            similarity=score,
+            preview=text[:_PREVIEW_CHARS] + ("…" if len(text) > _PREVIEW_CHARS else ""),
+        ))
+    return out
 
 
 # ==================================================
@@ -151,8 +569,11 @@ async def get_diary_by_date(user_id: str, target_date: datetime) -> Optional[Dia
 # ==================================================
 async def delete_diary_by_id(user_id: str, diary_id: str) -> bool:
     col = get_diary_collection()
-    res = await col.delete_one({"_id": ObjectId(diary_id), "user_id": user_id})
-    return res.deleted_count > 0
+    deleted = await col.find_one_and_delete({"_id": ObjectId(diary_id), "user_id": user_id})
+    if deleted is None:
+        return False
+    await _on_diary_changed(deleted, None)
+    return True
 
 
 # ==================================================
@@ -170,15 +591,17 @@ async def update_diary_by_id(user_id: str, diary_id: str, diary: DiaryCreate) ->
         "text": diary.text,
     }
 
-    res = await col.update_one(
+    before = await col.find_one_and_update(
         {"_id": ObjectId(diary_id), "user_id": user_id},
-        {"$set": update_data}
+        {"$set": update_data},
+        return_document=ReturnDocument.BEFORE,
     )
 
-    if res.matched_count == 0:
+    if before is None:
         # 존재X 또는 본인 소유 아님
         return None
 
-    # modified_count가 0이어도 값 동일 가능 → 다시 조회해 반환
-    updated = await col.find_one({"_id": ObjectId(diary_id), "user_id": user_id})
-    return DiaryResponse(**serialize(updated)) if updated else None
+    # 변경 전 문서 + 수정 필드 = 수정 후 문서 (재조회 불필요)
+    updated = {**before, **update_data}
+    await _on_diary_changed(before, updated)
+    return DiaryResponse(**serialize(updated))
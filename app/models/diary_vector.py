@@ -0,0 +1,82 @@
+# app/models/diary_vector.py
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+from bson import Binary
+from pymongo import ASCENDING, IndexModel, ReplaceOne
+
+import app.db.mongo as mongo
+from app.services import text_features
+
+logger = logging.getLogger(__name__)
+
+# ==================================================
+# ✅ 일기별 로컬 텍스트 벡터 ("비슷한 일기" 검색용)
+#   - 일기 1건당 문서 1개, float32 bytes로 저장 (dim=512 → 2KB)
+#   - 일기 본문 문서와 분리 → 목록/내보내기 조회에 벡터가 딸려오지 않음
+#   문서 구조:
+#   { _id: <diary _id>, user_id, dim, v: <float32 bytes> }
+# ==================================================
+VECTOR_COLLECTION = "diary_vectors"
+
+INDEXES = [
+    IndexModel([("user_id", ASCENDING), ("_id", ASCENDING)], name="user_id_id"),
+]
+
+
+def get_vector_collection():
+    if mongo.db is None:
+        raise RuntimeError("❌ MongoDB 연결 전 상태입니다. connect_to_mongo() 실행 필요")
+    return mongo.db[VECTOR_COLLECTION]
+
+
+def _entry(doc: dict) -> dict:
+    vec = text_features.vectorize(doc.get("text", ""))
+    return {
+        "_id": doc["_id"],
+        "user_id": doc["user_id"],
+        "dim": int(vec.shape[0]),
+        "v": Binary(text_features.to_bytes(vec)),
+    }
+
+
+# ==================================================
+# ✅ 벡터 갱신 (일기 쓰기 경로에서 호출, 실패해도 일기 쓰기는 성공으로 둠)
+#   → 누락분은 app/scripts/diary_vectors.py rebuild 로 복구
+# ==================================================
+async def index_diaries(docs: Iterable[dict]) -> None:
+    ops = [ReplaceOne({"_id": d["_id"]}, _entry(d), upsert=True) for d in docs]
+    if ops:
+        await get_vector_collection().bulk_write(ops, ordered=False)
+
+
+async def sync_diary(before: Optional[dict], after: Optional[dict]) -> None:
+    try:
+        if after is None:
+            if before is not None:
+                await get_vector_collection().delete_one({"_id": before["_id"]})
+            return
+        if before is not None and before.get("text") == after.get("text"):
+            return  # 본문이 그대로면 벡터도 그대로
+        await index_diaries([after])
+    except Exception as e:
+        logger.warning("일기 벡터 갱신 실패: %s", e)
+
+
+# ==================================================
+# ✅ 사용자 전체 벡터 → (diary _id 목록, N x dim 행렬)
+# ==================================================
+async def load_user_vectors(user_id: str) -> Tuple[List[object], np.ndarray]:
+    dim = text_features.vector_dim()
+    ids: List[object] = []
+    rows: List[np.ndarray] = []
+    cursor = get_vector_collection().find({"user_id": user_id}, {"v": 1}).sort("_id", 1)
+    async for d in cursor:
+        vec = text_features.from_bytes(d["v"], dim)
+        if vec is None:
+            continue
+        ids.append(d["_id"])
+        rows.append(vec)
+    matrix = np.vstack(rows) if rows else np.zeros((0, dim), dtype=np.float32)
+    return ids, matrix
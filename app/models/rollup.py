@@ -0,0 +1,234 @@
+# app/models/rollup.py
+import logging
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta, timezone
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from pymongo import ASCENDING, IndexModel, ReplaceOne, UpdateOne
+
+import app.db.mongo as mongo
+
+logger = logging.getLogger(__name__)
+
+# ==================================================
+# ✅ 사용자별 · 현지(Asia/Seoul) 일자별 감정/위험도 집계
+#   - 일기 생성/분석 반영/수정/삭제 시 $inc로 증분 갱신
+#   - 통계 라우트는 원본 diaries 대신 이 컬렉션을 읽음
+#   문서 구조:
+#   {
+#     user_id, day: "YYYY-MM-DD",
+#     count, score_sum, score_count,
+#     emotions: {<label>: {count, score_sum, score_count}},
+#     risk: {<risk_level>: count}
+#   }
+# ==================================================
+ROLLUP_COLLECTION = "diary_daily_rollups"
+TZ_NAME = "Asia/Seoul"
+TZ = ZoneInfo(TZ_NAME)
+
+INDEXES = [
+    IndexModel([("user_id", ASCENDING), ("day", ASCENDING)], name="user_day", unique=True),
+]
+
+# (user_id, day, label, score, risk)
+Contribution = Tuple[str, str, str, Optional[float], str]
+
+
+def get_rollup_collection():
+    if mongo.db is None:
+        raise RuntimeError("❌ MongoDB 연결 전 상태입니다. connect_to_mongo() 실행 필요")
+    return mongo.db[ROLLUP_COLLECTION]
+
+
+# ==================================================
+# ✅ 유틸
+# ==================================================
+def local_day(ts: datetime) -> str:
+    """UTC(naive 포함) 시각 → Asia/Seoul 기준 YYYY-MM-DD"""
+    if ts.tzinfo is None:
+        ts = ts.replace(tzinfo=timezone.utc)
+    return ts.astimezone(TZ).date().isoformat()
+
+
+def local_day_bounds(start: date, end: date) -> Tuple[datetime, datetime]:
+    """
+    Asia/Seoul 기준 [start 00:00, end 다음날 00:00) → naive UTC 구간
+    (Mongo의 date 필드는 UTC로 저장되므로 그대로 범위 조건에 사용)
+    """
+    lo = datetime.combine(start, time.min, tzinfo=TZ).astimezone(timezone.utc)
+    hi = datetime.combine(end + timedelta(days=1), time.min, tzinfo=TZ).astimezone(timezone.utc)
+    return lo.replace(tzinfo=None), hi.replace(tzinfo=None)
+
+
+def _safe_key(key: str) -> str:
+    # Mongo 필드명에 쓸 수 없는 문자 치환
+    return str(key).replace(".", "_").replace("$", "_")
+
+
+def contribution(doc: Optional[dict]) -> Optional[Contribution]:
+    """일기 문서가 롤업에 기여하는 값 (원본 집계 파이프라인과 동일한 기본값 규칙)"""
+    if not doc or not isinstance(doc.get("created_at"), datetime):
+        return None
+    label = (doc.get("analyzed_emotion") or {}).get("label")
+    risk = doc.get("risk_level")
+    score = doc.get("score")
+    return (
+        doc["user_id"],
+        local_day(doc["created_at"]),
+        _safe_key(label if label is not None else "중립"),
+        score if isinstance(score, (int, float)) and not isinstance(score, bool) else None,
+        _safe_key(risk if risk is not None else "none"),
+    )
+
+
+def _add_inc(inc: Dict[str, float], c: Contribution, sign: int) -> None:
+    _, _, label, score, risk = c
+    has_score = score is not None
+    for path, val in (
+        ("count", sign),
+        ("score_sum", sign * score if has_score else 0),
+        ("score_count", sign if has_score else 0),
+        (f"emotions.{label}.count", sign),
+        (f"emotions.{label}.score_sum", sign * score if has_score else 0),
+        (f"emotions.{label}.score_count", sign if has_score else 0),
+        (f"risk.{risk}", sign),
+    ):
+        if val:
+            inc[path] = inc.get(path, 0) + val
+
+
+def build_delta_ops(pairs: Iterable[Tuple[Optional[dict], Optional[dict]]]) -> List[UpdateOne]:
+    """(변경 전 문서, 변경 후 문서) 목록 → (user_id, day)별로 합친 $inc 연산"""
+    incs: Dict[Tuple[str, str], Dict[str, float]] = defaultdict(dict)
+    for before, after in pairs:
+        old, new = contribution(before), contribution(after)
+        if old == new:
+            continue
+        if old:
+            _add_inc(incs[(old[0], old[1])], old, -1)
+        if new:
+            _add_inc(incs[(new[0], new[1])], new, +1)
+
+    ops = []
+    for (user_id, day), inc in incs.items():
+        inc = {k: v for k, v in inc.items() if v}
+        if inc:
+            ops.append(UpdateOne({"user_id": user_id, "day": day}, {"$inc": inc}, upsert=True))
+    return ops
+
+
+# ==================================================
+# ✅ 증분 반영 (일기 쓰기 경로에서 호출)
+# ==================================================
+async def apply_rollup_deltas(pairs: Iterable[Tuple[Optional[dict], Optional[dict]]]) -> None:
+    ops = build_delta_ops(pairs)
+    if ops:
+        await get_rollup_collection().bulk_write(ops, ordered=False)
+
+
+async def apply_rollup_delta(before: Optional[dict], after: Optional[dict]) -> None:
+    """
+    실패해도 일기 쓰기는 성공으로 둠 → rollups 점검 스크립트(check --fix)로 복구
+    """
+    try:
+        await apply_rollup_deltas([(before, after)])
+    except Exception as e:
+        logger.warning("일별 집계 갱신 실패: %s", e)
+
+
+# ==================================================
+# ✅ 조회
+# ==================================================
+async def get_user_rollups(user_id: str, since: datetime) -> List[dict]:
+    col = get_rollup_collection()
+    cursor = col.find(
+        {"user_id": user_id, "day": {"$gte": local_day(since)}},
+        {"_id": 0},
+    ).sort("day", ASCENDING)
+    return await cursor.to_list(None)
+
+
+# ==================================================
+# ✅ 원본 diaries로부터 재계산 (재구축/정합성 점검용)
+# ==================================================
+def _rebuild_pipeline(user_id: Optional[str]) -> list:
+    match: dict = {"created_at": {"$type": "date"}}
+    if user_id:
+        match["user_id"] = user_id
+    return [
+        {"$match": match},
+        {"$group": {
+            "_id": {
+                "u": "$user_id",
+                "d": {"$dateToString": {"format": "%Y-%m-%d", "date": "$created_at", "timezone": TZ_NAME}},
+                "l": {"$ifNull": ["$analyzed_emotion.label", "중립"]},
+                "r": {"$ifNull": ["$risk_level", "none"]},
+            },
+            "count": {"$sum": 1},
+            "score_sum": {"$sum": "$score"},
+            "score_count": {"$sum": {"$cond": [{"$isNumber": "$score"}, 1, 0]}},
+        }},
+        {"$sort": {"_id.u": 1, "_id.d": 1}},
+    ]
+
+
+def _empty(user_id: str, day: str) -> dict:
+    return {"user_id": user_id, "day": day, "count": 0, "score_sum": 0, "score_count": 0,
+            "emotions": {}, "risk": {}}
+
+
+async def compute_rollups(user_id: Optional[str] = None) -> AsyncIterator[Tuple[str, Dict[str, dict]]]:
+    """사용자 단위로 (user_id, {day: 롤업 문서}) 를 순서대로 생성"""
+    cursor = mongo.db["diaries"].aggregate(_rebuild_pipeline(user_id), allowDiskUse=True)
+
+    current: Optional[str] = None
+    days: Dict[str, dict] = {}
+    async for row in cursor:
+        uid, day = row["_id"]["u"], row["_id"]["d"]
+        if uid != current:
+            if current is not None:
+                yield current, days
+            current, days = uid, {}
+        doc = days.setdefault(day, _empty(uid, day))
+        label, risk = _safe_key(row["_id"]["l"]), _safe_key(row["_id"]["r"])
+        emo = doc["emotions"].setdefault(label, {"count": 0, "score_sum": 0, "score_count": 0})
+        for target in (doc, emo):
+            target["count"] += row["count"]
+            target["score_sum"] += row["score_sum"]
+            target["score_count"] += row["score_count"]
+        doc["risk"][risk] = doc["risk"].get(risk, 0) + row["count"]
+    if current is not None:
+        yield current, days
+
+
+async def replace_user_rollups(user_id: str, days: Dict[str, dict]) -> None:
+    """
+    재계산한 일자는 문서 단위로 교체(upsert)하고, 결과에 없는 일자만 삭제.
+    (전체 삭제 후 삽입하면 그 사이에 들어온 실시간 $inc가 빈 문서로 upsert된 뒤 중복 키로 사라짐)
+    재계산 시점 이후 같은 일자에 반영된 $inc는 여전히 덮어쓸 수 있으므로,
+    트래픽이 있는 상태에서 재구축했다면 `check --fix`를 한 번 더 실행해 맞출 것.
+    """
+    col = get_rollup_collection()
+    if days:
+        await col.bulk_write(
+            [ReplaceOne({"user_id": user_id, "day": day}, doc, upsert=True) for day, doc in days.items()],
+            ordered=False,
+        )
+    await col.delete_many({"user_id": user_id, "day": {"$nin": list(days)}})
+
+
+def strip_zeros(doc: dict) -> dict:
+    """감소 연산으로 남은 0 카운터 제거 (비교용 정규화)"""
+    emotions = {
+        k: {f: v for f, v in e.items() if v}
+        for k, e in (doc.get("emotions") or {}).items()
+        if e.get("count")
+    }
+    return {
+        "count": doc.get("count", 0),
+        "score_sum": doc.get("score_sum", 0),
+        "score_count": doc.get("score_count", 0),
+        "emotions": emotions,
+        "risk": {k: v for k, v in (doc.get("risk") or {}).items() if v},
+    }
@@ -1,7 +1,8 @@
 # app/models/safety.py
 from datetime import datetime, timedelta
 from typing import List, Optional, Dict
-from app.db.mongo import db
+import app.db.mongo as mongo
+import app.models.rollup as rollup_model
 
 # ==================================================
 # ✅ 리스크 통계 조회용 모델 함수
@@ -9,34 +10,17 @@ from app.db.mongo import db
 async def get_recent_risk_summary(user_id: str, days: int = 30) -> Dict[str, int]:
     """
     최근 N일간 위험도 분포 (none, mild, moderate, high)
+    - 일별 집계(diary_daily_rollups) 합산, 기간 경계는 일 단위
     """
-    col = db["diaries"]
     start_date = datetime.utcnow() - timedelta(days=days)
+    rollups = await rollup_model.get_user_rollups(user_id, start_date)
 
-    pipeline = [
-        {"$match": {
-            "user_id": user_id,
-            "created_at": {"$gte": start_date}
-        }},
-        {"$set": {
-            "risk": {"$ifNull": ["$risk_level", "none"]}
-        }},
-        {"$group": {
-            "_id": "$risk",
-            "count": {"$sum": 1}
-        }},
-        {"$project": {
-            "_id": 0,
-            "risk_level": "$_id",
-            "count": 1
-        }}
-    ]
-
-    result = await col.aggregate(pipeline).to_list(None)
     # dict 형태로 변환 (프론트에서 바로 차트로 쓸 수 있게)
     summary = {"none": 0, "mild": 0, "moderate": 0, "high": 0}
-    for r in result:
-        summary[r["risk_level"]] = r["count"]
+    for r in rollups:
+        for level, count in (r.get("risk") or {}).items():
+            if count:
+                summary[level] = summary.get(level, 0) + count
     return summary
 
 
@@ -47,7 +31,7 @@ async def get_high_risk_entries(user_id: str, limit: int = 5) -> List[Dict]:
     """
     위험도가 'high' 또는 'moderate'인 최근 일기 n개 조회
     """
-    col = db["diaries"]
+    col = mongo.get_db()["diaries"]
     cursor = col.find(
         {"user_id": user_id, "risk_level": {"$in": ["high", "moderate"]}},
         {"_id": 0, "text": 1, "risk_level": 1, "created_at": 1}
@@ -0,0 +1,127 @@
+# app/models/search_index.py
+import logging
+import re
+import unicodedata
+from typing import Iterable, List, Optional, Set, Tuple
+
+from pymongo import ASCENDING, DESCENDING, IndexModel, ReplaceOne
+
+import app.db.mongo as mongo
+
+logger = logging.getLogger(__name__)
+
+# ==================================================
+# ✅ 일기 본문 n-gram 역색인 (한국어 검색용)
+#   - Mongo 기본 text 인덱스는 한국어를 공백 단위로만 잘라 "무기력하고"로 "무기력"을 못 찾음
+#   - 단어마다 글자 2-gram/3-gram을 뽑아 일기 1건당 문서 1개(grams 배열)로 저장
+#   - {user_id, grams} 멀티키 인덱스 → 검색은 사용자 본인 색인 항목만 훑음
+#   문서 구조:
+#   { _id: <diary _id>, user_id, date, grams: ["무기", "기력", "무기력", ...] }
+# ==================================================
+SEARCH_COLLECTION = "diary_search_terms"
+MAX_GRAMS_PER_DOC = 4000
+
+INDEXES = [
+    IndexModel([("user_id", ASCENDING), ("grams", ASCENDING)], name="user_grams"),
+]
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def get_search_collection():
+    if mongo.db is None:
+        raise RuntimeError("❌ MongoDB 연결 전 상태입니다. connect_to_mongo() 실행 필요")
+    return mongo.db[SEARCH_COLLECTION]
+
+
+# ==================================================
+# ✅ n-gram 추출 (색인/검색 공용)
+# ==================================================
+def normalize(text: str) -> str:
+    return unicodedata.normalize("NFC", text or "").lower()
+
+
+def tokenize(text: str) -> List[str]:
+    return _TOKEN_RE.findall(normalize(text))
+
+
+def extract_grams(text: str, limit: Optional[int] = MAX_GRAMS_PER_DOC) -> List[str]:
+    """단어별 2-gram + 3-gram (등장 순서 유지, 중복 제거). 1글자 단어는 제외"""
+    seen: Set[str] = set()
+    grams: List[str] = []
+    for tok in tokenize(text):
+        for n in (2, 3):
+            for i in range(len(tok) - n + 1):
+                g = tok[i:i + n]
+                if g not in seen:
+                    seen.add(g)
+                    grams.append(g)
+                    if limit and len(grams) >= limit:
+                        return grams
+    return grams
+
+
+def _entry(doc: dict) -> dict:
+    return {
+        "_id": doc["_id"],
+        "user_id": doc["user_id"],
+        "date": doc.get("date"),
+        "grams": extract_grams(doc.get("text", "")),
+    }
+
+
+# ==================================================
+# ✅ 색인 갱신 (일기 쓰기 경로에서 호출, 실패해도 일기 쓰기는 성공으로 둠)
+#   → 누락분은 app/scripts/search_index.py rebuild 로 복구
+# ==================================================
+async def index_diaries(docs: Iterable[dict]) -> None:
+    ops = [ReplaceOne({"_id": d["_id"]}, _entry(d), upsert=True) for d in docs]
+    if ops:
+        await get_search_collection().bulk_write(ops, ordered=False)
+
+
+async def sync_diary(before: Optional[dict], after: Optional[dict]) -> None:
+    try:
+        if after is None:
+            if before is not None:
+                await get_search_collection().delete_one({"_id": before["_id"]})
+            return
+        if (
+            before is not None
+            and before.get("text") == after.get("text")
+            and before.get("date") == after.get("date")
+        ):
+            return  # 분석 결과만 바뀜 → 색인 변경 없음
+        await index_diaries([after])
+    except Exception as e:
+        logger.warning("검색 색인 갱신 실패: %s", e)
+
+
+# ==================================================
+# ✅ 검색: 질의 n-gram과 겹치는 개수로 순위
+#   score = 일치한 질의 gram 수 / 전체 질의 gram 수
+# ==================================================
+async def search(
+    user_id: str,
+    query: str,
+    limit: int,
+    min_ratio: float = 0.5,
+) -> List[Tuple[object, float]]:
+    """[(diary _id, score)] — score 내림차순, 같으면 최신 날짜 우선"""
+    qgrams = extract_grams(query, limit=64)
+    if not qgrams:
+        return []
+    need = max(1, int(len(qgrams) * min_ratio + 0.999))
+
+    pipeline = [
+        {"$match": {"user_id": user_id, "grams": {"$in": qgrams}}},
+        {"$project": {
+            "date": 1,
+            "hits": {"$size": {"$setIntersection": ["$grams", qgrams]}},
+        }},
+        {"$match": {"hits": {"$gte": need}}},
+        {"$sort": {"hits": DESCENDING, "date": DESCENDING, "_id": DESCENDING}},
+        {"$limit": limit},
+    ]
+    docs = await get_search_collection().aggregate(pipeline).to_list(limit)
+    return [(d["_id"], round(d["hits"] / len(qgrams), 4)) for d in docs]
@@ -1,12 +1,25 @@
-from app.db.mongo import db
-from passlib.context import CryptContext
+import logging
+import app.db.mongo as mongo
 from bson import ObjectId
+from pymongo import ASCENDING, IndexModel
 
 # ====================================================
 # 전역 설정
 # ====================================================
-# bcrypt → passlib context로 관리
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+# 비밀번호 해시/검증은 password_hasher로 위임 (argon2 계산은 전용 실행기에서 수행)
+from app.services.password_hasher import hash_password, verify_and_update_password
+
+logger = logging.getLogger(__name__)
+
+
+# ====================================================
+# 인덱스 선언 (startup에서 app.db.indexes.ensure_indexes가 생성/조정)
+# ====================================================
+INDEXES = [
+    IndexModel([("user_id", ASCENDING)], name="user_id_unique", unique=True),
+    IndexModel([("email", ASCENDING)], name="email"),
+    IndexModel([("name", ASCENDING), ("email", ASCENDING)], name="name_email"),
+]
 
 
 # ====================================================
@@ -17,9 +30,9 @@ def get_user_collection():
     MongoDB가 연결되기 전에 접근하면 오류 방지.
     FastAPI startup 이벤트에서 connect_to_mongo() 실행 후 사용해야 함.
     """
-    if db is None:
+    if mongo.db is None:
         raise RuntimeError("❌ MongoDB 연결 전 상태입니다. connect_to_mongo()가 실행되었는지 확인하세요.")
-    return db["users"]
+    return mongo.db["users"]
 
 
 # ====================================================
@@ -42,8 +55,8 @@ async def create_user(user_data: dict):
     # 비밀번호 길이 제한 확인
     validate_password_length(user_data["password"])
 
-    # 비밀번호 해시 처리
-    hashed_pw = pwd_context.hash(user_data["password"])
+    # 비밀번호 해시 처리 (이벤트 루프 밖에서 계산)
+    hashed_pw = await hash_password(user_data["password"])
     user_data["password"] = hashed_pw
 
     result = await user_collection.insert_one({
@@ -56,16 +69,6 @@ async def create_user(user_data: dict):
     return str(result.inserted_id)
 
 
-# ====================================================
-# 비밀번호 검증
-# ====================================================
-def verify_password(plain_pw: str, hashed_pw: str) -> bool:
-    try:
-        return pwd_context.verify(plain_pw, hashed_pw)
-    except Exception:
-        return False
-
-
 # ====================================================
 # 아이디로 사용자 조회
 # ====================================================
@@ -79,9 +82,23 @@ async def get_user_by_user_id(user_id: str):
 # ====================================================
 async def verify_user_credentials(user_id: str, password: str):
     user = await get_user_by_user_id(user_id)
-    if user and verify_password(password, user["password"]):
-        return user
-    return None
+    if not user:
+        return None
+
+    ok, new_hash = await verify_and_update_password(password, user["password"])
+    if not ok:
+        return None
+
+    # argon2 파라미터가 바뀌었으면 로그인 성공 시점에 재해시 저장
+    if new_hash:
+        try:
+            await get_user_collection().update_one(
+                {"_id": user["_id"], "password": user["password"]},
+                {"$set": {"password": new_hash}},
+            )
+        except Exception as e:
+            logger.warning("비밀번호 재해시 저장 실패: %s", e)
+    return user
 
 
 # ====================================================
@@ -107,7 +124,7 @@ async def update_user_password(user_id: str, new_password: str):
     user_collection = get_user_collection()
 
     validate_password_length(new_password)
-    hashed_pw = pwd_context.hash(new_password)
+    hashed_pw = await hash_password(new_password)
 
     result = await user_collection.update_one(
         {"user_id": user_id},
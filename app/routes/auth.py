@@ -14,6 +14,11 @@ from app.models.user import (
     delete_user_by_id,
 )
 from app.auth.jwt import create_access_token, get_current_user_id
+from app.services.password_hasher import PasswordHasherBusy
+
+# 해시 대기열 포화 시 응답
+def _busy(e: PasswordHasherBusy) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
 
 router = APIRouter()
 
@@ -34,6 +39,8 @@ async def find_password(request: FindPasswordRequest):
 
     try:
         updated = await update_user_password(user["user_id"], request.new_password)
+    except PasswordHasherBusy as e:
+        raise _busy(e)
     except ValueError as e:
         # bcrypt 72바이트 제한 등 사용자 입력 문제
         raise HTTPException(status_code=400, detail=str(e))
@@ -73,6 +80,8 @@ async def signup(user: UserCreate):
     try:
         # pydantic v2: dict() 대신 model_dump()
         await create_user(user.model_dump())
+    except PasswordHasherBusy as e:
+        raise _busy(e)
     except ValueError as e:
         # bcrypt 72바이트 초과 등 입력 검증 에러
         raise HTTPException(status_code=400, detail=str(e))
@@ -87,7 +96,10 @@ async def signup(user: UserCreate):
 # -------------------------------
 @router.post("/login", response_model=TokenUserResponse, summary="로그인")
 async def login(user: UserLogin):
-    matched_user = await verify_user_credentials(user.user_id, user.password)
+    try:
+        matched_user = await verify_user_credentials(user.user_id, user.password)
+    except PasswordHasherBusy as e:
+        raise _busy(e)
     if not matched_user:
         raise HTTPException(status_code=401, detail="아이디 또는 비밀번호가 잘못되었습니다.")
 
@@ -1,30 +1,94 @@
 # app/routes/diary.py
-from fastapi import APIRouter, Depends, HTTPException
-from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
+from typing import List, Optional, Union
 from datetime import date as Date, datetime
+from bson import ObjectId
+from contextlib import AsyncExitStack
+import asyncio
+import json
+import logging
+import zlib
 
-from app.schemas.diary import DiaryCreate, DiaryResponse
+from app.config import settings
+from app.schemas.diary import (
+    DiaryCreate,
+    DiaryResponse,
+    DiaryAnalysisStatus,
+    DiaryPage,
+    DiaryImportReport,
+    DIARY_ADAPTER,
+    DIARY_LIST_ADAPTER,
+    CALENDAR_ADAPTER,
+    SEARCH_ADAPTER,
+    SIMILAR_ADAPTER,
+    SimilarDiary,
+    DiaryCalendarEntry,
+    DiarySearchHit,
+)
 from app.services.emotion_analysis import analyze_emotion
+from app.services.analysis_stream import analyze_emotion_streaming
+from app.services.analysis_worker import enqueue_analysis
+from app.services import diary_import
+from app.services import admission
 from app.auth.jwt import get_current_user_id
 
 # ✅ 안전한 모듈 임포트 방식 (속성 누락 이슈 방지)
 import app.models.diary as diary_model
+import app.models.analysis_job as job_model
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter(tags=["Diary"])
 
 
+# ==================================================
+# ✅ 이미 검증된 응답 모델 → JSON bytes 직접 반환
+#   response_model은 문서(OpenAPI)용으로만 남고, 검증/직렬화는 1회만 수행
+# ==================================================
+def _json(body: bytes | str) -> Response:
+    return Response(content=body, media_type="application/json")
+
+
 # ==================================================
 # ✅ 일기 저장 (AI 감정 분석 포함)
 #   최종 경로: POST /diary/diary   (main에서 prefix="/diary" 이므로)
+#   - deferred 모드: 즉시 저장(analysis_status=pending) 후 백그라운드 분석
+#     → GET /diary/diary/{diary_id}/status 로 결과 폴링
+#   - sync 모드 과부하: admission_overload_action에 따라 429(Retry-After) 또는 deferred로 전환
+#     (사용자별 한도 초과는 항상 429)
 # ==================================================
+async def _save_deferred(user_id: str, diary: DiaryCreate) -> DiaryResponse:
+    saved = await diary_model.create_pending_diary(user_id, diary)
+    try:
+        await enqueue_analysis(ObjectId(saved.id), user_id)
+    except Exception as e:
+        # 일기는 이미 저장됨 → 워커 시작 시 pending 복구 루틴이 다시 큐잉
+        logger.warning("분석 작업 등록 실패: %s", e, extra={"fields": {"diary_id": saved.id}})
+    return saved
+
+
 @router.post("/diary", response_model=DiaryResponse)
 async def create_diary_route(
     diary: DiaryCreate,
+    deferred: Optional[bool] = Query(None, description="지정하지 않으면 서버 설정(analysis_mode)을 따름"),
     user_id: str = Depends(get_current_user_id),
 ):
+    use_deferred = (settings.analysis_mode == "deferred") if deferred is None else deferred
     try:
-        # 1) OpenAI 기반 감정 분석
-        analysis = await analyze_emotion(diary.text)
+        if use_deferred:
+            return await _save_deferred(user_id, diary)
+
+        # 1) OpenAI 기반 감정 분석 (입장 제어: 사용자별 속도 + 전역 동시 처리 상한)
+        try:
+            async with admission.admit(user_id):
+                analysis = await analyze_emotion(diary.text)
+        except admission.AdmissionRejected as e:
+            if e.overloaded and settings.admission_overload_action == "defer":
+                # 과부하 → 일기는 바로 저장하고 분석은 워커가 천천히 처리
+                admission.record_deferred()
+                return await _save_deferred(user_id, diary)
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": e.retry_after_header()})
 
         # 2) DB 저장 (risk_level, resource 포함)
         saved = await diary_model.create_diary(
@@ -36,6 +100,8 @@ async def create_diary_route(
             feedback=analysis.get("feedback", ""),
             risk_level=analysis.get("risk_level", "none"),
             risk_resources=analysis.get("risk_resources"),
+            analysis_version=analysis.get("analysis_version"),
+            analysis_source=analysis.get("analysis_source", "llm"),
         )
         return saved
 
@@ -46,19 +112,285 @@ async def create_diary_route(
 
 
 # ==================================================
-# ✅ 사용자 전체 일기 조회
+# ✅ 일기 저장 + 분석 결과 스트리밍 (SSE)
+#   최종 경로: POST /diary/diary/stream   (응답: text/event-stream)
+#   이벤트 순서
+#     verdict  : {"analyzed_emotion", "score", "risk_level"} — 판정 값이 생성되는 즉시
+#     feedback : {"delta": "..."} — 피드백 문장을 생성되는 대로 여러 번
+#     reset    : {"reason": "..."} — 스트리밍 중 실패해 다른 분석으로 대체함
+#                → 지금까지 받은 verdict/feedback을 버리고 뒤따르는 verdict/feedback으로 교체
+#     done     : 저장된 DiaryResponse 전체 (최종 기준값, 앞선 이벤트와 다르면 이쪽이 맞음)
+#     error    : {"detail": "..."}
+#   - 입장 제어는 응답 시작 전에 수행 → 사용자별 한도 초과는 일반 429(Retry-After)
+#     과부하 + defer 설정이면 pending으로 저장하고 done 이벤트 하나만 전송
+#   - 분석/저장은 별도 태스크에서 진행 → 클라이언트가 끊겨도 일기는 저장됨
+# ==================================================
+_stream_tasks: set = set()
+_STREAM_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def _sse(event: str, data: str) -> str:
+    return f"event: {event}\ndata: {data}\n\n"
+
+
+async def _sse_from_queue(queue: asyncio.Queue):
+    while True:
+        item = await queue.get()
+        if item is None:
+            return
+        yield item
+
+
+async def _analyze_and_save(user_id: str, diary: DiaryCreate, slot: AsyncExitStack, queue: asyncio.Queue) -> None:
+    async def emit(event: str, data: dict) -> None:
+        queue.put_nowait(_sse(event, json.dumps(data, ensure_ascii=False)))
+
+    try:
+        async with slot:
+            analysis = await analyze_emotion_streaming(diary.text, emit)
+        saved = await diary_model.create_diary(
+            user_id=user_id,
+            diary=diary,
+            analyzed_emotion=analysis["analyzed_emotion"],
+            reason=analysis.get("reason", ""),
+            score=analysis.get("score", 5),
+            feedback=analysis.get("feedback", ""),
+            risk_level=analysis.get("risk_level", "none"),
+            risk_resources=analysis.get("risk_resources"),
+            analysis_version=analysis.get("analysis_version"),
+            analysis_source=analysis.get("analysis_source", "llm"),
+        )
+        queue.put_nowait(_sse("done", DIARY_ADAPTER.dump_json(saved).decode()))
+    except Exception as e:
+        logger.exception("스트리밍 일기 저장 실패")
+        queue.put_nowait(_sse("error", json.dumps({"detail": f"일기 저장 중 오류 발생: {str(e)}"}, ensure_ascii=False)))
+    finally:
+        queue.put_nowait(None)
+
+
+@router.post("/diary/stream", summary="일기 저장 (분석 스트리밍)", response_class=StreamingResponse)
+async def create_diary_stream_route(
+    diary: DiaryCreate,
+    user_id: str = Depends(get_current_user_id),
+):
+    slot = AsyncExitStack()
+    try:
+        await slot.enter_async_context(admission.admit(user_id))
+    except admission.AdmissionRejected as e:
+        if not (e.overloaded and settings.admission_overload_action == "defer"):
+            raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": e.retry_after_header()})
+        admission.record_deferred()
+        try:
+            saved = await _save_deferred(user_id, diary)
+        except Exception as e:
+            raise HTTPException(status_code=500, detail=f"일기 저장 중 오류 발생: {str(e)}")
+
+        async def deferred_only():
+            yield _sse("done", DIARY_ADAPTER.dump_json(saved).decode())
+
+        return StreamingResponse(deferred_only(), media_type="text/event-stream", headers=_STREAM_HEADERS)
+
+    queue: asyncio.Queue = asyncio.Queue()
+    task = asyncio.create_task(_analyze_and_save(user_id, diary, slot, queue))
+    _stream_tasks.add(task)
+    task.add_done_callback(_stream_tasks.discard)
+    return StreamingResponse(_sse_from_queue(queue), media_type="text/event-stream", headers=_STREAM_HEADERS)
+
+
+# ==================================================
+# ✅ 사용자 일기 조회
 #   최종 경로: GET /diary/diary
+#   - 파라미터 없음: 기존과 동일하게 전체 목록(List[DiaryResponse])
+#   - limit/cursor/view=summary 중 하나라도 있으면 페이지 응답(DiaryPage)
 # ==================================================
-@router.get("/diary", response_model=List[DiaryResponse])
-async def get_user_diaries_route(user_id: str = Depends(get_current_user_id)):
+@router.get("/diary", response_model=Union[List[DiaryResponse], DiaryPage])
+async def get_user_diaries_route(
+    limit: Optional[int] = Query(None, ge=1, description="페이지 크기 (서버 상한 적용)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    view: str = Query("full", pattern="^(full|summary)$", description="summary: 본문/피드백 제외"),
+    user_id: str = Depends(get_current_user_id),
+):
     try:
-        return await diary_model.get_user_diaries(user_id)
+        if limit is None and cursor is None and view == "full":
+            items = await diary_model.get_user_diaries(user_id)
+            return _json(DIARY_LIST_ADAPTER.dump_json(items))
+
+        page_size = min(limit or settings.diary_page_default_size, settings.diary_page_max_size)
+        try:
+            page = await diary_model.get_user_diaries_page(
+                user_id, page_size, cursor=cursor, summary=(view == "summary")
+            )
+            return _json(page.model_dump_json())
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"일기 조회 중 오류 발생: {str(e)}")
 
 
+# ==================================================
+# ✅ 전체 일기 내보내기 (백업)
+#   최종 경로: GET /diary/export?format=ndjson|json&gzip=true
+#   - Motor 커서 → 비동기 제너레이터 → 청크 전송 (서버 메모리 일정)
+#   - gzip=true면 압축하면서 전송 (배치마다 sync flush로 첫 바이트 지연 최소화)
+# ==================================================
+_EXPORT_CHUNK_BYTES = 64 * 1024
+
+
+async def _export_chunks(user_id: str, fmt: str, gzip: bool):
+    compressor = zlib.compressobj(6, zlib.DEFLATED, 31) if gzip else None
+    buf: List[bytes] = []
+    size = 0
+    first = True
+
+    def emit(data: bytes, flush: bool = False) -> bytes:
+        if compressor is None:
+            return data
+        out = compressor.compress(data)
+        return out + compressor.flush(zlib.Z_SYNC_FLUSH) if flush else out
+
+    if fmt == "json":
+        buf.append(b"[")
+        size += 1
+
+    async for item in diary_model.iter_user_diaries(user_id):
+        body = DIARY_ADAPTER.dump_json(item)
+        if fmt == "json":
+            buf.append(body if first else b"," + body)
+        else:
+            buf.append(body + b"\n")
+        size += len(buf[-1])
+
+        # 첫 항목은 바로 내보내고, 이후엔 일정 크기씩 모아서 전송
+        if first or size >= _EXPORT_CHUNK_BYTES:
+            chunk = emit(b"".join(buf), flush=True)
+            if chunk:
+                yield chunk
+            buf, size = [], 0
+        first = False
+
+    if fmt == "json":
+        buf.append(b"]")
+    tail = emit(b"".join(buf))
+    if compressor is not None:
+        tail += compressor.flush(zlib.Z_FINISH)
+    if tail:
+        yield tail
+
+
+@router.get("/export", summary="일기 내보내기", description="전체 일기를 NDJSON 또는 JSON 배열로 스트리밍합니다.")
+async def export_diaries_route(
+    format: str = Query("ndjson", pattern="^(ndjson|json)$"),
+    gzip: bool = Query(False, description="gzip 압축 파일로 받기"),
+    user_id: str = Depends(get_current_user_id),
+):
+    ext = "ndjson" if format == "ndjson" else "json"
+    media_type = "application/x-ndjson" if format == "ndjson" else "application/json"
+    filename = f"diary-export-{datetime.utcnow():%Y%m%d}.{ext}"
+    if gzip:
+        media_type = "application/gzip"
+        filename += ".gz"
+
+    return StreamingResponse(
+        _export_chunks(user_id, format, gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+# ==================================================
+# ✅ 일기 일괄 가져오기 (다른 앱에서 이전)
+#   최종 경로: POST /diary/import?format=ndjson|csv
+#   - 본문: NDJSON(줄마다 DiaryCreate) 또는 CSV(date,emotion_label,emotion_emoji,text)
+#   - 형식 미지정 시 Content-Type으로 판단
+#   - 잘못된 행은 건너뛰고 행 번호별 오류로 보고 (전체 실패 X)
+#   - 감정 분석은 import_analysis_rate_per_sec 속도로 나눠 백그라운드 처리
+# ==================================================
+async def _read_limited_body(request: Request, limit: int) -> bytes:
+    declared = request.headers.get("content-length")
+    if declared and declared.isdigit() and int(declared) > limit:
+        raise HTTPException(status_code=413, detail=f"파일은 최대 {limit // (1024 * 1024)}MB까지 가져올 수 있습니다.")
+    chunks: List[bytes] = []
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+        if size > limit:
+            raise HTTPException(status_code=413, detail=f"파일은 최대 {limit // (1024 * 1024)}MB까지 가져올 수 있습니다.")
+        chunks.append(chunk)
+    return b"".join(chunks)
+
+
+@router.post("/import", response_model=DiaryImportReport, summary="일기 가져오기",
+             description="NDJSON/CSV 파일의 일기를 일괄 저장하고 감정 분석은 나중에 처리합니다.")
+async def import_diaries_route(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$"),
+    user_id: str = Depends(get_current_user_id),
+):
+    fmt = format or diary_import.detect_format(request.headers.get("content-type"))
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="format=ndjson|csv 를 지정하거나 Content-Type을 맞춰주세요.")
+
+    body = await _read_limited_body(request, settings.import_max_bytes)
+    try:
+        lines = diary_import.decode_body(body)
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="UTF-8 인코딩 파일만 가져올 수 있습니다.")
+
+    try:
+        report = await diary_import.import_diaries(user_id, diary_import.iter_rows(lines, fmt))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"일기 가져오기 중 오류 발생: {str(e)}")
+    return _json(report.model_dump_json())
+
+
+# ==================================================
+# ✅ 달력 범위 조회
+#   최종 경로: GET /diary/range?from=YYYY-MM-DD&to=YYYY-MM-DD
+#   - Asia/Seoul 기준 from 00:00 ~ to 24:00, 일기마다 날짜/이모지/분석 라벨/위험도만
+#   - 한 달 달력 = 요청 1회
+# ==================================================
+@router.get("/range", response_model=List[DiaryCalendarEntry], summary="달력 범위 조회")
+async def get_diary_range_route(
+    from_date: Date = Query(..., alias="from"),
+    to_date: Date = Query(..., alias="to"),
+    user_id: str = Depends(get_current_user_id),
+):
+    if to_date < from_date:
+        raise HTTPException(status_code=400, detail="to는 from보다 같거나 늦어야 합니다.")
+    if (to_date - from_date).days + 1 > settings.diary_range_max_days:
+        raise HTTPException(
+            status_code=400,
+            detail=f"한 번에 최대 {settings.diary_range_max_days}일까지 조회할 수 있습니다.",
+        )
+    try:
+        entries = await diary_model.get_diaries_in_range(user_id, from_date, to_date)
+        return _json(CALENDAR_ADAPTER.dump_json(entries))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"일기 조회 중 오류 발생: {str(e)}")
+
+
+# ==================================================
+# ✅ 일기 본문 검색
+#   최종 경로: GET /diary/search?q=무기력&limit=20
+#   - 작성/수정 시 만든 n-gram 색인으로 조회 (본문 $regex 전체 스캔 X)
+#   - 일치율 → 최신순으로 정렬, 일치 위치 주변 스니펫 포함
+# ==================================================
+@router.get("/search", response_model=List[DiarySearchHit], summary="일기 검색")
+async def search_diaries_route(
+    q: str = Query(..., min_length=2, max_length=100),
+    limit: Optional[int] = Query(None, ge=1),
+    user_id: str = Depends(get_current_user_id),
+):
+    limit = min(limit or settings.search_default_limit, settings.search_max_limit)
+    try:
+        hits = await diary_model.search_diaries(user_id, q, limit, settings.search_min_match_ratio)
+        return _json(SEARCH_ADAPTER.dump_json(hits))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"일기 검색 중 오류 발생: {str(e)}")
+
+
 # ==================================================
 # ✅ 특정 날짜의 일기 조회 (YYYY-MM-DD)
 #   최종 경로: GET /diary/diary/by-date/{target_date}
@@ -69,17 +401,62 @@ async def get_diary_by_date_route(
     user_id: str = Depends(get_current_user_id),
 ):
     try:
-        target_dt = datetime.combine(target_date, datetime.min.time())
-        diary = await diary_model.get_diary_by_date(user_id, target_dt)
+        diary = await diary_model.get_diary_by_date(user_id, target_date)
         if not diary:
             raise HTTPException(status_code=404, detail="해당 날짜의 일기를 찾을 수 없습니다.")
-        return diary
+        return _json(diary.model_dump_json())
     except HTTPException:
         raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"일기 조회 중 오류 발생: {str(e)}")
 
 
+# ==================================================
+# ✅ 감정 분석 진행 상태 조회 (지연 분석 모드 폴링)
+#   최종 경로: GET /diary/diary/{diary_id}/status
+# ==================================================
+@router.get("/diary/{diary_id}/status", response_model=DiaryAnalysisStatus)
+async def get_analysis_status_route(
+    diary_id: str,
+    user_id: str = Depends(get_current_user_id),
+):
+    diary = await diary_model.get_diary_by_id(user_id, diary_id)
+    if not diary:
+        raise HTTPException(status_code=404, detail="일기를 찾을 수 없습니다.")
+
+    job = await job_model.get_job(ObjectId(diary_id), user_id)
+    return DiaryAnalysisStatus(
+        id=diary.id,
+        analysis_status=diary.analysis_status,
+        attempts=job.get("attempts", 0) if job else 0,
+        last_error=job.get("last_error") if job else None,
+        diary=diary if diary.analysis_status != "pending" else None,
+    )
+
+
+# ==================================================
+# ✅ 비슷한 지난 일기
+#   최종 경로: GET /diary/diary/{diary_id}/similar?limit=5
+#   - 외부 임베딩 API 없이 로컬 n-gram 벡터의 코사인 유사도로 순위
+# ==================================================
+@router.get("/diary/{diary_id}/similar", response_model=List[SimilarDiary])
+async def get_similar_diaries_route(
+    diary_id: str,
+    limit: Optional[int] = Query(None, ge=1),
+    user_id: str = Depends(get_current_user_id),
+):
+    if not ObjectId.is_valid(diary_id):
+        raise HTTPException(status_code=400, detail="잘못된 일기 ID 형식입니다.")
+    limit = min(limit or settings.similar_default_limit, settings.similar_max_limit)
+    try:
+        items = await diary_model.get_similar_diaries(user_id, diary_id, limit)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"비슷한 일기 조회 중 오류 발생: {str(e)}")
+    if items is None:
+        raise HTTPException(status_code=404, detail="일기를 찾을 수 없습니다.")
+    return _json(SIMILAR_ADAPTER.dump_json(items))
+
+
 # ==================================================
 # ✅ 단일 일기 조회 (id 기준)
 #   최종 경로: GET /diary/diary/{diary_id}
@@ -92,7 +469,7 @@ async def get_diary_by_id_route(
     diary = await diary_model.get_diary_by_id(user_id, diary_id)
     if not diary:
         raise HTTPException(status_code=404, detail="일기를 찾을 수 없습니다.")
-    return diary
+    return _json(diary.model_dump_json())
 
 
 # ==================================================
@@ -1,13 +1,60 @@
 # app/routes/health.py
 from fastapi import APIRouter
-from app.db import db
+import app.db.mongo as mongo
+from app.auth.jwt import get_token_cache_stats
+from app.services.analysis_cache import get_cache_stats
+from app.services.response_cache import get_response_cache_stats
+from app.services.similar_diaries import get_similar_cache_stats
+from app.services.admission import get_admission_stats
+from app.services.emotion_analysis import get_analysis_resilience_stats
+from app.services.llm_client import get_llm_stats
 
 router = APIRouter()
 
 @router.get("/health/db")
 async def check_db():
     try:
-        await db.command("ping")
-        return {"status": "ok", "message": "MongoDB 연결 정상"}
+        await mongo.get_db().command("ping")
+        return {"status": "ok", "message": "MongoDB 연결 정상", "pool": mongo.pool_stats.snapshot()}
     except Exception as e:
         return {"status": "fail", "error": str(e)}
+
+
+@router.get("/health/db/pool")
+async def db_pool_stats():
+    return {"status": "ok", "pool": mongo.pool_stats.snapshot()}
+
+
+@router.get("/health/analysis-cache")
+async def analysis_cache_stats():
+    return {"status": "ok", "cache": get_cache_stats()}
+
+
+@router.get("/health/response-cache")
+async def response_cache_stats():
+    return {"status": "ok", "cache": get_response_cache_stats()}
+
+
+@router.get("/health/auth-cache")
+async def auth_cache_stats():
+    return {"status": "ok", "cache": get_token_cache_stats()}
+
+
+@router.get("/health/similar-cache")
+async def similar_cache_stats():
+    return {"status": "ok", "cache": get_similar_cache_stats()}
+
+
+@router.get("/health/admission")
+async def admission_stats():
+    return {"status": "ok", "admission": get_admission_stats()}
+
+
+@router.get("/health/analysis")
+async def analysis_resilience_stats():
+    return {"status": "ok", "analysis": get_analysis_resilience_stats()}
+
+
+@router.get("/health/llm")
+async def llm_stats():
+    return {"status": "ok", "llm": get_llm_stats()}
@@ -0,0 +1,42 @@
+# app/routes/metrics.py
+from fastapi import APIRouter
+from fastapi.responses import Response
+
+import app.db.mongo as mongo
+from app.auth.jwt import get_token_cache_stats
+from app.services import metrics
+from app.services.admission import get_admission_stats
+from app.services.analysis_cache import get_cache_stats
+from app.services.emotion_analysis import get_analysis_resilience_stats, llm_breaker
+from app.services.llm_client import get_llm_stats
+from app.services.password_hasher import get_hasher_stats
+from app.services.response_cache import get_response_cache_stats
+from app.services.similar_diaries import get_similar_cache_stats
+
+router = APIRouter()
+
+# ==================================================
+# ✅ 기존 /health/* 통계 → 수집 시점 게이지 (값 복사 없이 스크레이프 때만 읽음)
+# ==================================================
+metrics.register_stats("diary_mongo_pool", "MongoDB 커넥션 풀", mongo.pool_stats.snapshot)
+metrics.register_stats("diary_llm", "LLM 클라이언트 (동시 호출/용도별 토큰)", get_llm_stats, labelled={"by_purpose": "purpose"})
+metrics.register_stats("diary_admission", "동기 분석 입장 제어", get_admission_stats)
+metrics.register_stats("diary_analysis", "감정 분석 차단기/헤징/분류기", get_analysis_resilience_stats)
+metrics.register_stats("diary_password_hasher", "argon2 해시 대기열", get_hasher_stats)
+metrics.register_stats("diary_analysis_cache", "감정 분석 결과 캐시", get_cache_stats)
+metrics.register_stats("diary_response_cache", "통계/안전 응답 캐시", get_response_cache_stats)
+metrics.register_stats("diary_auth_cache", "검증 완료 토큰 캐시", get_token_cache_stats)
+metrics.register_stats("diary_similar_cache", "비슷한 일기 행렬 캐시", get_similar_cache_stats)
+metrics.register_collector(lambda: [(
+    "diary_llm_breaker_state", "gauge", "LLM 차단기 상태 (현재 상태만 1)",
+    metrics.enum_samples(llm_breaker.state, ("closed", "open", "half_open")),
+)])
+
+
+# ==================================================
+# ✅ Prometheus 스크레이프 엔드포인트
+#   최종 경로: GET /metrics (인증 없음 — 외부 노출 시 프록시에서 차단 권장)
+# ==================================================
+@router.get("/metrics", include_in_schema=False)
+async def metrics_route():
+    return Response(content=metrics.render(), media_type=metrics.CONTENT_TYPE)
@@ -1,66 +1,76 @@
 # app/routes/stats.py
 from fastapi import APIRouter, Depends, HTTPException
-from datetime import datetime, timedelta
+from collections import defaultdict
+from datetime import date as Date, datetime, timedelta
 from app.auth.jwt import get_current_user_id
-from app.db.mongo import db
+import app.models.rollup as rollup_model
+from app.services.response_cache import cached_user_response
 
 router = APIRouter(prefix="/stats", tags=["Stats"])
 
-TZ = "Asia/Seoul"
+TZ = rollup_model.TZ_NAME
+
+
+# ==================================================
+# ✅ 일별 집계 → (버킷, 라벨)별 빈도 + 평균 score
+#    - 원본 diaries를 다시 $group 하지 않고 diary_daily_rollups를 합산
+#    - 기간 경계는 일 단위(Asia/Seoul)로 맞춰짐
+# ==================================================
+def _group_by_label(rollups, bucket_of):
+    acc = defaultdict(lambda: {"count": 0, "score_sum": 0, "score_count": 0})
+    for r in rollups:
+        bucket = bucket_of(Date.fromisoformat(r["day"]))
+        for label, e in (r.get("emotions") or {}).items():
+            if not e.get("count"):
+                continue
+            a = acc[(bucket, label)]
+            a["count"] += e.get("count", 0)
+            a["score_sum"] += e.get("score_sum", 0)
+            a["score_count"] += e.get("score_count", 0)
+    return acc
+
+
+def _avg(a) -> float | None:
+    return round(a["score_sum"] / a["score_count"], 2) if a["score_count"] else None
+
+
+def _sum_risk(rollups) -> dict:
+    out: dict = defaultdict(int)
+    for r in rollups:
+        for level, cnt in (r.get("risk") or {}).items():
+            out[level] += cnt
+    return out
 
 
 # ==================================================
 # ✅ 최근 5주 주간 통계 (라벨: "MM/DD ~ MM/DD")
 #    - analyzed_emotion.label 기준 빈도 + 평균 score
-#    - 타임존 고정, 널 label 방지
+#    - 타임존 고정(Asia/Seoul), 주 시작은 일요일 ($dateTrunc week 기본값과 동일)
 # ==================================================
+async def _weekly_stats(user_id: str) -> dict:
+    start_date = datetime.utcnow() - timedelta(weeks=5)
+    rollups = await rollup_model.get_user_rollups(user_id, start_date)
+
+    def week_start(d: Date) -> Date:
+        return d - timedelta(days=(d.weekday() + 1) % 7)
+
+    acc = _group_by_label(rollups, week_start)
+    result = [
+        {
+            "week": f"{ws:%m/%d} ~ {ws + timedelta(days=6):%m/%d}",
+            "label": label,
+            "count": a["count"],
+            "avg_score": _avg(a),
+        }
+        for (ws, label), a in sorted(acc.items(), key=lambda kv: kv[0])
+    ]
+    return {"weekly": result}
+
+
 @router.get("/weekly")
 async def get_weekly_stats(user_id: str = Depends(get_current_user_id)):
     try:
-        start_date = datetime.utcnow() - timedelta(weeks=5)
-
-        pipeline = [
-            {"$match": {
-                "user_id": user_id,
-                "created_at": {"$gte": start_date}
-            }},
-            {"$set": {
-                "weekStart": {
-                    "$dateTrunc": {
-                        "date": "$created_at",
-                        "unit": "week",
-                        "timezone": TZ
-                    }
-                },
-                "emoLabel": {"$ifNull": ["$analyzed_emotion.label", "중립"]},
-            }},
-            {"$group": {
-                "_id": {"weekStart": "$weekStart", "emotion": "$emoLabel"},
-                "count": {"$sum": 1},
-                "avg_score": {"$avg": "$score"}
-            }},
-            {"$project": {
-                "_id": 0,
-                "week": {
-                    "$concat": [
-                        {"$dateToString": {"format": "%m/%d", "date": "$_id.weekStart", "timezone": TZ}},
-                        " ~ ",
-                        {"$dateToString": {
-                            "format": "%m/%d",
-                            "date": {"$dateAdd": {"startDate": "$_id.weekStart", "unit": "day", "amount": 6}},
-                            "timezone": TZ
-                        }}
-                    ]
-                },
-                "label": "$_id.emotion",
-                "count": 1,
-                "avg_score": {"$round": ["$avg_score", 2]}
-            }},
-            {"$sort": {"week": 1}}
-        ]
-
-        result = await db["diaries"].aggregate(pipeline).to_list(None)
-        return {"weekly": result}
+        return await cached_user_response(user_id, "stats.weekly", lambda: _weekly_stats(user_id))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"주간 통계 오류: {str(e)}")
 
@@ -69,37 +79,22 @@ async def get_weekly_stats(user_id: str = Depends(get_current_user_id)):
 # ✅ 최근 3개월 월간 통계 (라벨: YYYY-MM)
 #    - analyzed_emotion.label 기준 빈도 + 평균 score
 # ==================================================
+async def _monthly_stats(user_id: str) -> dict:
+    start_date = datetime.utcnow() - timedelta(days=90)
+    rollups = await rollup_model.get_user_rollups(user_id, start_date)
+
+    acc = _group_by_label(rollups, lambda d: f"{d:%Y-%m}")
+    result = [
+        {"month": month, "label": label, "count": a["count"], "avg_score": _avg(a)}
+        for (month, label), a in sorted(acc.items(), key=lambda kv: kv[0])
+    ]
+    return {"monthly": result}
+
+
 @router.get("/monthly")
 async def get_monthly_stats(user_id: str = Depends(get_current_user_id)):
     try:
-        start_date = datetime.utcnow() - timedelta(days=90)
-
-        pipeline = [
-            {"$match": {
-                "user_id": user_id,
-                "created_at": {"$gte": start_date}
-            }},
-            {"$set": {
-                "emoLabel": {"$ifNull": ["$analyzed_emotion.label", "중립"]},
-                "month": {"$dateToString": {"format": "%Y-%m", "date": "$created_at", "timezone": TZ}}
-            }},
-            {"$group": {
-                "_id": {"month": "$month", "emotion": "$emoLabel"},
-                "count": {"$sum": 1},
-                "avg_score": {"$avg": "$score"}
-            }},
-            {"$project": {
-                "_id": 0,
-                "month": "$_id.month",
-                "label": "$_id.emotion",
-                "count": 1,
-                "avg_score": {"$round": ["$avg_score", 2]}
-            }},
-            {"$sort": {"month": 1}}
-        ]
-
-        result = await db["diaries"].aggregate(pipeline).to_list(None)
-        return {"monthly": result}
+        return await cached_user_response(user_id, "stats.monthly", lambda: _monthly_stats(user_id))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"월간 통계 오류: {str(e)}")
 
@@ -109,57 +104,28 @@ async def get_monthly_stats(user_id: str = Depends(get_current_user_id)):
 #    - risk_level: none / moderate / high (없으면 none)
 #    - 프론트 도넛/바 차트에 바로 사용
 # ==================================================
+async def _risk_stats(user_id: str) -> dict:
+    start_date = datetime.utcnow() - timedelta(days=30)
+    rollups = await rollup_model.get_user_rollups(user_id, start_date)
+    counts = _sum_risk(rollups)
+
+    # 누락 레벨 보정(0 채워 넣기) — 차트용
+    base = {"none": 0, "low": 0, "moderate": 0, "high": 0}
+    for rl, cnt in counts.items():
+        rl = (rl or "none").lower()
+        if rl in base:
+            base[rl] += cnt
+
+    # 응답
+    return {
+        "since": start_date.isoformat(),
+        "summary": [{"risk_level": k, "count": v} for k, v in base.items()]
+    }
+
+
 @router.get("/risk")
 async def get_risk_stats(user_id: str = Depends(get_current_user_id)):
     try:
-        start_date = datetime.utcnow() - timedelta(days=30)
-
-        pipeline = [
-            {"$match": {
-                "user_id": user_id,
-                "created_at": {"$gte": start_date}
-            }},
-            {"$set": {
-                "risk": {"$ifNull": ["$risk_level", "none"]}
-            }},
-            {"$group": {
-                "_id": "$risk",
-                "count": {"$sum": 1}
-            }},
-            {"$project": {
-                "_id": 0,
-                "risk_level": "$_id",
-                "count": 1
-            }},
-            {"$addFields": {
-                "order": {
-                    "$switch": {
-                        "branches": [
-                            {"case": {"$eq": ["$risk_level", "high"]}, "then": 0},
-                            {"case": {"$eq": ["$risk_level", "moderate"]}, "then": 1},
-                            {"case": {"$eq": ["$risk_level", "low"]}, "then": 2},
-                            {"case": {"$eq": ["$risk_level", "none"]}, "then": 3},
-                        ],
-                        "default": 4
-                    }
-                }
-            }},
-            {"$sort": {"order": 1}}
-        ]
-
-        data = await db["diaries"].aggregate(pipeline).to_list(None)
-
-        # 누락 레벨 보정(0 채워 넣기) — 차트용
-        base = {"none": 0, "low": 0, "moderate": 0, "high": 0}
-        for r in data:
-            rl = (r.get("risk_level") or "none").lower()
-            if rl in base:
-                base[rl] = r.get("count", 0)
-
-        # 응답
-        return {
-            "since": start_date.isoformat(),
-            "summary": [{"risk_level": k, "count": v} for k, v in base.items()]
-        }
+        return await cached_user_response(user_id, "stats.risk", lambda: _risk_stats(user_id))
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"위험도 통계 오류: {str(e)}")
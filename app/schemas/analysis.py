@@ -0,0 +1,53 @@
+# app/schemas/analysis.py
+from typing import Literal
+
+from pydantic import BaseModel, Field, field_validator
+
+EmotionLabel = Literal["행복", "슬픔", "분노", "불안", "중립"]
+RiskLevel = Literal["none", "mild", "moderate", "high"]
+
+
+# ==================================================
+# ✅ LLM 감정 분석 출력 (구조화 출력 검증용)
+#   필드 순서 = 모델 출력 순서: 짧은 판정 값(label/score/risk_level)을 먼저,
+#   긴 문장(reason/feedback)을 나중에 → 스트리밍 시 판정을 먼저 받을 수 있음
+# ==================================================
+class EmotionAnalysisOutput(BaseModel):
+    label: EmotionLabel
+    score: int = Field(..., ge=1, le=10)
+    risk_level: RiskLevel
+    reason: str = Field(..., min_length=1, max_length=500)
+    feedback: str = Field(..., min_length=1, max_length=300)
+
+    @field_validator("risk_level", mode="before")
+    @classmethod
+    def _lower_risk(cls, v):
+        return v.strip().lower() if isinstance(v, str) else v
+
+    @field_validator("score", mode="before")
+    @classmethod
+    def _round_score(cls, v):
+        # "7", 7.4 등도 허용
+        try:
+            return int(round(float(v)))
+        except (TypeError, ValueError):
+            return v
+
+
+# OpenAI response_format={"type": "json_schema"} 용 (strict 모드: 모든 필드 필수, 추가 필드 금지)
+EMOTION_ANALYSIS_JSON_SCHEMA = {
+    "name": "emotion_analysis",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {
+            "label": {"type": "string", "enum": ["행복", "슬픔", "분노", "불안", "중립"]},
+            "score": {"type": "integer", "description": "감정 강도 1~10"},
+            "risk_level": {"type": "string", "enum": ["none", "mild", "moderate", "high"]},
+            "reason": {"type": "string", "description": "판단 근거 한두 문장"},
+            "feedback": {"type": "string", "description": "사용자에게 전할 따뜻한 한 문장"},
+        },
+        "required": ["label", "score", "risk_level", "reason", "feedback"],
+        "additionalProperties": False,
+    },
+}
@@ -1,6 +1,6 @@
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, TypeAdapter
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Union
 
 # ==================================================
 # ✅ 감정 구조 정의
@@ -55,6 +55,8 @@ class DiaryResponse(BaseModel):
     feedback: str                             # AI 피드백
     risk_level: str = "none"
     risk_resources: Optional[List[dict]] = None  # ✅ 수정됨 (리소스 객체 리스트)
+    analysis_status: str = "done"             # pending | done | failed
+    analysis_source: Optional[str] = None     # llm | local (LLM 장애 시 로컬 간이 분석)
     created_at: Optional[datetime] = None
 
     class Config:
@@ -75,6 +77,123 @@ class DiaryResponse(BaseModel):
                     {"label": "정신건강위기 1588-9191", "tel": "1588-9191"},
                     {"label": "국가트라우마센터", "url": "https://www.nct.go.kr"},
                 ],
+                "analysis_status": "done",
                 "created_at": "2025-07-28T12:00:00"
             }
         }
+
+
+# ==================================================
+# ✅ 일기 목록용 요약 스키마 (본문/분석 근거/피드백/리소스 제외)
+# ==================================================
+class DiarySummary(BaseModel):
+    """
+    무한 스크롤 목록용 경량 응답 (view=summary)
+    """
+    id: str
+    user_id: str
+    date: datetime
+    emotion: EmotionDetail
+    analyzed_emotion: EmotionDetail
+    score: int
+    risk_level: str = "none"
+    analysis_status: str = "done"
+    created_at: Optional[datetime] = None
+
+
+# ==================================================
+# ✅ 달력용 일별 요약 (GET /diary/range)
+# ==================================================
+class DiaryCalendarEntry(BaseModel):
+    """
+    달력 칸에 필요한 값만 (day는 Asia/Seoul 기준 YYYY-MM-DD)
+    """
+    id: str
+    day: str
+    emoji: str
+    analyzed_label: str
+    risk_level: str = "none"
+
+
+# ==================================================
+# ✅ 본문 검색 결과 (GET /diary/search)
+# ==================================================
+class DiarySearchHit(BaseModel):
+    """
+    score: 질의 n-gram 중 일치한 비율 (0~1), snippet: 일치 위치 주변 본문
+    """
+    id: str
+    date: datetime
+    emotion: EmotionDetail
+    analyzed_emotion: EmotionDetail
+    risk_level: str = "none"
+    score: float
+    snippet: str
+
+
+# ==================================================
+# ✅ 비슷한 지난 일기 (GET /diary/diary/{id}/similar)
+# ==================================================
+class SimilarDiary(BaseModel):
+    """
+    similarity: 코사인 유사도 (0~1), preview: 본문 앞부분
+    """
+    id: str
+    date: datetime
+    emotion: EmotionDetail
+    analyzed_emotion: EmotionDetail
+    risk_level: str = "none"
+    similarity: float
+    preview: str
+
+
+# ==================================================
+# ✅ 커서 기반 페이지 응답
+# ==================================================
+class DiaryPage(BaseModel):
+    """
+    next_cursor가 None이면 마지막 페이지
+    """
+    items: List[Union[DiaryResponse, DiarySummary]]
+    next_cursor: Optional[str] = None
+
+
+# ==================================================
+# ✅ 감정 분석 진행 상태 응답 스키마 (지연 분석 모드 폴링용)
+# ==================================================
+class DiaryAnalysisStatus(BaseModel):
+    """
+    analysis_status가 done/failed가 되면 diary에 최종 결과가 채워집니다.
+    """
+    id: str
+    analysis_status: str                      # pending | done | failed
+    attempts: int = 0
+    last_error: Optional[str] = None
+    diary: Optional[DiaryResponse] = None
+
+
+# ==================================================
+# ✅ 일괄 가져오기 결과 (행 단위 오류 보고)
+# ==================================================
+class DiaryImportError(BaseModel):
+    row: int                                  # 1부터 시작 (CSV는 헤더 다음 행이 1)
+    error: str
+
+
+class DiaryImportReport(BaseModel):
+    total: int
+    inserted: int
+    failed: int
+    errors: List[DiaryImportError] = []
+    analysis_scheduled_until: Optional[datetime] = None   # 마지막 분석 예정 시각(UTC)
+
+
+# ==================================================
+# ✅ 응답 직렬화기 (스키마를 한 번만 컴파일해 재사용)
+#   - 라우트에서 bytes로 바로 직렬화 → FastAPI response_model 재검증/재직렬화 생략
+# ==================================================
+DIARY_ADAPTER = TypeAdapter(DiaryResponse)
+DIARY_LIST_ADAPTER = TypeAdapter(List[DiaryResponse])
+CALENDAR_ADAPTER = TypeAdapter(List[DiaryCalendarEntry])
+SEARCH_ADAPTER = TypeAdapter(List[DiarySearchHit])
+SIMILAR_ADAPTER = TypeAdapter(List[SimilarDiary])
@@ -0,0 +1,113 @@
+# app/scripts/bench_diary_search.py
+"""
+일기 누적 건수별 검색 지연 비교 (로컬 mongod 임시 DB 사용).
+
+  - regex : diaries에서 {user_id, text: {$regex}} → 사용자 일기 전체를 훑음 (건수에 비례)
+  - ngram : diary_search_terms {user_id, grams $in} → 색인 항목만 조회 (거의 일정)
+
+실행:
+  python -m app.scripts.bench_diary_search --uri mongodb://localhost:27017 --sizes 500,2000,8000
+"""
+import argparse
+import asyncio
+import os
+import random
+import re
+import statistics
+import time
+from datetime import datetime, timedelta
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+os.environ.setdefault("MONGO_URI", "mongodb+srv://bench.invalid/diary")
+os.environ.setdefault("MONGODB_DB", "diary")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+USER = "bench_user"
+FILLER = [
+    "오늘은 회사에서 회의가 길어져서 조금 피곤했다.", "친구와 저녁을 먹고 산책을 했다.",
+    "비가 와서 하루 종일 집에 있었다.", "운동을 다녀오니 기분이 한결 나아졌다.",
+    "주말에 가족과 함께 시장에 다녀왔다.", "책을 읽다가 일찍 잠들었다.",
+    "점심 메뉴를 고르느라 한참 고민했다.", "버스를 놓쳐서 지각할 뻔했다.",
+]
+NEEDLES = ["무기력", "제주도 여행", "고양이 병원", "이사 준비"]
+
+
+def _text(rng: random.Random) -> str:
+    parts = rng.sample(FILLER, 4)
+    if rng.random() < 0.02:
+        parts.insert(rng.randrange(len(parts)), f"{rng.choice(NEEDLES)}에 대해 한참 생각했다.")
+    return " ".join(parts)
+
+
+async def _seed(db, size: int) -> None:
+    from app.db.indexes import ensure_indexes
+    import app.models.search_index as search_index
+
+    rng = random.Random(size)
+    now = datetime.utcnow()
+    await db["diaries"].delete_many({})
+    await db[search_index.SEARCH_COLLECTION].delete_many({})
+
+    docs = [{
+        "user_id": USER,
+        "date": now - timedelta(days=i),
+        "created_at": now - timedelta(days=i),
+        "text": _text(rng),
+    } for i in range(size)]
+    for i in range(0, len(docs), 1000):
+        await db["diaries"].insert_many(docs[i:i + 1000])
+
+    ops_docs = [search_index._entry(d) for d in docs]
+    for i in range(0, len(ops_docs), 1000):
+        await db[search_index.SEARCH_COLLECTION].insert_many(ops_docs[i:i + 1000])
+    await ensure_indexes(db)
+
+
+async def _timed(fn, repeat: int):
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        await fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    times.sort()
+    return statistics.median(times), times[max(0, int(len(times) * 0.95) - 1)]
+
+
+async def run(args) -> None:
+    import app.db.mongo as mongo
+    import app.models.search_index as search_index
+
+    client = AsyncIOMotorClient(args.uri, serverSelectionTimeoutMS=5000)
+    db = client[args.db]
+    mongo.db = db   # search_index.search()가 mongo.db를 사용
+    try:
+        print(f"{'건수':>8} | {'regex p50':>10} {'p95':>8} | {'ngram p50':>10} {'p95':>8}  (ms)")
+        for size in [int(s) for s in args.sizes.split(",")]:
+            await _seed(db, size)
+            query = "무기력"
+
+            async def by_regex():
+                await db["diaries"].find(
+                    {"user_id": USER, "text": {"$regex": re.escape(query)}}, {"_id": 1}
+                ).sort("date", -1).limit(20).to_list(20)
+
+            async def by_ngram():
+                await search_index.search(USER, query, 20)
+
+            r50, r95 = await _timed(by_regex, args.repeat)
+            n50, n95 = await _timed(by_ngram, args.repeat)
+            print(f"{size:>8} | {r50:>10.2f} {r95:>8.2f} | {n50:>10.2f} {n95:>8.2f}")
+    finally:
+        await client.drop_database(args.db)
+        client.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", default=os.getenv("PLAN_CHECK_MONGO_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="diary_search_bench")
+    parser.add_argument("--sizes", default="500,2000,8000")
+    parser.add_argument("--repeat", type=int, default=50)
+    asyncio.run(run(parser.parse_args()))
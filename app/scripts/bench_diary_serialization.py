@@ -0,0 +1,89 @@
+# app/scripts/bench_diary_serialization.py
+"""
+일기 문서 10k건 직렬화 비용 비교 (CPU 시간 + tracemalloc 최대 할당량).
+
+  - before: serialize() → DiaryResponse(**) → (FastAPI response_model)
+            model_dump → 재검증 → JSON 모드 덤프 → json.dumps
+  - after : serialize() → DiaryResponse(**) → TypeAdapter.dump_json (1회 검증, Rust 직렬화)
+
+실행:
+  python -m app.scripts.bench_diary_serialization --docs 10000
+"""
+import argparse
+import json
+import os
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+from typing import List
+
+from bson import ObjectId
+
+
+def _make_docs(n: int) -> list:
+    now = datetime.utcnow()
+    return [{
+        "_id": ObjectId(),
+        "user_id": "philip0110",
+        "date": now - timedelta(days=i),
+        "text": "요즘 너무 무기력하고 아무것도 하기 싫어요. 누구한테 말할 수 없고 마음이 울적합니다." * 3,
+        "emotion": {"label": "슬픔", "emoji": "😢"},
+        "analyzed_emotion": {"label": "불안", "emoji": "😰"},
+        "reason": "걱정과 불안의 표현이 강하게 나타났습니다.",
+        "score": 6,
+        "feedback": "오늘은 스스로에게 휴식을 허락해 주세요.",
+        "risk_level": "moderate",
+        "risk_resources": [
+            {"label": "정신건강상담전화", "tel": "1577-0199"},
+            {"label": "웰니스 자료 모음", "url": "https://www.mentalhealth.go.kr"},
+        ],
+        "analysis_status": "done",
+        "created_at": now - timedelta(days=i),
+    } for i in range(n)]
+
+
+def _measure(label: str, fn, docs) -> None:
+    tracemalloc.start()
+    t0 = time.process_time()
+    body = fn(docs)
+    cpu = time.process_time() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"[{label:6}] CPU {cpu * 1000:8.1f} ms | 최대 할당 {peak / 1024 / 1024:7.1f} MiB | {len(body) / 1024:8.1f} KiB")
+
+
+def main(args):
+    os.environ.setdefault("MONGO_URI", "mongodb+srv://bench.invalid/diary")
+    os.environ.setdefault("MONGODB_DB", "diary")
+    os.environ.setdefault("JWT_SECRET", "bench")
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+    from pydantic import TypeAdapter
+    from app.models.diary import serialize
+    from app.schemas.diary import DiaryResponse, DIARY_LIST_ADAPTER
+
+    response_field = TypeAdapter(List[DiaryResponse])  # FastAPI response_model 필드 역할
+
+    def before(docs) -> bytes:
+        items = [DiaryResponse(**serialize(d)) for d in docs]
+        # FastAPI: 모델 → dict → response_model로 재검증 → JSON 모드 dump → json.dumps
+        content = [i.model_dump() for i in items]
+        validated = response_field.validate_python(content)
+        jsonable = response_field.dump_python(validated, mode="json")
+        return json.dumps(jsonable, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+    def after(docs) -> bytes:
+        items = [DiaryResponse(**serialize(d)) for d in docs]
+        return DIARY_LIST_ADAPTER.dump_json(items)
+
+    docs = _make_docs(args.docs)
+    assert json.loads(before(docs[:3])) == json.loads(after(docs[:3]))
+    print(f"문서 {args.docs}건")
+    _measure("before", before, docs)
+    _measure("after", after, docs)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--docs", type=int, default=10000)
+    main(parser.parse_args())
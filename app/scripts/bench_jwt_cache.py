@@ -0,0 +1,44 @@
+# app/scripts/bench_jwt_cache.py
+"""
+get_current_user_id의 요청당 비용: 매번 jwt.decode vs 검증 완료 토큰 캐시 적중.
+보호된 라우트는 모두 이 의존성을 거치므로 요청당 절감량이 그대로 전 라우트에 적용됩니다.
+
+실행:
+  python -m app.scripts.bench_jwt_cache --requests 20000
+"""
+import argparse
+import asyncio
+import os
+import time
+
+
+async def main(args):
+    os.environ.setdefault("MONGO_URI", "mongodb+srv://bench.invalid/diary")
+    os.environ.setdefault("MONGODB_DB", "diary")
+    os.environ.setdefault("JWT_SECRET", "bench-secret")
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+    from app.auth import jwt as auth_jwt
+
+    token = auth_jwt.create_access_token({"user_id": "philip0110"})
+    header = f"Bearer {token}"
+
+    async def run(label: str, use_cache: bool) -> float:
+        t0 = time.perf_counter()
+        for _ in range(args.requests):
+            if not use_cache:
+                auth_jwt.token_cache._data.clear()
+            await auth_jwt.get_current_user_id(authorization=header)
+        per_req = (time.perf_counter() - t0) / args.requests * 1e6
+        print(f"[{label:8}] {per_req:8.2f} µs/요청")
+        return per_req
+
+    cold = await run("decode", use_cache=False)
+    warm = await run("cached", use_cache=True)
+    print(f"요청당 절감 {cold - warm:.2f} µs ({cold / warm:.1f}x), 캐시 통계: {auth_jwt.get_token_cache_stats()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=20000)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,98 @@
+# app/scripts/bench_keyword_matcher.py
+"""
+위험 키워드 탐지 비교: 기존 방식(키워드마다 `kw in text`) vs Aho-Corasick 단일 패스.
+긴 일기 본문과 대규모 키워드 사전(합성)을 사용합니다.
+
+실행:
+  python -m app.scripts.bench_keyword_matcher --keywords 2000 --chars 5000
+"""
+import argparse
+import random
+import re
+import time
+
+from app.services.keyword_matcher import KeywordMatcher, HIGH_KWS, MODERATE_KWS, MILD_KWS, detect_risk
+
+SYLLABLES = "가나다라마바사아자차카타파하고노도로모보소오조초코토포호기니디리미비시이지치키티피히"
+FILLER = "오늘은 회사에서 하루 종일 회의가 있었고 저녁에는 친구를 만나서 이야기를 나눴다 "
+
+
+def _synthetic_keywords(n: int, rng: random.Random):
+    kws = set()
+    while len(kws) < n:
+        kws.add("".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 5))))
+    return list(kws)
+
+
+def _naive_detect(text: str, groups) -> str:
+    # 기존 safety._kw_detect와 같은 방식 (매 호출 re.sub + 그룹별 any)
+    t = re.sub(r"\s+", " ", (text or "").strip()).lower()
+    for level, kws in groups:
+        if any(kw in t for kw in kws):
+            return level
+    return "none"
+
+
+def _bench(fn, texts, repeat: int) -> float:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        for t in texts:
+            fn(t)
+    return (time.perf_counter() - t0) / (repeat * len(texts)) * 1e6  # µs/건
+
+
+# 회귀 확인: 단어 경계를 넘는 오탐 없음 + 띄어쓰기 변형은 매칭
+REGRESSION_CASES = [
+    ("피자 살까 고민했다", "none"),
+    ("과자 살 때 기분 좋았다", "none"),
+    ("모자 살 돈이 없다", "none"),
+    ("오늘 산책 포 기분", "none"),
+    ("죽고 싶다", "high"),
+    ("죽고싶다", "high"),
+    ("죽고   싶다", "high"),
+    ("다 포기하고 싶다", "moderate"),
+    ("너무힘들다", "moderate"),
+]
+
+
+def check_regressions() -> None:
+    failed = [(t, want, detect_risk(t)) for t, want in REGRESSION_CASES if detect_risk(t) != want]
+    for text, want, got in failed:
+        print(f"  ❌ {text!r}: 기대 {want}, 결과 {got}")
+    if failed:
+        raise SystemExit(f"회귀 확인 실패 {len(failed)}건")
+    print(f"회귀 확인 통과 ({len(REGRESSION_CASES)}건)")
+
+
+def main(args):
+    check_regressions()
+    rng = random.Random(42)
+    extra = _synthetic_keywords(args.keywords, rng)
+    groups = [
+        ("high", HIGH_KWS),
+        ("moderate", MODERATE_KWS),
+        ("mild", MILD_KWS + extra),
+    ]
+
+    t0 = time.perf_counter()
+    matcher = KeywordMatcher(dict(groups))
+    build_ms = (time.perf_counter() - t0) * 1000
+
+    # 대부분은 키워드가 없는 평범한 긴 일기 (최악 경로: 모든 키워드 검사)
+    base = (FILLER * (args.chars // len(FILLER) + 1))[: args.chars]
+    texts = [base] * 9 + [base[:-20] + " 너무 힘들다"]
+
+    naive_us = _bench(lambda t: _naive_detect(t, groups), texts, args.repeat)
+    ac_us = _bench(matcher.find, texts, args.repeat)
+
+    print(f"키워드 {sum(len(k) for _, k in groups)}개, 본문 {args.chars}자, 매처 구축 {build_ms:.1f} ms")
+    print(f"  naive (any/in) : {naive_us:10.1f} µs/건")
+    print(f"  aho-corasick   : {ac_us:10.1f} µs/건  ({naive_us / ac_us:.1f}x)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--keywords", type=int, default=2000)
+    parser.add_argument("--chars", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=5)
+    main(parser.parse_args())
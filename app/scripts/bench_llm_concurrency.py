@@ -0,0 +1,134 @@
+# app/scripts/bench_llm_concurrency.py
+"""
+로컬 가짜 Chat Completion 서버를 띄워 감정 분석 동시 처리량을 비교합니다.
+
+  - before: async 함수 안에서 동기 OpenAI 클라이언트 호출 (이벤트 루프 차단)
+  - after : AsyncOpenAI + 세마포어 (app.services.emotion_analysis.analyze_emotion)
+
+실행:
+  python -m app.scripts.bench_llm_concurrency --requests 64 --latency 0.5
+"""
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+FAKE_CONTENT = json.dumps({
+    "label": "슬픔",
+    "reason": "무기력함이 드러납니다",
+    "score": 6,
+    "feedback": "오늘은 조금 쉬어가도 괜찮아요",
+    "risk_level": "mild",
+}, ensure_ascii=False)
+
+
+def _make_handler(latency: float):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length") or 0)
+            self.rfile.read(length)
+            time.sleep(latency)  # 모델 응답 지연 흉내
+            body = json.dumps({
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": int(time.time()),
+                "model": "gpt-4o",
+                "choices": [{
+                    "index": 0,
+                    "finish_reason": "stop",
+                    "message": {"role": "assistant", "content": FAKE_CONTENT},
+                }],
+                "usage": {"prompt_tokens": 300, "completion_tokens": 60, "total_tokens": 360},
+            }, ensure_ascii=False).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+def start_fake_server(latency: float) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(latency))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+async def _loop_lag_probe(stop: asyncio.Event, interval: float = 0.01) -> float:
+    """이벤트 루프가 얼마나 막혔는지(최대 지연) 측정"""
+    worst = 0.0
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - t0 - interval)
+    return worst
+
+
+async def _run(label: str, make_call, n: int) -> None:
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_loop_lag_probe(stop))
+    t0 = time.perf_counter()
+    await asyncio.gather(*(make_call() for _ in range(n)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    worst_lag = await probe
+    print(
+        f"[{label:6}] {n} req in {elapsed:6.2f}s → {n / elapsed:7.1f} req/s, "
+        f"최대 이벤트 루프 지연 {worst_lag * 1000:8.1f} ms"
+    )
+
+
+async def main(args) -> None:
+    server = start_fake_server(args.latency)
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/v1"
+
+    # 앱 설정 로드 전에 환경 변수 주입 (Settings 필수값 포함)
+    os.environ["OPENAI_BASE_URL"] = base_url
+    os.environ["LLM_MAX_CONCURRENCY"] = str(args.concurrency)
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    os.environ.setdefault("MONGO_URI", "mongodb+srv://bench.invalid/diary")
+    os.environ.setdefault("MONGODB_DB", "diary")
+    os.environ.setdefault("JWT_SECRET", "bench")
+
+    from openai import OpenAI
+    from app.services.emotion_analysis import analyze_emotion
+    from app.services.llm_client import close_llm_client
+
+    text = "요즘 너무 무기력하고 아무것도 하기 싫어요. 마음이 울적합니다."
+
+    # before: 동기 클라이언트를 async 함수 안에서 직접 호출 (기존 구현 방식)
+    sync_client = OpenAI(api_key="sk-bench", base_url=base_url, max_retries=0)
+
+    async def before_call():
+        sync_client.chat.completions.create(
+            model="gpt-4o",
+            messages=[{"role": "user", "content": text}],
+            max_tokens=1500,
+        )
+
+    async def after_call():
+        await analyze_emotion(text)
+
+    print(f"가짜 서버 {base_url} (지연 {args.latency}s), 요청 {args.requests}건")
+    await _run("before", before_call, args.requests)
+    await _run("after", after_call, args.requests)
+    await close_llm_client()
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.5)
+    parser.add_argument("--concurrency", type=int, default=32)
+    asyncio.run(main(parser.parse_args()))
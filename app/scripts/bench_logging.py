@@ -0,0 +1,102 @@
+# app/scripts/bench_logging.py
+"""
+요청 1건당 로그 비용 비교 (RequestIdMiddleware + 일기 저장과 비슷한 로그 3줄):
+  - off   : 로그 비활성 (요청 ID 미들웨어만)
+  - queue : 구조화 로그 파이프라인 (큐 + 전용 스레드, 샘플링/마스킹)
+  - sync  : 같은 JSON 포매터로 이벤트 루프에서 바로 쓰기 (기존 print와 같은 방식)
+--slow-sink-ms로 막힌 로그 드레인(파이프가 가득 찬 stdout)을 흉내 내면 sync만 지연이 커짐.
+
+실행:
+  python -m app.scripts.bench_logging --requests 20000
+  python -m app.scripts.bench_logging --requests 2000 --slow-sink-ms 0.2
+"""
+import argparse
+import asyncio
+import io
+import logging
+import os
+import statistics
+import time
+
+os.environ.setdefault("MONGODB_DB", "diary")
+
+from app.config import settings
+from app.services import structured_log as sl
+
+DIARY_TEXT = "오늘은 회사에서 하루 종일 회의가 있었고 저녁에는 친구를 만나서 이야기를 나눴다 " * 5
+logger = logging.getLogger("app.bench")
+
+
+class _Sink(io.TextIOBase):
+    """버리는 출력. delay_ms > 0이면 쓰기마다 그만큼 막힘"""
+
+    def __init__(self, delay_ms: float):
+        self.delay = delay_ms / 1000
+
+    def write(self, s: str) -> int:
+        if self.delay:
+            time.sleep(self.delay)
+        return len(s)
+
+
+async def _handler(scope, receive, send):
+    logger.info("일기 저장", extra={"fields": {"user_id": "bench", "text": DIARY_TEXT, "score": 7}})
+    logger.info("감정 분석 LLM 응답", extra=sl.hot(latency_ms=812.3, prompt_tokens=310, completion_tokens=84))
+    await send({"type": "http.response.start", "status": 200, "headers": [(b"content-type", b"application/json")]})
+    await send({"type": "http.response.body", "body": b"{}"})
+
+
+async def _drive(app, n: int) -> list:
+    async def send(message):
+        pass
+
+    scope = {"type": "http", "method": "POST", "path": "/diary/diary", "headers": []}
+    times = []
+    for _ in range(n):
+        t0 = time.perf_counter()
+        await app(dict(scope), None, send)
+        times.append((time.perf_counter() - t0) * 1e6)
+    return times
+
+
+def _configure(mode: str, sink: io.TextIOBase) -> None:
+    app_logger = logging.getLogger(sl.APP_LOGGER)
+    if mode == "queue":
+        sl.setup_logging(sink)
+        return
+    sl.shutdown_logging()
+    for h in list(app_logger.handlers):
+        app_logger.removeHandler(h)
+    app_logger.propagate = False
+    if mode == "off":
+        app_logger.setLevel(logging.CRITICAL)
+        return
+    handler = logging.StreamHandler(sink)
+    handler.setFormatter(sl.JsonFormatter())
+    handler.addFilter(sl.HotPathSampler(settings.log_hot_sample_rate))
+    handler.addFilter(sl.Redactor(settings.log_redact_fields.split(",")))
+    app_logger.addHandler(handler)
+    app_logger.setLevel(settings.log_level.upper())
+
+
+def main(args) -> None:
+    app = sl.RequestIdMiddleware(_handler)
+    print(f"requests={args.requests} sample_rate={settings.log_hot_sample_rate} slow_sink_ms={args.slow_sink_ms}")
+    for mode in ("off", "queue", "sync"):
+        _configure(mode, _Sink(args.slow_sink_ms))
+        asyncio.run(_drive(app, min(500, args.requests)))   # 워밍업
+        t0 = time.perf_counter()
+        times = sorted(asyncio.run(_drive(app, args.requests)))
+        wall = time.perf_counter() - t0
+        sl.shutdown_logging()   # queue 모드: 남은 레코드까지 쓰고 종료 (측정 밖)
+        print(
+            f"  {mode:<5} mean {statistics.fmean(times):7.1f}µs  p50 {times[len(times) // 2]:7.1f}µs  "
+            f"p99 {times[int(len(times) * 0.99)]:7.1f}µs  ({args.requests / wall:,.0f} req/s)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="요청당 로그 비용 벤치마크")
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--slow-sink-ms", type=float, default=0.0, help="로그 출력 1줄당 지연 (막힌 드레인 흉내)")
+    main(parser.parse_args())
@@ -0,0 +1,95 @@
+# app/scripts/bench_login_storm.py
+"""
+로그인 폭주(argon2 검증 N건 동시) 중 다른 엔드포인트의 지연(p50/p99)을 비교합니다.
+
+  - inline  : 이벤트 루프 스레드에서 pwd_context.verify 직접 호출 (기존 방식)
+  - executor: app.services.password_hasher 전용 스레드 풀
+
+"다른 엔드포인트"는 5ms 간격으로 도착하는 가벼운 요청(코루틴)으로 흉내냅니다.
+
+실행:
+  python -m app.scripts.bench_login_storm --logins 200 --memory-cost 65536
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+
+def _pct(values, p):
+    values = sorted(values)
+    if not values:
+        return 0.0
+    idx = min(len(values) - 1, int(round(p / 100 * (len(values) - 1))))
+    return values[idx]
+
+
+async def _other_endpoint_probe(stop: asyncio.Event, latencies: list, interval: float = 0.005):
+    while not stop.is_set():
+        t0 = time.perf_counter()
+        await asyncio.sleep(0)          # 핸들러 스케줄링
+        sum(range(200))                 # 가벼운 처리
+        latencies.append(time.perf_counter() - t0)
+        await asyncio.sleep(interval)
+
+
+async def _storm(label: str, verify_one, n: int, concurrency: int):
+    latencies: list = []
+    stop = asyncio.Event()
+    probe = asyncio.create_task(_other_endpoint_probe(stop, latencies))
+    sem = asyncio.Semaphore(concurrency)
+
+    async def login():
+        async with sem:
+            await verify_one()
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(n)))
+    elapsed = time.perf_counter() - t0
+    stop.set()
+    await probe
+
+    print(
+        f"[{label:8}] 로그인 {n}건 {elapsed:6.2f}s ({n / elapsed:6.1f}/s) | "
+        f"다른 요청 {len(latencies)}건 p50 {statistics.median(latencies) * 1000:7.2f} ms, "
+        f"p99 {_pct(latencies, 99) * 1000:7.2f} ms, max {max(latencies) * 1000:7.2f} ms"
+    )
+
+
+async def main(args):
+    os.environ.setdefault("MONGO_URI", "mongodb+srv://bench.invalid/diary")
+    os.environ.setdefault("MONGODB_DB", "diary")
+    os.environ.setdefault("JWT_SECRET", "bench")
+    os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+    if args.time_cost:
+        os.environ["ARGON2_TIME_COST"] = str(args.time_cost)
+    if args.memory_cost:
+        os.environ["ARGON2_MEMORY_COST"] = str(args.memory_cost)
+    os.environ["PASSWORD_HASH_WORKERS"] = str(args.workers)
+    os.environ["PASSWORD_HASH_MAX_QUEUE"] = str(max(args.logins, 64))
+
+    from app.services.password_hasher import pwd_context, verify_and_update_password, shutdown_hasher
+
+    hashed = pwd_context.hash("myStrongPass123")
+
+    async def inline():
+        pwd_context.verify("myStrongPass123", hashed)
+
+    async def executor():
+        await verify_and_update_password("myStrongPass123", hashed)
+
+    print(f"argon2 설정: {hashed.split('$')[3]}, 스레드 {args.workers}")
+    await _storm("inline", inline, args.logins, args.concurrency)
+    await _storm("executor", executor, args.logins, args.concurrency)
+    shutdown_hasher()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--time-cost", type=int, default=0)
+    parser.add_argument("--memory-cost", type=int, default=0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,81 @@
+# app/scripts/bench_metrics.py
+"""
+지표 기록 비용 측정: 스레드별 샤드 카운터/히스토그램 vs 전역 락 카운터.
+요청 1건당 기록(HTTP 카운터 + 히스토그램 + 게이지 2회)의 추가 시간과 /metrics 출력 시간을 봅니다.
+
+실행:
+  python -m app.scripts.bench_metrics --ops 200000 --threads 4 --routes 30
+"""
+import argparse
+import os
+import threading
+import time
+
+os.environ.setdefault("MONGODB_DB", "diary")
+
+from app.services import metrics
+
+
+class _LockedCounter:
+    """비교용: 모든 스레드가 하나의 dict를 락으로 공유"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._data = {}
+
+    def inc(self, *labels):
+        with self._lock:
+            self._data[labels] = self._data.get(labels, 0) + 1
+
+
+def _run_threads(fn, threads: int, ops: int) -> float:
+    per_thread = ops // threads
+    workers = [threading.Thread(target=fn, args=(per_thread,)) for _ in range(threads)]
+    t0 = time.perf_counter()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    return (time.perf_counter() - t0) / (per_thread * threads) * 1e9
+
+
+def main(args) -> None:
+    routes = [f"/bench/route{i}/{{id}}" for i in range(args.routes)]
+    c = metrics.counter("bench_requests_total", "bench", ("method", "route", "status"))
+    h = metrics.histogram("bench_request_duration_seconds", "bench", ("method", "route"))
+    g = metrics.gauge("bench_in_flight", "bench")
+    locked = _LockedCounter()
+
+    def sharded_request(n):
+        for i in range(n):
+            route = routes[i % len(routes)]
+            g.inc()
+            h.observe((i % 1000) / 1000, "GET", route)
+            c.inc("GET", route, "200")
+            g.dec()
+
+    def sharded_counter(n):
+        for i in range(n):
+            c.inc("GET", routes[i % len(routes)], "200")
+
+    def locked_counter(n):
+        for i in range(n):
+            locked.inc("GET", routes[i % len(routes)], "200")
+
+    for threads in sorted({1, args.threads}):
+        print(f"[threads={threads}]")
+        print(f"  카운터(샤드)          {_run_threads(sharded_counter, threads, args.ops):8.0f} ns/op")
+        print(f"  카운터(전역 락)       {_run_threads(locked_counter, threads, args.ops):8.0f} ns/op")
+        print(f"  요청 1건 기록 세트    {_run_threads(sharded_request, threads, args.ops):8.0f} ns/req")
+
+    t0 = time.perf_counter()
+    text = metrics.render()
+    print(f"/metrics 출력: {(time.perf_counter() - t0) * 1000:.2f} ms, {len(text.splitlines())}줄, {len(text) / 1024:.0f} KiB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="지표 기록 비용 벤치마크")
+    parser.add_argument("--ops", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=4)
+    parser.add_argument("--routes", type=int, default=30)
+    main(parser.parse_args())
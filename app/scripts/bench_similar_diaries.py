@@ -0,0 +1,64 @@
+# app/scripts/bench_similar_diaries.py
+"""
+"비슷한 일기" 검색 비용 측정 (DB 없이 메모리에서).
+
+  - vectorize : 본문 1건 → 해시 n-gram 벡터
+  - build     : 사용자 벡터 N건 → TF-IDF 정규화 행렬 (캐시 미스 시 1회)
+  - query     : 행렬-벡터 곱 + 상위 k (캐시 적중 시 매 요청)
+
+실행:
+  python -m app.scripts.bench_similar_diaries --sizes 100,1000,5000
+"""
+import argparse
+import os
+import random
+import statistics
+import time
+
+os.environ.setdefault("MONGO_URI", "mongodb+srv://bench.invalid/diary")
+os.environ.setdefault("MONGODB_DB", "diary")
+os.environ.setdefault("JWT_SECRET", "bench")
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+
+SENTENCES = [
+    "오늘은 회사에서 회의가 길어져서 조금 피곤했다.", "친구와 저녁을 먹고 산책을 했다.",
+    "비가 와서 하루 종일 집에 있었다.", "운동을 다녀오니 기분이 한결 나아졌다.",
+    "요즘 너무 무기력하고 아무것도 하기 싫다.", "시험 결과가 걱정되어 잠이 오지 않는다.",
+    "고양이가 아파서 병원에 다녀왔다.", "제주도 여행 계획을 세우며 설렜다.",
+    "버스를 놓쳐서 지각할 뻔했다.", "가족과 오랜만에 긴 이야기를 나눴다.",
+]
+
+
+def _ms(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append((time.perf_counter() - t0) * 1000)
+    return statistics.median(times)
+
+
+def main(args):
+    import numpy as np
+    from app.services import text_features
+
+    rng = random.Random(0)
+    print(f"dim={text_features.vector_dim()}")
+    print(f"{'건수':>7} | {'vectorize':>10} {'build':>9} {'query':>8}  (ms, 중앙값)")
+    for size in [int(s) for s in args.sizes.split(",")]:
+        texts = [" ".join(rng.sample(SENTENCES, 4)) for _ in range(size)]
+        matrix = np.vstack([text_features.vectorize(t) for t in texts])
+        index, idf = text_features.build_index(matrix)
+        q = texts[0]
+
+        v_ms = _ms(lambda: text_features.vectorize(q), args.repeat)
+        b_ms = _ms(lambda: text_features.build_index(matrix), max(3, args.repeat // 10))
+        q_ms = _ms(lambda: text_features.top_k(index, idf, text_features.vectorize(q), 5, exclude=0), args.repeat)
+        print(f"{size:>7} | {v_ms:>10.3f} {b_ms:>9.3f} {q_ms:>8.3f}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", default="100,1000,5000")
+    parser.add_argument("--repeat", type=int, default=100)
+    main(parser.parse_args())
@@ -0,0 +1,311 @@
+# app/scripts/check_query_plans.py
+"""
+app/models/* 및 app/routes/stats.py 쿼리들의 실행 계획을 explain()으로 점검합니다.
+로컬 mongod의 임시 DB에 선언 인덱스를 만들고, 모델 함수를 실제로 호출하면서
+CommandListener로 보낸 명령(find/aggregate/update/delete/findAndModify ...)을 기록한 뒤
+기록된 명령을 그대로 explain 합니다. 어떤 쿼리라도 COLLSCAN을 쓰면 종료 코드 1로 실패합니다.
+(CI/배포 전 점검용)
+
+쿼리 모양을 손으로 옮겨 적지 않으므로 모델 함수의 필터/정렬이 바뀌어도 그대로 따라갑니다.
+모델 모듈의 공개 async 함수 중 build_calls()에서 호출하지 않는 것이 있으면 그것도 실패로 봅니다.
+→ 새 모델 함수를 추가하면 build_calls()에 호출 예시를 한 줄 추가하세요.
+
+실행:
+  python -m app.scripts.check_query_plans --uri mongodb://localhost:27017
+"""
+import argparse
+import asyncio
+import inspect
+import json
+import os
+import sys
+from datetime import datetime, timedelta
+
+from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring
+
+# 모델 모듈 import 시 설정 로드가 필요 → 점검용 기본값
+os.environ.setdefault("MONGO_URI", "mongodb+srv://plancheck.invalid/diary")
+os.environ.setdefault("MONGODB_DB", "diary")
+os.environ.setdefault("JWT_SECRET", "plancheck")
+os.environ.setdefault("OPENAI_API_KEY", "sk-plancheck")
+
+NOW = datetime.utcnow()
+SEED_IDS = [ObjectId() for _ in range(50)]   # i번째 일기: 사용자 u{i % 5}
+ANALYSIS = {"analyzed_emotion": {"label": "슬픔", "emoji": "😢"}, "score": 3, "risk_level": "moderate"}
+
+# 의도적으로 컬렉션 전체를 읽는 호출 (COLLSCAN이어도 실패로 보지 않음)
+FULL_SCAN_OK = {
+    "rollup.compute_rollups[전체]": "전체 사용자 재구축",
+    "user.get_all_users": "관리용 전체 사용자 목록",
+}
+
+
+def _model_modules() -> list:
+    import app.models.analysis_job as job_model
+    import app.models.data_version as data_version
+    import app.models.diary as diary_model
+    import app.models.diary_vector as vector_model
+    import app.models.rollup as rollup_model
+    import app.models.safety as safety_model
+    import app.models.search_index as search_index
+    import app.models.user as user_model
+
+    return [job_model, data_version, diary_model, vector_model, rollup_model, safety_model, search_index, user_model]
+
+
+def _call(fn, *args, note: str = "", **kwargs):
+    return fn, args, kwargs, note
+
+
+def build_calls() -> list:
+    """호출 순서대로 실행 (쓰기 → 조회 → 삭제). u1 일기: SEED_IDS[1], [6], [11], [16], [21] ..."""
+    import app.models.analysis_job as job_model
+    import app.models.data_version as data_version
+    import app.models.diary as diary_model
+    import app.models.diary_vector as vector_model
+    import app.models.rollup as rollup_model
+    import app.models.safety as safety_model
+    import app.models.search_index as search_index
+    import app.models.user as user_model
+    import app.routes.stats as stats_routes
+    from app.schemas.diary import DiaryCreate
+
+    sample = DiaryCreate(date=NOW, emotion={"label": "피곤", "emoji": "😪"}, text="테스트 일기입니다. 오늘은 조금 피곤했어요.")
+
+    def seed_docs() -> list:
+        docs = []
+        for i, oid in enumerate(SEED_IDS):
+            d = diary_model.build_pending_doc(f"u{i % 5}", sample)
+            d.update({
+                "_id": oid,
+                "date": NOW - timedelta(days=i),
+                "created_at": NOW - timedelta(days=i),
+                "text": f"테스트 일기 {i}번입니다. 오늘은 조금 피곤했어요.",
+                "risk_level": ["none", "mild", "moderate", "high"][i % 4],
+                "analysis_status": "pending" if i % 10 == 0 else "done",
+            })
+            docs.append(d)
+        return docs
+
+    extra = seed_docs()[21]   # 쓰기 경로 밖에서 직접 호출하는 색인/집계 함수용 (u1)
+
+    return [
+        # app/models/diary.py (쓰기)
+        _call(diary_model.insert_diaries_bulk, seed_docs()),
+        _call(diary_model.create_diary, "u1", sample, {"label": "행복", "emoji": "😊"}, "", 7, ""),
+        _call(diary_model.create_pending_diary, "u1", sample),
+        _call(diary_model.apply_analysis, SEED_IDS[16], ANALYSIS),
+        _call(diary_model.update_diary_by_id, "u1", str(SEED_IDS[6]), sample),
+        # app/models/diary.py (조회)
+        _call(diary_model.get_raw_diary, SEED_IDS[1]),
+        _call(diary_model.find_pending_diaries, NOW + timedelta(days=1)),
+        _call(diary_model.get_user_diaries, "u1"),
+        _call(diary_model.iter_user_diaries, "u1"),
+        _call(diary_model.get_user_diaries_page, "u1", 5),
+        _call(diary_model.get_user_diaries_page, "u1", 5, note="cursor",
+              cursor=diary_model.encode_cursor(NOW - timedelta(days=10), SEED_IDS[11])),
+        _call(diary_model.get_diary_by_id, "u1", str(SEED_IDS[1])),
+        _call(diary_model.get_diary_by_date, "u1", (NOW - timedelta(days=1)).date()),
+        _call(diary_model.get_diaries_in_range, "u1", (NOW - timedelta(days=31)).date(), NOW.date()),
+        _call(diary_model.search_diaries, "u1", "피곤했어요", 10, 0.5),
+        _call(diary_model.get_similar_diaries, "u1", str(SEED_IDS[1]), 5),
+        # app/models/search_index.py, app/models/diary_vector.py
+        _call(search_index.index_diaries, [extra]),
+        _call(search_index.sync_diary, extra, None),
+        _call(search_index.search, "u1", "피곤했어요", 10),
+        _call(vector_model.index_diaries, [extra]),
+        _call(vector_model.sync_diary, extra, None),
+        _call(vector_model.load_user_vectors, "u1"),
+        # app/models/data_version.py
+        _call(data_version.get_data_version, "u1"),
+        _call(data_version.bump_data_version, "u1"),
+        # app/models/rollup.py
+        _call(rollup_model.apply_rollup_deltas, [(None, extra)]),
+        _call(rollup_model.apply_rollup_delta, extra, None),
+        _call(rollup_model.get_user_rollups, "u1", NOW - timedelta(days=30)),
+        _call(rollup_model.compute_rollups, "u1"),
+        _call(rollup_model.compute_rollups, note="전체"),
+        _call(rollup_model.replace_user_rollups, "u1", {"2025-01-01": rollup_model._empty("u1", "2025-01-01")}),
+        # app/models/safety.py
+        _call(safety_model.get_recent_risk_summary, "u1"),
+        _call(safety_model.get_high_risk_entries, "u1"),
+        # app/routes/stats.py
+        _call(stats_routes._weekly_stats, "u1"),
+        _call(stats_routes._monthly_stats, "u1"),
+        _call(stats_routes._risk_stats, "u1"),
+        # app/models/analysis_job.py
+        _call(job_model.enqueue_job, SEED_IDS[1], "u1"),
+        _call(job_model.enqueue_jobs_bulk, [(SEED_IDS[6], "u1", NOW)]),
+        _call(job_model.claim_next_job, "plancheck", 60),
+        _call(job_model.get_job, SEED_IDS[1], "u1"),
+        _call(job_model.fail_job, SEED_IDS[1], "plancheck", retry_at=NOW),
+        _call(job_model.complete_job, SEED_IDS[6]),
+        # app/models/user.py
+        _call(user_model.create_user, {"user_id": "u1", "password": "plancheck1", "name": "n1", "email": "u1@example.com"}),
+        _call(user_model.verify_user_credentials, "u1", "plancheck1"),
+        _call(user_model.get_user_by_user_id, "u1"),
+        _call(user_model.get_user_by_email, "u1@example.com"),
+        _call(user_model.get_user_by_name_and_email, "n1", "u1@example.com"),
+        _call(user_model.update_user_password, "u1", "plancheck2"),
+        _call(user_model.get_all_users),
+        # 삭제
+        _call(diary_model.delete_diary_by_id, "u1", str(SEED_IDS[11])),
+        _call(user_model.delete_user_by_id, "u1"),
+    ]
+
+
+def _label(fn, note: str) -> str:
+    return f"{fn.__module__.rsplit('.', 1)[-1]}.{fn.__name__}" + (f"[{note}]" if note else "")
+
+
+# ==================================================
+# ✅ 명령 기록 (호출 중인 모델 함수 이름과 함께)
+#   - 호출은 하나씩 await → 드라이버 스레드에서 불려도 caller가 섞이지 않음
+# ==================================================
+_EXPLAINABLE = {"find", "aggregate", "count", "distinct", "update", "delete", "findAndModify"}
+_DROP_FIELDS = {
+    "lsid", "$db", "$clusterTime", "txnNumber", "$readPreference", "readConcern", "writeConcern",
+    "apiVersion", "apiStrict", "apiDeprecationErrors",
+}
+
+
+class QueryRecorder(monitoring.CommandListener):
+    def __init__(self):
+        self.caller = None
+        self.commands = []   # (호출 라벨, 명령)
+
+    def started(self, event):
+        if self.caller is None or event.command_name not in _EXPLAINABLE:
+            return
+        cmd = {k: v for k, v in event.command.items() if k not in _DROP_FIELDS}
+        # 일괄 쓰기는 문장 모양이 모두 같음 → explain은 문장 1개만 허용하므로 첫 문장만
+        for field in ("updates", "deletes"):
+            if field in cmd:
+                cmd[field] = list(cmd[field])[:1]
+        self.commands.append((self.caller, cmd))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def _shape(value):
+    """값을 타입 이름으로 바꾼 쿼리 모양 (같은 모양은 한 번만 explain)"""
+    if isinstance(value, dict):
+        return {k: _shape(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return list(dict.fromkeys(json.dumps(_shape(v), sort_keys=True) for v in value))
+    return type(value).__name__
+
+
+def _stages(plan):
+    """실행 계획 트리의 모든 stage 이름"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for v in plan.values():
+            yield from _stages(v)
+    elif isinstance(plan, list):
+        for v in plan:
+            yield from _stages(v)
+
+
+def _winning_stages(explain):
+    """explain 결과의 모든 winningPlan 아래 stage (aggregate는 $cursor 안쪽에 있음, rejectedPlans 제외)"""
+    if isinstance(explain, dict):
+        for k, v in explain.items():
+            if k == "winningPlan":
+                yield from _stages(v)
+            elif k != "rejectedPlans":
+                yield from _winning_stages(v)
+    elif isinstance(explain, list):
+        for v in explain:
+            yield from _winning_stages(v)
+
+
+def _uncovered(calls: list) -> list:
+    called = {fn for fn, _, _, _ in calls}
+    return [
+        _label(fn, "")
+        for module in _model_modules()
+        for name, fn in inspect.getmembers(module)
+        if not name.startswith("_")
+        and (inspect.iscoroutinefunction(fn) or inspect.isasyncgenfunction(fn))
+        and fn.__module__ == module.__name__
+        and fn not in called
+    ]
+
+
+async def _invoke(fn, args, kwargs) -> None:
+    result = fn(*args, **kwargs)
+    if inspect.isasyncgen(result):
+        async for _ in result:
+            pass
+    else:
+        await result
+
+
+async def run(uri: str, db_name: str) -> int:
+    import app.db.mongo as mongo
+    from app.db.indexes import ensure_indexes
+    from app.services.password_hasher import shutdown_hasher
+
+    calls = build_calls()
+    failures = 0
+    for name in _uncovered(calls):
+        failures += 1
+        print(f"❌ {name:38} build_calls()에 호출 예시 없음")
+
+    recorder = QueryRecorder()
+    client = AsyncIOMotorClient(uri, serverSelectionTimeoutMS=5000, event_listeners=[recorder])
+    await client.drop_database(db_name)
+    db = client[db_name]
+    saved = mongo.client, mongo.db
+    mongo.client, mongo.db = client, db
+    checked = 0
+    try:
+        await ensure_indexes(db)
+
+        for fn, args, kwargs, note in calls:
+            recorder.caller = _label(fn, note)
+            try:
+                await _invoke(fn, args, kwargs)
+            finally:
+                recorder.caller = None
+
+        seen = set()
+        for caller, cmd in recorder.commands:
+            command, coll = next(iter(cmd.items()))
+            key = (caller, json.dumps(_shape(cmd), sort_keys=True))
+            if key in seen:
+                continue
+            seen.add(key)
+            checked += 1
+            plan = await db.command({"explain": cmd, "verbosity": "queryPlanner"})
+            stages = set(_winning_stages(plan))
+            allowed = FULL_SCAN_OK.get(caller)
+            bad = "COLLSCAN" in stages and not allowed
+            failures += bad
+            mark = "❌" if bad else ("⚪" if "COLLSCAN" in stages else "✅")
+            note = f" (허용: {allowed})" if allowed and "COLLSCAN" in stages else ""
+            print(f"{mark} {caller:38} {coll}.{command:14} {sorted(stages)}{note}")
+    finally:
+        mongo.client, mongo.db = saved
+        await client.drop_database(db_name)
+        client.close()
+        shutdown_hasher()
+
+    print(f"\n{len(calls)}개 호출 · 쿼리 {checked}개 점검, 실패 {failures}건")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--uri", default=os.getenv("PLAN_CHECK_MONGO_URI", "mongodb://localhost:27017"))
+    parser.add_argument("--db", default="diary_plan_check")
+    args = parser.parse_args()
+    sys.exit(asyncio.run(run(args.uri, args.db)))
@@ -0,0 +1,61 @@
+# app/scripts/diary_vectors.py
+"""
+"비슷한 일기"용 로컬 벡터(diary_vectors) 백필/재구축.
+
+  rebuild : diaries를 _id 순으로 훑어 벡터를 배치 upsert (최초 백필, SIMILAR_VECTOR_DIM 변경 후)
+            + 원본 일기가 없는 벡터 정리
+
+실행:
+  python -m app.scripts.diary_vectors rebuild
+  python -m app.scripts.diary_vectors rebuild --user philip0110
+"""
+import argparse
+import asyncio
+import time
+
+from app.db.mongo import connect_to_mongo, close_mongo_connection
+import app.db.mongo as mongo
+import app.models.diary_vector as vector_model
+
+
+async def rebuild(user_id=None, batch_size: int = 500) -> None:
+    started = time.perf_counter()
+    diaries = mongo.db["diaries"]
+    vectors = vector_model.get_vector_collection()
+    query = {"user_id": user_id} if user_id else {}
+
+    scanned = 0
+    seen_ids = set()
+    chunk = []
+    cursor = diaries.find(query, {"_id": 1, "user_id": 1, "text": 1}).sort("_id", 1).batch_size(batch_size)
+    async for doc in cursor:
+        scanned += 1
+        seen_ids.add(doc["_id"])
+        chunk.append(doc)
+        if len(chunk) >= batch_size:
+            await vector_model.index_diaries(chunk)
+            chunk.clear()
+            print(f"  벡터화 {scanned}건")
+    await vector_model.index_diaries(chunk)
+
+    orphans = [d["_id"] async for d in vectors.find(query, {"_id": 1}) if d["_id"] not in seen_ids]
+    for i in range(0, len(orphans), batch_size):
+        await vectors.delete_many({"_id": {"$in": orphans[i:i + batch_size]}})
+
+    print(f"✅ 벡터 재구축 완료: 일기 {scanned}건, 고아 벡터 {len(orphans)}건 삭제 ({time.perf_counter() - started:.1f}s)")
+
+
+async def main(args) -> None:
+    await connect_to_mongo()
+    try:
+        await rebuild(args.user, batch_size=args.batch_size)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="비슷한 일기용 벡터 관리")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--user", default=None, help="특정 사용자만")
+    parser.add_argument("--batch-size", type=int, default=500)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,61 @@
+# app/scripts/import_diaries.py
+"""
+NDJSON/CSV 파일의 일기를 특정 사용자 계정으로 일괄 가져옵니다. (POST /diary/import 와 같은 경로)
+
+  - 파일을 줄 단위로 읽으며 검증 → --batch-size 단위 insert_many(ordered=False)
+  - 감정 분석은 analysis_jobs에 예약 (import_analysis_rate_per_sec 속도로 분산)
+    → 서버의 분석 워커(ANALYSIS_WORKERS)가 처리
+  - API와 달리 파일 크기/행 수 제한 없음 (--max-rows 로 지정 가능)
+
+CSV 헤더: date,emotion_label,emotion_emoji,text
+
+실행:
+  python -m app.scripts.import_diaries --user philip0110 --file export.ndjson
+  python -m app.scripts.import_diaries --user philip0110 --file old_app.csv --format csv --batch-size 1000
+"""
+import argparse
+import asyncio
+import sys
+
+from app.db.mongo import connect_to_mongo, close_mongo_connection
+
+
+async def run(args) -> int:
+    from app.services import diary_import
+
+    fmt = args.format or diary_import.detect_format(None, args.file)
+    if fmt is None:
+        print("❌ 형식을 알 수 없습니다. --format ndjson|csv 를 지정하세요.")
+        return 2
+
+    await connect_to_mongo()
+    try:
+        # utf-8-sig: 엑셀 CSV의 BOM 제거 / newline="": CSV 필드 안 줄바꿈 유지
+        with open(args.file, encoding="utf-8-sig", newline="") as f:
+            report = await diary_import.import_diaries(
+                args.user,
+                diary_import.iter_rows(f, fmt),
+                batch_size=args.batch_size,
+                max_rows=args.max_rows or sys.maxsize,
+            )
+    finally:
+        await close_mongo_connection()
+
+    print(f"✅ 전체 {report.total} / 저장 {report.inserted} / 실패 {report.failed}")
+    if report.analysis_scheduled_until:
+        print(f"   감정 분석 예약 완료 시각(UTC): {report.analysis_scheduled_until:%Y-%m-%d %H:%M:%S}")
+    for err in report.errors:
+        print(f"   - {err.row}행: {err.error}")
+    if report.failed > len(report.errors):
+        print(f"   ... 외 {report.failed - len(report.errors)}건")
+    return 1 if report.failed else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NDJSON/CSV 일기 일괄 가져오기")
+    parser.add_argument("--user", required=True, help="가져올 계정의 user_id")
+    parser.add_argument("--file", required=True)
+    parser.add_argument("--format", choices=["ndjson", "csv"], default=None, help="미지정 시 확장자로 판단")
+    parser.add_argument("--batch-size", type=int, default=None, help="미지정 시 IMPORT_BATCH_SIZE")
+    parser.add_argument("--max-rows", type=int, default=0, help="0이면 제한 없음")
+    sys.exit(asyncio.run(run(parser.parse_args())))
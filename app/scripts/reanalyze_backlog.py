@@ -0,0 +1,164 @@
+# app/scripts/reanalyze_backlog.py
+"""
+감정 분석 실패 기본값(또는 이전 프롬프트 버전)으로 남아 있는 일기를 재분석합니다.
+
+  - _id 오름차순으로 스트리밍 → 청크 단위로 동시 분석(세마포어) → bulk_write(ordered=False)
+  - 청크마다 script_checkpoints 컬렉션에 마지막 _id 저장 → 중단 후 재실행 시 이어서 진행
+  - 재분석이 실패한 문서는 그대로 두고 건너뜀 (--reset-checkpoint 로 처음부터 다시 훑기)
+  - 로컬 분류기는 쓰지 않고 항상 LLM으로 판정 (local로 저장된 일기가 classifier로 바뀌어 누락되지 않도록)
+  - --include-classifier: 로컬 분류기가 답한 일기도 LLM 판정으로 교체
+
+실행:
+  python -m app.scripts.reanalyze_backlog --dry-run
+  python -m app.scripts.reanalyze_backlog --concurrency 8 --batch-size 200 --include-stale
+  python -m app.scripts.reanalyze_backlog --include-classifier
+"""
+import argparse
+import asyncio
+import time
+from datetime import datetime
+
+from pymongo import UpdateOne
+
+from app.db.mongo import connect_to_mongo, close_mongo_connection
+import app.db.mongo as mongo
+import app.models.rollup as rollup_model
+from app.models.data_version import bump_data_version
+
+CHECKPOINT_COLLECTION = "script_checkpoints"
+
+FALLBACK_REASON = "감정 분석에 실패했습니다."
+
+
+def build_query(include_stale: bool, prompt_version: str, include_classifier: bool = False) -> dict:
+    clauses = [
+        {"reason": FALLBACK_REASON, "score": 5},
+        # LLM 장애 중 로컬 간이 분석으로 저장된 일기
+        {"analysis_source": "local"},
+    ]
+    if include_classifier:
+        clauses.append({"analysis_source": "classifier"})
+    if include_stale:
+        clauses.append({"analysis_version": {"$ne": prompt_version}})
+    return {
+        "$or": clauses,
+        # 지연 분석 대기 중인 문서는 워커가 처리
+        "analysis_status": {"$ne": "pending"},
+    }
+
+
+async def _load_checkpoint(name: str):
+    doc = await mongo.db[CHECKPOINT_COLLECTION].find_one({"_id": name})
+    return doc.get("last_id") if doc else None
+
+
+async def _save_checkpoint(name: str, last_id, totals: dict) -> None:
+    await mongo.db[CHECKPOINT_COLLECTION].update_one(
+        {"_id": name},
+        {"$set": {"last_id": last_id, "updated_at": datetime.utcnow(), **totals}},
+        upsert=True,
+    )
+
+
+async def _analyze_chunk(docs, concurrency: int):
+    from app.services.emotion_analysis import analyze_emotion_or_raise
+    import app.models.diary as diary_model
+
+    sem = asyncio.Semaphore(concurrency)
+    ops, changes, failed = [], [], 0
+
+    async def one(doc):
+        nonlocal failed
+        async with sem:
+            try:
+                analysis = await analyze_emotion_or_raise(doc.get("text", ""), use_classifier=False)
+            except Exception as e:
+                failed += 1
+                print(f"  ⚠️ {doc['_id']} 재분석 실패: {e}")
+                return
+        fields = diary_model.analysis_update_fields(analysis)
+        ops.append(UpdateOne({"_id": doc["_id"]}, {"$set": fields}))
+        changes.append((doc, {**doc, **fields}))
+
+    await asyncio.gather(*(one(d) for d in docs))
+    return ops, changes, failed
+
+
+async def run(args) -> None:
+    await connect_to_mongo()
+    from app.services.emotion_analysis import PROMPT_VERSION
+
+    col = mongo.db["diaries"]
+    query = build_query(args.include_stale, PROMPT_VERSION, args.include_classifier)
+
+    if args.reset_checkpoint:
+        await mongo.db[CHECKPOINT_COLLECTION].delete_one({"_id": args.checkpoint})
+    last_id = await _load_checkpoint(args.checkpoint)
+    if last_id is not None:
+        query = {"$and": [query, {"_id": {"$gt": last_id}}]}
+        print(f"▶️ 체크포인트 {last_id} 이후부터 재개")
+
+    if args.dry_run:
+        total = await col.count_documents(query)
+        print(f"[dry-run] 재분석 대상 {total}건 (prompt={PROMPT_VERSION}, stale 포함={args.include_stale})")
+        async for doc in col.find(query, {"_id": 1, "user_id": 1, "analysis_version": 1}).sort("_id", 1).limit(10):
+            print("   -", doc["_id"], doc.get("user_id"), doc.get("analysis_version"))
+        await close_mongo_connection()
+        return
+
+    totals = {"processed": 0, "updated": 0, "failed": 0}
+    started = time.perf_counter()
+    projection = {
+        "_id": 1, "text": 1, "user_id": 1, "created_at": 1,
+        "analyzed_emotion": 1, "score": 1, "risk_level": 1,
+    }
+    cursor = col.find(query, projection).sort("_id", 1).batch_size(args.batch_size)
+    if args.limit:
+        cursor = cursor.limit(args.limit)
+
+    chunk = []
+
+    async def flush():
+        if not chunk:
+            return
+        ops, changes, failed = await _analyze_chunk(chunk, args.concurrency)
+        if ops:
+            res = await col.bulk_write(ops, ordered=False)
+            totals["updated"] += res.modified_count
+            # 분석 결과(라벨/점수/위험도)가 바뀌었으므로 일별 집계도 보정
+            await rollup_model.apply_rollup_deltas(changes)
+            for uid in {before["user_id"] for before, _ in changes}:
+                await bump_data_version(uid)
+        totals["processed"] += len(chunk)
+        totals["failed"] += failed
+        await _save_checkpoint(args.checkpoint, chunk[-1]["_id"], totals)
+
+        elapsed = time.perf_counter() - started
+        print(
+            f"  처리 {totals['processed']} / 갱신 {totals['updated']} / 실패 {totals['failed']}"
+            f"  ({totals['processed'] / elapsed:.1f} docs/s)"
+        )
+        chunk.clear()
+
+    async for doc in cursor:
+        chunk.append(doc)
+        if len(chunk) >= args.batch_size:
+            await flush()
+    await flush()
+
+    elapsed = time.perf_counter() - started
+    print(f"✅ 완료: {totals} / {elapsed:.1f}s")
+    await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="감정 분석 실패/구버전 일기 재분석")
+    parser.add_argument("--dry-run", action="store_true", help="대상 건수만 출력 (LLM 호출/쓰기 없음)")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=200)
+    parser.add_argument("--limit", type=int, default=0)
+    parser.add_argument("--include-stale", action="store_true", help="이전 프롬프트 버전으로 분석된 일기도 포함")
+    parser.add_argument("--include-classifier", action="store_true", help="로컬 분류기가 답한 일기도 LLM으로 재분석")
+    parser.add_argument("--checkpoint", default="reanalyze_backlog")
+    parser.add_argument("--reset-checkpoint", action="store_true")
+    asyncio.run(run(parser.parse_args()))
@@ -0,0 +1,85 @@
+# app/scripts/rollups.py
+"""
+일별 감정/위험도 집계(diary_daily_rollups) 재구축 및 정합성 점검.
+
+  rebuild : 원본 diaries에서 다시 계산해 사용자 단위로 교체 (최초 백필 포함)
+  check   : 저장된 집계와 재계산 결과를 비교, --fix 시 불일치 사용자만 교체
+
+  재구축은 일자별 교체(전체 삭제 구간 없음)이지만, 재계산~교체 사이에 반영된
+  증분은 덮어쓸 수 있음 → 서비스 중 rebuild 했다면 이어서 check --fix 를 한 번 더 실행.
+
+실행:
+  python -m app.scripts.rollups rebuild
+  python -m app.scripts.rollups check --fix
+  python -m app.scripts.rollups check --user philip0110
+"""
+import argparse
+import asyncio
+import time
+
+from app.db.mongo import connect_to_mongo, close_mongo_connection
+import app.models.rollup as rollup_model
+
+
+async def rebuild(user_id=None) -> None:
+    started = time.perf_counter()
+    users = days = 0
+    async for uid, user_days in rollup_model.compute_rollups(user_id):
+        await rollup_model.replace_user_rollups(uid, user_days)
+        users += 1
+        days += len(user_days)
+    print(f"✅ 재구축 완료: 사용자 {users}명, 일자 {days}건 ({time.perf_counter() - started:.1f}s)")
+
+
+async def check(user_id=None, fix: bool = False) -> int:
+    col = rollup_model.get_rollup_collection()
+    mismatched = 0
+    seen = set()
+
+    async for uid, expected in rollup_model.compute_rollups(user_id):
+        seen.add(uid)
+        stored = {d["day"]: d async for d in col.find({"user_id": uid})}
+        bad_days = [
+            day for day in set(expected) | set(stored)
+            if rollup_model.strip_zeros(expected.get(day, {})) != rollup_model.strip_zeros(stored.get(day, {}))
+        ]
+        if not bad_days:
+            continue
+        mismatched += 1
+        print(f"❌ {uid}: 불일치 {len(bad_days)}일 (예: {sorted(bad_days)[:5]})")
+        if fix:
+            await rollup_model.replace_user_rollups(uid, expected)
+
+    # 일기가 모두 삭제된 사용자에게 남은 집계
+    query = {"user_id": user_id} if user_id else {}
+    for uid in await col.distinct("user_id", query):
+        if uid in seen:
+            continue
+        leftovers = [d async for d in col.find({"user_id": uid})]
+        if any(rollup_model.strip_zeros(d)["count"] for d in leftovers):
+            mismatched += 1
+            print(f"❌ {uid}: 일기 없이 집계만 남아 있음")
+            if fix:
+                await rollup_model.replace_user_rollups(uid, {})
+
+    print(f"{'✅' if not mismatched else '⚠️'} 점검 완료: 불일치 사용자 {mismatched}명{' (수정됨)' if fix and mismatched else ''}")
+    return mismatched
+
+
+async def main(args) -> None:
+    await connect_to_mongo()
+    try:
+        if args.command == "rebuild":
+            await rebuild(args.user)
+        else:
+            await check(args.user, fix=args.fix)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일별 감정/위험도 집계 관리")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument("--user", default=None, help="특정 사용자만")
+    parser.add_argument("--fix", action="store_true", help="check 시 불일치 사용자 재구축")
+    asyncio.run(main(parser.parse_args()))
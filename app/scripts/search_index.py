@@ -0,0 +1,81 @@
+# app/scripts/search_index.py
+"""
+일기 본문 검색 색인(diary_search_terms) 백필/재구축.
+
+  rebuild : diaries를 _id 순으로 훑어 색인 문서를 배치 upsert (최초 백필 포함)
+            + 원본 일기가 없는 색인 항목 정리
+  --missing-only : 색인이 없는 일기만 추가 (쓰기 경로 색인 실패 복구용)
+
+실행:
+  python -m app.scripts.search_index rebuild
+  python -m app.scripts.search_index rebuild --user philip0110 --batch-size 1000
+  python -m app.scripts.search_index rebuild --missing-only
+"""
+import argparse
+import asyncio
+import time
+
+from app.db.mongo import connect_to_mongo, close_mongo_connection
+import app.db.mongo as mongo
+import app.models.search_index as search_index
+
+
+async def rebuild(user_id=None, batch_size: int = 500, missing_only: bool = False) -> None:
+    started = time.perf_counter()
+    diaries = mongo.db["diaries"]
+    terms = search_index.get_search_collection()
+    query = {"user_id": user_id} if user_id else {}
+
+    indexed = scanned = 0
+    seen_ids = set()
+    chunk = []
+
+    async def flush():
+        nonlocal indexed
+        if not chunk:
+            return
+        if missing_only:
+            have = {d["_id"] async for d in terms.find({"_id": {"$in": [c["_id"] for c in chunk]}}, {"_id": 1})}
+            todo = [c for c in chunk if c["_id"] not in have]
+        else:
+            todo = list(chunk)
+        await search_index.index_diaries(todo)
+        indexed += len(todo)
+        chunk.clear()
+
+    cursor = diaries.find(query, {"_id": 1, "user_id": 1, "date": 1, "text": 1}).sort("_id", 1).batch_size(batch_size)
+    async for doc in cursor:
+        scanned += 1
+        seen_ids.add(doc["_id"])
+        chunk.append(doc)
+        if len(chunk) >= batch_size:
+            await flush()
+            print(f"  훑음 {scanned} / 색인 {indexed}")
+    await flush()
+
+    # 원본이 삭제된 색인 항목 정리
+    orphans = [d["_id"] async for d in terms.find(query, {"_id": 1}) if d["_id"] not in seen_ids]
+    for i in range(0, len(orphans), batch_size):
+        await terms.delete_many({"_id": {"$in": orphans[i:i + batch_size]}})
+
+    print(
+        f"✅ 색인 완료: 일기 {scanned}건 중 {indexed}건 색인, 고아 항목 {len(orphans)}건 삭제 "
+        f"({time.perf_counter() - started:.1f}s)"
+    )
+
+
+async def main(args) -> None:
+    await connect_to_mongo()
+    try:
+        await rebuild(args.user, batch_size=args.batch_size, missing_only=args.missing_only)
+    finally:
+        await close_mongo_connection()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="일기 본문 검색 색인 관리")
+    parser.add_argument("command", choices=["rebuild"])
+    parser.add_argument("--user", default=None, help="특정 사용자만")
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--missing-only", action="store_true", help="색인이 없는 일기만 추가")
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,147 @@
+# app/scripts/train_emotion_classifier.py
+"""
+LLM이 분석한 일기로 로컬 감정 분류기(나이브 베이즈)를 학습하고 보류(held-out) 셋으로 평가합니다.
+
+  - 학습 데이터: analysis_source가 llm(또는 없음)이고 분석 실패 기본값이 아닌 일기
+  - 보류 셋: _id 해시 기준 --holdout 비율 (재실행해도 같은 분할)
+  - 보고: LLM 라벨 일치율, 확신도 임계값별 로컬 응답 비율(=LLM 호출 절감)과 일치율,
+          점수 오차(전체 평균 점수 기준선과 비교), 추론 지연(p50/p95)
+  - 저장한 파일 경로를 EMOTION_CLASSIFIER_PATH로 지정하면 analyze_emotion이 사용
+
+실행:
+  python -m app.scripts.train_emotion_classifier --out models/emotion_nb.npz
+  python -m app.scripts.train_emotion_classifier --from-file diary-export.ndjson --out models/emotion_nb.npz
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import time
+import zlib
+from datetime import datetime
+
+os.environ.setdefault("MONGODB_DB", "diary")
+
+LABELS = {"행복", "슬픔", "분노", "불안", "중립"}
+FALLBACK_REASON = "감정 분석에 실패했습니다."
+THRESHOLDS = (0.5, 0.7, 0.8, 0.9, 0.95)
+
+
+def _usable(d: dict) -> bool:
+    label = (d.get("analyzed_emotion") or {}).get("label")
+    return (
+        label in LABELS
+        and d.get("reason") != FALLBACK_REASON
+        and d.get("analysis_source") in (None, "llm")
+        and d.get("analysis_status", "done") == "done"
+        and len(d.get("text") or "") >= 15
+    )
+
+
+def _sample(d: dict):
+    return d["text"], d["analyzed_emotion"]["label"], float(d.get("score", 5) or 5), str(d.get("_id") or d.get("id"))
+
+
+def load_from_file(path: str) -> list:
+    out = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                d = json.loads(line)
+                if _usable(d):
+                    out.append(_sample(d))
+    return out
+
+
+async def load_from_mongo() -> list:
+    from app.db.mongo import connect_to_mongo, close_mongo_connection
+    import app.db.mongo as mongo
+
+    await connect_to_mongo()
+    try:
+        # _id는 프로젝션에 기본 포함 → 보류 셋 해시 키
+        projection = {"text": 1, "analyzed_emotion": 1, "score": 1, "reason": 1, "analysis_source": 1, "analysis_status": 1}
+        # analysis_status 도입 전 일기에는 필드가 없음 → 미완료/실패만 제외하고 나머지는 _usable이 판단
+        query = {"analysis_status": {"$nin": ["pending", "failed"]}}
+        return [_sample(d) async for d in mongo.db["diaries"].find(query, projection) if _usable(d)]
+    finally:
+        await close_mongo_connection()
+
+
+def _is_holdout(key: str, ratio: float) -> bool:
+    return (zlib.crc32(key.encode("utf-8")) % 10000) < ratio * 10000
+
+
+def evaluate(model, holdout: list) -> dict:
+    preds, times = [], []
+    for text, label, score, _ in holdout:
+        t0 = time.perf_counter()
+        pred, conf, pred_score = model.predict(text)
+        times.append((time.perf_counter() - t0) * 1e6)
+        preds.append((pred, conf, pred_score, label, score))
+
+    n = len(preds)
+    times.sort()
+    report = {
+        "holdout": n,
+        "agreement": round(sum(p == l for p, _, _, l, _ in preds) / n, 4),
+        "score_mae": round(statistics.fmean(abs(ps - s) for _, _, ps, _, s in preds), 3),
+        # 비교 기준: 학습 셋 전체 평균 점수 하나로 답했을 때의 오차
+        "score_mae_baseline": round(statistics.fmean(abs(model.overall_score - s) for _, _, _, _, s in preds), 3),
+        "latency_us_p50": round(times[n // 2], 1),
+        "latency_us_p95": round(times[min(n - 1, int(n * 0.95))], 1),
+        "thresholds": {},
+    }
+    for t in THRESHOLDS:
+        covered = [(p, l) for p, c, _, l, _ in preds if c >= t]
+        report["thresholds"][t] = {
+            "coverage": round(len(covered) / n, 4),      # 로컬로 답한 비율 (= LLM 호출 절감분)
+            "agreement": round(sum(p == l for p, l in covered) / len(covered), 4) if covered else None,
+        }
+    return report
+
+
+def main(args) -> None:
+    from app.services.emotion_classifier import NaiveBayesEmotion
+
+    samples = load_from_file(args.from_file) if args.from_file else asyncio.run(load_from_mongo())
+    if len(samples) < 50:
+        raise SystemExit(f"❌ 학습 가능한 일기가 너무 적습니다: {len(samples)}건")
+
+    train = [s for s in samples if not _is_holdout(s[3], args.holdout)]
+    holdout = [s for s in samples if _is_holdout(s[3], args.holdout)]
+    print(f"학습 {len(train)}건 / 보류 {len(holdout)}건")
+
+    t0 = time.perf_counter()
+    model = NaiveBayesEmotion.fit(((t, l, s) for t, l, s, _ in train), dim=args.dim, alpha=args.alpha)
+    print(f"학습 완료 ({time.perf_counter() - t0:.2f}s) labels={model.labels}")
+
+    report = evaluate(model, holdout) if holdout else {}
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+    if args.out:
+        from app.services.emotion_analysis import PROMPT_VERSION
+
+        model.meta = {
+            "trained_at": datetime.utcnow().isoformat(timespec="seconds"),
+            "train_samples": len(train),
+            "prompt_version": PROMPT_VERSION,
+            "dim": args.dim,
+            "alpha": args.alpha,
+            "holdout_agreement": report.get("agreement"),
+        }
+        os.makedirs(os.path.dirname(os.path.abspath(args.out)), exist_ok=True)
+        model.save(args.out)
+        print(f"✅ 저장: {args.out} ({os.path.getsize(args.out) / 1024:.0f} KiB)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="로컬 감정 분류기 학습/평가")
+    parser.add_argument("--from-file", default=None, help="GET /diary/export NDJSON 파일 (미지정 시 MongoDB)")
+    parser.add_argument("--out", default=None, help="모델 파일(.npz) 저장 경로")
+    parser.add_argument("--dim", type=int, default=1 << 15)
+    parser.add_argument("--alpha", type=float, default=0.1)
+    parser.add_argument("--holdout", type=float, default=0.2)
+    main(parser.parse_args())
@@ -0,0 +1,159 @@
+# app/services/admission.py
+import asyncio
+import math
+import time
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from typing import Optional, Tuple
+
+from app.config import settings
+
+# --------------------------------------------------
+# ✅ 동기 감정 분석(LLM) 요청 입장 제어
+#   1) 사용자별 토큰 버킷: 분당 admission_user_rate_per_min, 순간 최대 admission_user_burst
+#   2) 전역 동시 처리 상한 admission_max_in_flight
+#      + 대기열 상한 admission_max_queue, 대기 시간 상한 admission_queue_timeout_seconds
+#   → 넘치면 즉시 AdmissionRejected (라우트에서 429 또는 지연 분석으로 전환)
+#   스파이크 때 모든 요청이 OpenAI rate limit → 기본 응답으로 떨어지는 것을 막음
+# --------------------------------------------------
+class AdmissionRejected(RuntimeError):
+    """reason: "user_rate" | "queue_full" | "queue_timeout" """
+
+    def __init__(self, reason: str, retry_after: float):
+        super().__init__(
+            "요청이 너무 잦습니다. 잠시 후 다시 시도해주세요." if reason == "user_rate"
+            else "요청이 많아 잠시 후 다시 시도해주세요."
+        )
+        self.reason = reason
+        self.retry_after = retry_after
+
+    @property
+    def overloaded(self) -> bool:
+        """서버 전체 과부하(사용자 한도 초과가 아님)"""
+        return self.reason != "user_rate"
+
+    def retry_after_header(self) -> str:
+        return str(max(1, math.ceil(self.retry_after)))
+
+
+class TokenBucket:
+    """사용자별 토큰 버킷 (최근 사용자만 보관하는 LRU)"""
+
+    def __init__(self, rate_per_sec: float, burst: int, max_users: int = 10000):
+        self.rate = rate_per_sec
+        self.burst = max(1, burst)
+        self.max_users = max_users
+        self._buckets: "OrderedDict[str, Tuple[float, float]]" = OrderedDict()  # user → (tokens, 갱신 시각)
+
+    def _refill(self, user_id: str, now: float) -> float:
+        tokens, ts = self._buckets.get(user_id, (float(self.burst), now))
+        return min(float(self.burst), tokens + (now - ts) * self.rate)
+
+    def try_take(self, user_id: str) -> Tuple[bool, float]:
+        """(허용 여부, 다음 토큰까지 남은 초)"""
+        if self.rate <= 0:
+            return True, 0.0
+        now = time.monotonic()
+        tokens = self._refill(user_id, now)
+        if tokens >= 1.0:
+            self._buckets[user_id] = (tokens - 1.0, now)
+            self._buckets.move_to_end(user_id)
+            while len(self._buckets) > self.max_users:
+                self._buckets.popitem(last=False)
+            return True, 0.0
+        self._buckets[user_id] = (tokens, now)
+        return False, (1.0 - tokens) / self.rate
+
+    def refund(self, user_id: str) -> None:
+        if user_id in self._buckets:
+            tokens, ts = self._buckets[user_id]
+            self._buckets[user_id] = (min(float(self.burst), tokens + 1.0), ts)
+
+    def __len__(self) -> int:
+        return len(self._buckets)
+
+
+_buckets = TokenBucket(
+    settings.admission_user_rate_per_min / 60.0,
+    settings.admission_user_burst,
+)
+_semaphore: Optional[asyncio.Semaphore] = None
+_state = {"in_flight": 0, "waiting": 0}
+_stats = {
+    "admitted": 0,
+    "rejected_user_rate": 0,
+    "rejected_queue_full": 0,
+    "rejected_queue_timeout": 0,
+    "deferred": 0,
+}
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(max(1, settings.admission_max_in_flight))
+    return _semaphore
+
+
+def _reject(reason: str, retry_after: float) -> AdmissionRejected:
+    _stats[f"rejected_{reason}"] += 1
+    return AdmissionRejected(reason, retry_after)
+
+
+@asynccontextmanager
+async def admit(user_id: str):
+    """
+    async with admit(user_id):
+        analysis = await analyze_emotion(text)
+    """
+    if not settings.admission_enabled:
+        yield
+        return
+
+    ok, wait = _buckets.try_take(user_id)
+    if not ok:
+        raise _reject("user_rate", wait)
+
+    sem = _get_semaphore()
+    if sem.locked():
+        if _state["waiting"] >= settings.admission_max_queue:
+            _buckets.refund(user_id)
+            raise _reject("queue_full", settings.admission_queue_timeout_seconds)
+        _state["waiting"] += 1
+        try:
+            await asyncio.wait_for(sem.acquire(), timeout=settings.admission_queue_timeout_seconds)
+        except asyncio.TimeoutError:
+            _buckets.refund(user_id)
+            raise _reject("queue_timeout", settings.admission_queue_timeout_seconds)
+        finally:
+            _state["waiting"] -= 1
+    else:
+        await sem.acquire()
+
+    _stats["admitted"] += 1
+    _state["in_flight"] += 1
+    try:
+        yield
+    finally:
+        _state["in_flight"] -= 1
+        sem.release()
+
+
+def record_deferred() -> None:
+    """과부하로 지연 분석 모드로 전환된 요청 수"""
+    _stats["deferred"] += 1
+
+
+def get_admission_stats() -> dict:
+    return {
+        **_stats,
+        **_state,
+        "tracked_users": len(_buckets),
+        "enabled": settings.admission_enabled,
+        "max_in_flight": settings.admission_max_in_flight,
+        "max_queue": settings.admission_max_queue,
+        "queue_timeout_seconds": settings.admission_queue_timeout_seconds,
+        "user_rate_per_min": settings.admission_user_rate_per_min,
+        "user_burst": settings.admission_user_burst,
+        "overload_action": settings.admission_overload_action,
+    }
@@ -0,0 +1,126 @@
+# app/services/analysis_cache.py
+import copy
+import hashlib
+import logging
+import re
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Optional
+
+from pymongo import IndexModel
+
+from app.config import settings
+import app.db.mongo as mongo
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# ✅ 감정 분석 결과 캐시 (내용 주소 기반)
+#   - 키: sha256(프롬프트/모델 버전 + 정규화된 본문)
+#   - 1단계: 프로세스 내 LRU
+#   - 2단계: Mongo analysis_cache 컬렉션 (expires_at TTL 인덱스로 만료)
+# --------------------------------------------------
+CACHE_COLLECTION = "analysis_cache"
+
+# expires_at 시각에 Mongo TTL 모니터가 삭제
+INDEXES = [IndexModel("expires_at", name="expires_at_ttl", expireAfterSeconds=0)]
+
+_WS_RE = re.compile(r"\s+")
+
+_memory: "OrderedDict[str, dict]" = OrderedDict()
+_stats = {"memory_hits": 0, "mongo_hits": 0, "misses": 0, "writes": 0, "errors": 0}
+
+
+def normalize_text(text: str) -> str:
+    """유니코드 NFC + 앞뒤 공백 제거 + 연속 공백 축약"""
+    text = unicodedata.normalize("NFC", text or "")
+    return _WS_RE.sub(" ", text).strip()
+
+
+def make_cache_key(text: str, namespace: str) -> str:
+    raw = f"{namespace}\x00{normalize_text(text)}".encode("utf-8")
+    return hashlib.sha256(raw).hexdigest()
+
+
+def _get_cache_collection():
+    if mongo.db is None:
+        return None
+    return mongo.db[CACHE_COLLECTION]
+
+
+def _remember(key: str, value: dict) -> None:
+    _memory[key] = value
+    _memory.move_to_end(key)
+    while len(_memory) > max(settings.analysis_cache_max_entries, 0):
+        _memory.popitem(last=False)
+
+
+# --------------------------------------------------
+# ✅ 조회 (메모리 → Mongo 순)
+# --------------------------------------------------
+async def get_cached_analysis(key: str) -> Optional[dict]:
+    if not settings.analysis_cache_enabled:
+        return None
+
+    hit = _memory.get(key)
+    if hit is not None:
+        _memory.move_to_end(key)
+        _stats["memory_hits"] += 1
+        return copy.deepcopy(hit)
+
+    col = _get_cache_collection()
+    if col is not None:
+        try:
+            doc = await col.find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+        except Exception as e:
+            _stats["errors"] += 1
+            logger.warning("분석 캐시 조회 실패: %s", e)
+            doc = None
+        if doc:
+            _stats["mongo_hits"] += 1
+            _remember(key, doc["result"])
+            return copy.deepcopy(doc["result"])
+
+    _stats["misses"] += 1
+    return None
+
+
+# --------------------------------------------------
+# ✅ 저장 (정상 분석 결과만 저장할 것 — 실패 기본값은 저장 금지)
+# --------------------------------------------------
+async def store_analysis(key: str, analysis: dict) -> None:
+    if not settings.analysis_cache_enabled:
+        return
+
+    value = copy.deepcopy(analysis)
+    _remember(key, value)
+
+    col = _get_cache_collection()
+    if col is None:
+        return
+    now = datetime.utcnow()
+    try:
+        await col.update_one(
+            {"_id": key},
+            {"$set": {
+                "result": value,
+                "created_at": now,
+                "expires_at": now + timedelta(seconds=settings.analysis_cache_ttl_seconds),
+            }},
+            upsert=True,
+        )
+        _stats["writes"] += 1
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning("분석 캐시 저장 실패: %s", e)
+
+
+def get_cache_stats() -> dict:
+    lookups = _stats["memory_hits"] + _stats["mongo_hits"] + _stats["misses"]
+    hits = _stats["memory_hits"] + _stats["mongo_hits"]
+    return {
+        **_stats,
+        "memory_entries": len(_memory),
+        "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+    }
@@ -0,0 +1,215 @@
+# app/services/analysis_stream.py
+import json
+import logging
+import re
+import time
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.services import emotion_analysis as ea
+from app.services.analysis_cache import get_cached_analysis, make_cache_key, store_analysis
+from app.services.llm_client import stream_chat_completion
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# ✅ 스트리밍 감정 분석 (SSE용)
+#   - 생성 중인 JSON을 조각마다 부분 파싱
+#     · label / score / risk_level이 모두 나오면 즉시 "verdict" 이벤트
+#     · feedback 문자열은 디코딩되는 대로 "feedback" 델타 이벤트
+#   - 스트림이 끝나면 전체를 EmotionAnalysisOutput으로 검증 → finalize_analysis
+#   - 차단기/타임아웃/분류기/캐시 규칙은 analyze_emotion과 동일
+# --------------------------------------------------
+Emit = Callable[[str, dict], Awaitable[None]]
+
+_LABEL_RE = re.compile(r'"label"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_SCORE_RE = re.compile(r'"score"\s*:\s*(-?\d+(?:\.\d+)?)\s*[,}]')
+_RISK_RE = re.compile(r'"risk_level"\s*:\s*"((?:[^"\\]|\\.)*)"')
+_FEEDBACK_RE = re.compile(r'"feedback"\s*:\s*"')
+
+
+def _json_str(raw: str) -> str:
+    """따옴표 안의 JSON 문자열 원문 → 파이썬 문자열 (\\uXXXX 등 이스케이프 해제)"""
+    try:
+        return json.loads(f'"{raw}"')
+    except ValueError:
+        return raw
+
+
+_ESCAPES = {'"': '"', "\\": "\\", "/": "/", "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t"}
+
+
+class IncrementalAnalysisParser:
+    """모델 출력 JSON 조각을 받아 (판정, feedback 델타)를 가능한 한 빨리 꺼냄"""
+
+    def __init__(self):
+        self.buffer = ""
+        self.verdict: Optional[dict] = None
+        self._fb_start: Optional[int] = None   # feedback 값의 첫 글자 위치
+        self._fb_pos = 0                        # 다음에 디코딩할 위치
+        self._fb_done = False
+
+    def feed(self, delta: str) -> Tuple[Optional[dict], str]:
+        """(이번에 처음 완성된 판정 또는 None, 새로 디코딩된 feedback 글자)"""
+        self.buffer += delta
+        new_verdict = None
+        if self.verdict is None:
+            label, score, risk = _LABEL_RE.search(self.buffer), _SCORE_RE.search(self.buffer), _RISK_RE.search(self.buffer)
+            if label and score and risk:
+                self.verdict = new_verdict = {
+                    "label": _json_str(label.group(1)),
+                    "score": int(round(float(score.group(1)))),
+                    "risk_level": _json_str(risk.group(1)).strip().lower(),
+                }
+        return new_verdict, self._feedback_delta()
+
+    def _feedback_delta(self) -> str:
+        # 판정 전에는 읽은 위치를 옮기지 않음 → 판정이 나온 조각에서 그때까지의 feedback을 한꺼번에 반환
+        #   (json_object/text 모드 등에서 feedback이 score/risk_level보다 먼저 와도 앞부분이 잘리지 않음)
+        if self._fb_done or self.verdict is None:
+            return ""
+        if self._fb_start is None:
+            m = _FEEDBACK_RE.search(self.buffer)
+            if not m:
+                return ""
+            self._fb_start = self._fb_pos = m.end()
+
+        out: List[str] = []
+        buf, i = self.buffer, self._fb_pos
+        while i < len(buf):
+            ch = buf[i]
+            if ch == '"':
+                self._fb_done = True
+                i += 1
+                break
+            if ch != "\\":
+                out.append(ch)
+                i += 1
+                continue
+            # 이스케이프: 뒷부분이 아직 안 왔으면 다음 조각까지 대기
+            if i + 1 >= len(buf):
+                break
+            esc = buf[i + 1]
+            if esc == "u":
+                if i + 6 > len(buf):
+                    break
+                try:
+                    code = int(buf[i + 2:i + 6], 16)
+                except ValueError:
+                    code = 0xFFFD
+                step = 6
+                if 0xD800 <= code < 0xDC00:
+                    # 서로게이트 쌍(이모지 등): 뒤쪽 \uXXXX까지 와야 한 글자로 합침
+                    if i + 12 > len(buf):
+                        break
+                    try:
+                        low = int(buf[i + 8:i + 12], 16) if buf[i + 6:i + 8] == "\\u" else -1
+                    except ValueError:
+                        low = -1
+                    if 0xDC00 <= low < 0xE000:
+                        code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                        step = 12
+                    else:
+                        code = 0xFFFD
+                elif 0xDC00 <= code < 0xE000:
+                    code = 0xFFFD
+                out.append(chr(code))
+                i += step
+            else:
+                out.append(_ESCAPES.get(esc, esc))
+                i += 2
+        self._fb_pos = i
+        return "".join(out)
+
+
+def _verdict_event(text: str, verdict: dict) -> dict:
+    label = verdict["label"]
+    return {
+        "analyzed_emotion": {"label": label, "emoji": ea.EMOTION_EMOJI_MAP.get(label, "😐")},
+        "score": verdict["score"],
+        # 키워드 사전 보정을 먼저 적용해 위험 일기를 낮게 보여주지 않음
+        "risk_level": ea.refine_risk(text, label, verdict["score"], verdict["risk_level"]),
+    }
+
+
+async def _emit_whole(emit: Emit, analysis: dict) -> None:
+    """스트리밍 없이 얻은 결과(분류기/캐시/로컬)를 같은 이벤트 순서로 전송"""
+    await emit("verdict", {
+        "analyzed_emotion": analysis["analyzed_emotion"],
+        "score": analysis["score"],
+        "risk_level": analysis["risk_level"],
+    })
+    await emit("feedback", {"delta": analysis.get("feedback", "")})
+
+
+async def _stream_llm(text: str, emit: Emit) -> dict:
+    parser = IncrementalAnalysisParser()
+    sent_verdict = False   # 스트림 중 판정을 못 찾았으면 끝난 뒤 전체 결과로 한 번에 전송
+    async for delta in stream_chat_completion(
+        messages=ea.build_messages(text),
+        purpose="emotion_analysis.stream",
+        **ea.completion_options(),
+    ):
+        verdict, fb = parser.feed(delta)
+        if verdict is not None:
+            sent_verdict = True
+            await emit("verdict", _verdict_event(text, verdict))
+        if fb:
+            await emit("feedback", {"delta": fb})
+    out = ea.parse_output(parser.buffer)
+    if not sent_verdict:
+        await emit("verdict", _verdict_event(text, out.model_dump()))
+        await emit("feedback", {"delta": out.feedback})
+    return ea.finalize_analysis(text, out)
+
+
+async def analyze_emotion_streaming(text: str, emit: Emit) -> dict:
+    """
+    분석 이벤트를 emit("verdict" | "feedback" | "reset", data)로 흘려보내고 최종 분석 결과를 반환.
+    실패 시 analyze_emotion과 같이 로컬 간이 분석으로 마무리합니다.
+    스트리밍 도중 실패해 다른 결과로 대체할 때는 먼저 "reset"을 보냄
+    → 클라이언트는 받은 판정/피드백을 버리고 뒤따르는 verdict/feedback으로 다시 채움
+    """
+    started = time.perf_counter()
+    fast = ea.classify_locally(text)
+    if fast is not None:
+        await _emit_whole(emit, fast)
+        ea.record_analysis(started, fast)
+        return fast
+
+    cache_key = make_cache_key(text, ea.analysis_namespace())
+    cached = await get_cached_analysis(cache_key)
+    if cached is not None:
+        await _emit_whole(emit, cached)
+        ea.record_analysis(started, cached)
+        return cached
+
+    streamed = False
+
+    async def tracked(event: str, data: dict) -> None:
+        nonlocal streamed
+        streamed = True
+        await emit(event, data)
+
+    async def replace(reason: str) -> None:
+        if streamed:
+            await emit("reset", {"reason": reason})
+
+    try:
+        result = await ea.llm_breaker.call(lambda: ea.with_analysis_timeout(_stream_llm(text, tracked)))
+        await store_analysis(cache_key, result)
+        ea.record_analysis(started, result)
+        return result
+    except ValidationError as e:
+        logger.warning("스트리밍 응답 형식 오류 → 일반 분석으로 재시도: %s", ea._brief_errors(e))
+        result = await ea.analyze_emotion(text)   # 지표는 analyze_emotion이 기록
+        await replace("invalid_output")
+        await _emit_whole(emit, result)
+        return result
+    except Exception as e:
+        # 대체 횟수/시간 초과/outcome 지표는 analyze_emotion과 같은 경로로 기록
+        result = ea.fallback_to_local(text, started, e)
+        await replace(ea.failure_outcome(e))
+        await _emit_whole(emit, result)
+        return result
@@ -0,0 +1,134 @@
+# app/services/analysis_worker.py
+import asyncio
+import logging
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from bson import ObjectId
+
+from app.config import settings
+import app.models.analysis_job as job_model
+import app.models.diary as diary_model
+from app.services.emotion_analysis import analyze_emotion_or_raise, local_analysis
+from app.services.resilience import CircuitOpen
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# ✅ 백그라운드 감정 분석 워커
+#   - analysis_jobs 컬렉션을 폴링하며 작업을 점유/처리
+#   - 실패 시 지수 백오프로 재시도, 최대 횟수 초과 시 기본 응답으로 마감
+# --------------------------------------------------
+_tasks: List[asyncio.Task] = []
+_wakeup: Optional[asyncio.Event] = None
+_worker_prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+
+def _get_wakeup() -> asyncio.Event:
+    global _wakeup
+    if _wakeup is None:
+        _wakeup = asyncio.Event()
+    return _wakeup
+
+
+def _retry_delay(attempts: int) -> timedelta:
+    return timedelta(seconds=min(5 * (2 ** max(attempts - 1, 0)), 600))
+
+
+# --------------------------------------------------
+# ✅ 작업 등록 + 로컬 워커 깨우기
+# --------------------------------------------------
+async def enqueue_analysis(diary_id: ObjectId, user_id: str, available_at: Optional[datetime] = None) -> None:
+    await job_model.enqueue_job(diary_id, user_id, available_at=available_at)
+    _get_wakeup().set()
+
+
+# --------------------------------------------------
+# ✅ 작업 1건 처리
+# --------------------------------------------------
+async def _process(job: dict) -> None:
+    diary_id = job["_id"]
+    doc = await diary_model.get_raw_diary(diary_id)
+    if not doc:
+        # 일기가 삭제됨 → 작업만 정리
+        await job_model.complete_job(diary_id)
+        return
+
+    try:
+        analysis = await analyze_emotion_or_raise(doc.get("text", ""))
+    except Exception as e:
+        attempts = job.get("attempts", 1)
+        if attempts >= settings.analysis_max_attempts:
+            logger.error("감정 분석 최종 실패: %s", e, extra={"fields": {"diary_id": str(diary_id), "attempts": attempts}})
+            # 위험도만큼은 로컬에서 계산해 둠 (재분석 스크립트가 analysis_source=local을 다시 처리)
+            await diary_model.apply_analysis(diary_id, local_analysis(doc.get("text", "")), status="failed")
+            await job_model.fail_job(diary_id, str(e))
+        else:
+            delay = _retry_delay(attempts)
+            if isinstance(e, CircuitOpen):
+                # 차단 중 → 닫힐 때까지는 다시 시도해도 소용없음
+                delay = max(delay, timedelta(seconds=e.retry_after))
+            await job_model.fail_job(diary_id, str(e), retry_at=datetime.utcnow() + delay)
+        return
+
+    await diary_model.apply_analysis(diary_id, analysis)
+    await job_model.complete_job(diary_id)
+
+
+async def _worker_loop(idx: int) -> None:
+    worker_id = f"{_worker_prefix}:{idx}"
+    wakeup = _get_wakeup()
+    while True:
+        try:
+            job = await job_model.claim_next_job(worker_id, settings.analysis_job_lease_seconds)
+            if job is None:
+                wakeup.clear()
+                try:
+                    await asyncio.wait_for(wakeup.wait(), timeout=settings.analysis_poll_interval_seconds)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await _process(job)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            logger.exception("분석 워커 오류", extra={"fields": {"worker_id": worker_id}})
+            await asyncio.sleep(settings.analysis_poll_interval_seconds)
+
+
+# --------------------------------------------------
+# ✅ 유실된 작업 복구 (일기는 pending인데 작업이 없는 경우)
+# --------------------------------------------------
+async def requeue_orphaned_diaries(grace_seconds: int = 60) -> int:
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    pending = await diary_model.find_pending_diaries(cutoff)
+    for d in pending:
+        await job_model.enqueue_job(d["_id"], d["user_id"])  # 이미 있으면 no-op
+    return len(pending)
+
+
+# --------------------------------------------------
+# ✅ 시작/종료 (FastAPI startup/shutdown에서 호출)
+# --------------------------------------------------
+async def start_analysis_workers(count: Optional[int] = None) -> None:
+    n = settings.analysis_workers if count is None else count
+    if n <= 0 or _tasks:
+        return
+    try:
+        requeued = await requeue_orphaned_diaries()
+        if requeued:
+            logger.info("분석 대기 일기 %d건 재등록", requeued)
+    except Exception as e:
+        logger.warning("분석 작업 복구 실패: %s", e)
+    for i in range(n):
+        _tasks.append(asyncio.create_task(_worker_loop(i)))
+    logger.info("감정 분석 워커 %d개 시작", n)
+
+
+async def stop_analysis_workers() -> None:
+    for t in _tasks:
+        t.cancel()
+    await asyncio.gather(*_tasks, return_exceptions=True)
+    _tasks.clear()
@@ -0,0 +1,179 @@
+# app/services/diary_import.py
+import csv
+import io
+import json
+import logging
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from app.config import settings
+import app.models.analysis_job as job_model
+import app.models.diary as diary_model
+from app.schemas.diary import DiaryCreate, DiaryImportError, DiaryImportReport
+
+logger = logging.getLogger(__name__)
+
+# ==================================================
+# ✅ 일기 일괄 가져오기 (NDJSON / CSV)
+#   - 행마다 DiaryCreate로 검증, 실패 행은 보고서에 기록하고 계속 진행
+#   - import_batch_size 단위 insert_many(ordered=False)
+#   - 감정 분석은 analysis_jobs에 available_at을 분산해 등록
+#     → 가져오기 직후 LLM 호출이 몰리지 않음 (import_analysis_rate_per_sec)
+# ==================================================
+IMPORT_FORMATS = ("ndjson", "csv")
+CSV_COLUMNS = ("date", "emotion_label", "emotion_emoji", "text")
+MAX_REPORTED_ERRORS = 200
+
+# 행 번호, 원본(dict) 또는 파싱 오류 메시지
+Row = Tuple[int, Optional[dict], Optional[str]]
+
+
+def detect_format(content_type: Optional[str], filename: Optional[str] = None) -> Optional[str]:
+    ct = (content_type or "").lower()
+    name = (filename or "").lower()
+    if "csv" in ct or name.endswith(".csv"):
+        return "csv"
+    if "ndjson" in ct or "jsonl" in ct or "json" in ct or name.endswith((".ndjson", ".jsonl")):
+        return "ndjson"
+    return None
+
+
+def _iter_ndjson(lines: Iterable[str]) -> Iterator[Row]:
+    for n, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line)
+        except json.JSONDecodeError as e:
+            yield n, None, f"JSON 파싱 실패: {e.msg}"
+            continue
+        if not isinstance(obj, dict):
+            yield n, None, "각 줄은 JSON 객체여야 합니다."
+            continue
+        yield n, obj, None
+
+
+def _iter_csv(lines: Iterable[str]) -> Iterator[Row]:
+    reader = csv.DictReader(lines)
+    missing = [c for c in CSV_COLUMNS if c not in (reader.fieldnames or [])]
+    if missing:
+        yield 0, None, f"CSV 헤더에 필요한 열이 없습니다: {', '.join(missing)}"
+        return
+    for n, rec in enumerate(reader, start=1):
+        yield n, {
+            "date": (rec.get("date") or "").strip(),
+            "emotion": {
+                "label": (rec.get("emotion_label") or "").strip(),
+                "emoji": (rec.get("emotion_emoji") or "").strip(),
+            },
+            "text": rec.get("text") or "",
+        }, None
+
+
+def iter_rows(lines: Iterable[str], fmt: str) -> Iterator[Row]:
+    if fmt == "csv":
+        return _iter_csv(lines)
+    if fmt == "ndjson":
+        return _iter_ndjson(lines)
+    raise ValueError(f"지원하지 않는 형식입니다: {fmt} (ndjson/csv)")
+
+
+def decode_body(body: bytes) -> List[str]:
+    text = body.decode("utf-8-sig")   # 엑셀 CSV의 BOM 제거
+    return io.StringIO(text, newline="").readlines()
+
+
+def _validation_message(e: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(p) for p in err['loc'])}: {err['msg']}" for err in e.errors()
+    )
+
+
+# ==================================================
+# ✅ 가져오기 실행
+# ==================================================
+async def import_diaries(
+    user_id: str,
+    rows: Iterable[Row],
+    batch_size: Optional[int] = None,
+    max_rows: Optional[int] = None,
+) -> DiaryImportReport:
+    batch_size = max(1, batch_size or settings.import_batch_size)
+    max_rows = settings.import_max_rows if max_rows is None else max_rows
+    rate = settings.import_analysis_rate_per_sec
+
+    total = inserted = 0
+    errors: List[DiaryImportError] = []
+    failed = 0
+    now = datetime.utcnow()
+    scheduled = 0            # 지금까지 예약한 분석 작업 수 (available_at 분산용)
+    last_at: Optional[datetime] = None
+
+    def _error(row: int, msg: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append(DiaryImportError(row=row, error=msg))
+
+    async def _flush(batch: List[Tuple[int, dict]]) -> None:
+        nonlocal inserted, scheduled, last_at
+        docs = [doc for _, doc in batch]
+        saved, write_errors = await diary_model.insert_diaries_bulk(docs)
+        for idx, msg in sorted(write_errors.items()):
+            _error(batch[idx][0], f"저장 실패: {msg}")
+        inserted += len(saved)
+
+        jobs = []
+        for doc in saved:
+            delay = scheduled / rate if rate > 0 else 0.0
+            last_at = now + timedelta(seconds=delay)
+            jobs.append((doc["_id"], user_id, last_at))
+            scheduled += 1
+        try:
+            await job_model.enqueue_jobs_bulk(jobs)
+        except Exception as e:
+            # 일기는 이미 pending으로 저장됨 → 워커 시작 시 pending 복구 루틴이 다시 큐잉
+            logger.warning("가져오기 분석 작업 등록 실패(%d건): %s", len(jobs), e)
+
+    batch: List[Tuple[int, dict]] = []
+    for row_no, raw, parse_error in rows:
+        if row_no == 0:            # 헤더 등 파일 단위 오류
+            _error(0, parse_error or "파일 형식 오류")
+            break
+        if total >= max_rows:
+            # 이미 저장된 배치는 유지하고 나머지는 건너뜀
+            _error(row_no, f"한 번에 최대 {max_rows}건까지 가져올 수 있습니다. 이 행부터 건너뜀")
+            break
+        total += 1
+        if parse_error:
+            _error(row_no, parse_error)
+            continue
+        try:
+            diary = DiaryCreate(**raw)
+        except ValidationError as e:
+            _error(row_no, _validation_message(e))
+            continue
+
+        doc = diary_model.build_pending_doc(user_id, diary)
+        # 통계(rollup)는 created_at 기준 → 원래 작성일로 집계되도록
+        doc["created_at"] = doc["date"]
+        doc["imported_at"] = now
+        batch.append((row_no, doc))
+        if len(batch) >= batch_size:
+            await _flush(batch)
+            batch = []
+
+    if batch:
+        await _flush(batch)
+
+    logger.info("일기 가져오기 완료", extra={"fields": {"user_id": user_id, "inserted": inserted, "total": total, "failed": failed}})
+    return DiaryImportReport(
+        total=total,
+        inserted=inserted,
+        failed=failed,
+        errors=errors,
+        analysis_scheduled_until=last_at,
+    )
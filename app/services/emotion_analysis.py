@@ -1,8 +1,20 @@
 # app/services/emotion_analysis.py
-from openai import OpenAI
-import os
-import json
+import asyncio
+import logging
+import time
+from typing import Awaitable
 from dotenv import load_dotenv
+from pydantic import ValidationError
+
+from app.config import settings
+from app.schemas.analysis import EMOTION_ANALYSIS_JSON_SCHEMA, EmotionAnalysisOutput
+from app.services.llm_client import create_chat_completion, usage_of
+from app.services.analysis_cache import make_cache_key, get_cached_analysis, store_analysis
+from app.services.keyword_matcher import KeywordMatcher, detect_risk, match_risk_keywords
+from app.services.resilience import CircuitBreaker, CircuitOpen, LatencyTracker, hedged
+from app.services import emotion_classifier
+from app.services import metrics
+from app.services.structured_log import hot
 
 # --------------------------------------------------
 # 보조 서비스
@@ -10,6 +22,8 @@ from dotenv import load_dotenv
 # ✅ 리소스를 평탄화된 리스트(List[dict])로 제공
 from app.services.resource import get_safety_resources
 
+logger = logging.getLogger(__name__)
+
 # safety.py는 선택적이므로 안전하게 import 시도
 try:
     from app.services.safety import evaluate_risk_level  # ✅ 위험 수준 정제용
@@ -20,7 +34,16 @@ except ImportError:
 # 환경 설정
 # --------------------------------------------------
 load_dotenv()
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+
+# --------------------------------------------------
+# ✅ 프롬프트 버전 (프롬프트/파싱 규칙을 바꾸면 올릴 것 → 캐시 키가 바뀜)
+# --------------------------------------------------
+PROMPT_VERSION = "v2"   # v2: 구조화 출력(json_schema) + 짧은 프롬프트
+
+
+def analysis_namespace() -> str:
+    return f"{PROMPT_VERSION}:{settings.openai_model}"
+
 
 # --------------------------------------------------
 # ✅ 감정 → 이모지 매핑
@@ -44,6 +67,210 @@ def format_sentence(text: str) -> str:
     return text
 
 
+# --------------------------------------------------
+# ✅ 분석 실패 시 기본 응답
+# --------------------------------------------------
+def fallback_analysis() -> dict:
+    return {
+        "analyzed_emotion": {"label": "중립", "emoji": "😐"},
+        "reason": "감정 분석에 실패했습니다.",
+        "score": 5,
+        "feedback": "오늘 하루도 수고 많으셨어요.",
+        "risk_level": "none",
+        "risk_resources": get_safety_resources("none"),  # List[dict]
+    }
+
+
+# --------------------------------------------------
+# ✅ 로컬 간이 분석 (LLM 장애/차단기 열림 시)
+#   - 감정 사전 키워드 매칭으로 라벨/강도 추정
+#   - 위험도는 키워드 사전 + evaluate_risk_level로 로컬에서 계산
+#     (기본 응답처럼 무조건 "none"으로 두지 않음)
+# --------------------------------------------------
+EMOTION_MATCHER = KeywordMatcher({
+    "행복": ["행복", "기쁘", "기뻤", "좋았", "즐거", "신나", "설레", "감사", "뿌듯", "웃었"],
+    "슬픔": ["슬프", "슬펐", "우울", "눈물", "울었", "외로", "허전", "공허", "그립", "무기력"],
+    "분노": ["화가", "화났", "짜증", "억울", "분노", "열받", "답답", "미워", "싫어"],
+    "불안": ["불안", "걱정", "초조", "긴장", "두렵", "무서", "막막", "떨려", "불편"],
+})
+
+LOCAL_FEEDBACK = {
+    "high": "지금 많이 힘드시다면 혼자 견디지 말고 아래 도움을 꼭 요청해 주세요.",
+    "moderate": "요즘 많이 지치셨던 것 같아요. 믿을 수 있는 사람과 마음을 나눠 보세요.",
+    "mild": "마음이 무거운 하루였네요. 오늘은 스스로에게 조금 더 너그러워져도 괜찮아요.",
+    "none": "오늘 하루도 수고 많으셨어요.",
+}
+
+
+def local_analysis(text: str) -> dict:
+    found = EMOTION_MATCHER.find(text)
+    if found:
+        label, kws = max(found.items(), key=lambda kv: len(kv[1]))
+        score = min(9, 5 + len(kws))
+        reason = f"'{', '.join(sorted(kws)[:3])}' 등의 표현을 바탕으로 간이 분석했습니다."
+    else:
+        label, score = "중립", 3
+        reason = "뚜렷한 감정 표현이 없어 간이 분석으로 중립으로 판단했습니다."
+
+    risk_level = detect_risk(text)
+    if evaluate_risk_level:
+        try:
+            risk_level = evaluate_risk_level(text, label, score)
+        except Exception as e:
+            logger.warning("evaluate_risk_level 호출 실패: %s", e)
+
+    return {
+        "analyzed_emotion": {"label": label, "emoji": EMOTION_EMOJI_MAP.get(label, "😐")},
+        "reason": reason,
+        "score": score,
+        "feedback": LOCAL_FEEDBACK.get(risk_level, LOCAL_FEEDBACK["none"]),
+        "risk_level": risk_level,
+        "risk_resources": get_safety_resources(risk_level),
+        "analysis_source": "local",
+    }
+
+
+# --------------------------------------------------
+# ✅ 학습된 로컬 분류기 우선 응답 (확신도 높고 위험 징후 없을 때만)
+#   - 위험도 moderate/high 가능성이 있는 일기는 항상 LLM으로
+# --------------------------------------------------
+CLASSIFIER_FEEDBACK = {
+    "행복": "좋은 순간을 잘 기억해 두세요. 오늘의 기쁨이 내일의 힘이 될 거예요.",
+    "슬픔": "마음이 무거운 하루였네요. 오늘은 스스로에게 조금 더 너그러워져도 괜찮아요.",
+    "분노": "속상한 일이 있었군요. 잠시 숨을 고르고 나를 위한 시간을 가져 보세요.",
+    "불안": "걱정이 많은 하루였네요. 지금 할 수 있는 작은 일부터 하나씩 해 보세요.",
+    "중립": "오늘 하루도 수고 많으셨어요.",
+}
+
+
+def classify_locally(text: str):
+    """확신할 수 있으면 분석 결과 dict, 아니면 None (→ LLM)"""
+    model = emotion_classifier.get_classifier()
+    if model is None:
+        return None
+    label, confidence, score = model.predict(text)
+    if confidence < settings.emotion_classifier_min_confidence:
+        emotion_classifier.record("low_confidence")
+        return None
+
+    risk_level = detect_risk(text)
+    if evaluate_risk_level:
+        try:
+            risk_level = evaluate_risk_level(text, label, score)
+        except Exception as e:
+            logger.warning("evaluate_risk_level 호출 실패: %s", e)
+    if risk_level not in ("none", "mild"):
+        emotion_classifier.record("risky")
+        return None
+
+    emotion_classifier.record("answered")
+    return {
+        "analyzed_emotion": {"label": label, "emoji": EMOTION_EMOJI_MAP.get(label, "😐")},
+        "reason": f"지난 분석 기록으로 학습한 모델이 '{label}' 감정으로 판단했습니다.",
+        "score": score,
+        "feedback": CLASSIFIER_FEEDBACK.get(label, CLASSIFIER_FEEDBACK["중립"]),
+        "risk_level": risk_level,
+        "risk_resources": get_safety_resources(risk_level),
+        "analysis_version": PROMPT_VERSION,
+        "analysis_source": "classifier",
+    }
+
+
+# --------------------------------------------------
+# ✅ LLM 호출 보호: 차단기(실패율 + 지연 SLO) · 전체 타임아웃 · p95 헤징
+# --------------------------------------------------
+llm_breaker = CircuitBreaker(
+    "emotion_llm",
+    window=settings.llm_breaker_window,
+    min_calls=settings.llm_breaker_min_calls,
+    failure_rate=settings.llm_breaker_failure_rate,
+    open_seconds=settings.llm_breaker_open_seconds,
+    slo_seconds=settings.llm_slo_seconds,
+)
+_latency = LatencyTracker()
+_hedge_stats = {"hedged": 0, "timeouts": 0, "local_fallbacks": 0}
+
+
+def _hedge_delay():
+    if not settings.llm_hedge_enabled or llm_breaker.state != "closed":
+        return None
+    p = _latency.quantile(settings.llm_hedge_quantile)
+    return None if p is None else max(p, settings.llm_hedge_min_delay_seconds)
+
+
+async def _guarded_request(text: str) -> dict:
+    async def once() -> dict:
+        started = time.monotonic()
+        result = await _request_analysis(text)
+        _latency.add(time.monotonic() - started)
+        return result
+
+    delay = _hedge_delay()
+
+    async def attempt() -> dict:
+        return await with_analysis_timeout(
+            hedged(once, delay, on_hedge=lambda: _hedge_stats.__setitem__("hedged", _hedge_stats["hedged"] + 1)),
+        )
+
+    return await llm_breaker.call(attempt)
+
+
+async def with_analysis_timeout(aw: Awaitable[dict]) -> dict:
+    """analysis_timeout_seconds 안에 끝나지 않으면 TimeoutError (timeouts 집계 — 일반/스트리밍 공용)"""
+    try:
+        return await asyncio.wait_for(aw, timeout=settings.analysis_timeout_seconds)
+    except asyncio.TimeoutError:
+        _hedge_stats["timeouts"] += 1
+        raise TimeoutError(f"감정 분석 시간 초과 ({settings.analysis_timeout_seconds}s)")
+
+
+analysis_duration = metrics.histogram(
+    "emotion_analysis_duration_seconds", "감정 분석 1건 전체 시간 (분류기/캐시/LLM/로컬 대체 포함)", ("source",),
+)
+analysis_results = metrics.counter(
+    "emotion_analysis_total", "감정 분석 수 (outcome: ok | circuit_open | timeout | error → 로컬 대체)", ("source", "outcome"),
+)
+
+
+def record_analysis(started: float, result: dict, outcome: str = "ok") -> None:
+    """started: time.perf_counter() 값"""
+    source = result.get("analysis_source", "llm")
+    analysis_duration.observe(time.perf_counter() - started, source)
+    analysis_results.inc(source, outcome)
+
+
+def failure_outcome(e: BaseException) -> str:
+    if isinstance(e, CircuitOpen):
+        return "circuit_open"   # 차단 중 → 기다리지 않고 바로 로컬 분석
+    if isinstance(e, (TimeoutError, asyncio.TimeoutError)):
+        return "timeout"
+    return "error"
+
+
+def fallback_to_local(text: str, started: float, e: BaseException) -> dict:
+    """LLM 경로 실패 → 로컬 간이 분석 + 지표 기록 (analyze_emotion / 스트리밍 공용)"""
+    outcome = failure_outcome(e)
+    if outcome != "circuit_open":
+        logger.error("감정 분석 실패 → 로컬 분석: %s", e)
+    _hedge_stats["local_fallbacks"] += 1
+    result = local_analysis(text)
+    record_analysis(started, result, outcome)
+    return result
+
+
+def get_analysis_resilience_stats() -> dict:
+    return {
+        "breaker": llm_breaker.snapshot(),
+        "latency_p50": _latency.quantile(0.5, min_samples=1),
+        "latency_p95": _latency.quantile(0.95, min_samples=1),
+        "samples": len(_latency),
+        **_hedge_stats,
+        **_analysis_stats,
+        "output_mode": settings.analysis_output_mode,
+        "classifier": emotion_classifier.get_classifier_stats(),
+    }
+
+
 # --------------------------------------------------
 # ✅ 감정 분석 + 위험 감정 감지 + 리소스 추천
 # --------------------------------------------------
@@ -51,125 +278,199 @@ async def analyze_emotion(text: str) -> dict:
     """
     사용자의 일기 텍스트를 분석하여 감정, 이유, 점수, 피드백, 위험 수준, 추천 리소스를 반환.
     risk_resources는 List[dict] 형태로 반환합니다.
+    LLM 실패/시간 초과/차단기 열림 시 로컬 간이 분석(local_analysis) 결과를 반환합니다.
     """
-    system_prompt = (
-        "당신은 감정 분석 전문가이자 심리 상담 보조 시스템입니다.\n"
-        "사용자의 일기 내용을 분석하여 다음 정보를 반드시 JSON 형식으로 제공합니다:\n\n"
-        "{\n"
-        '  "label": "감정 이름 (행복, 슬픔, 분노, 불안, 중립 중 하나)",\n'
-        '  "reason": "이 감정을 판단한 이유",\n'
-        '  "score": 1~10 사이의 감정 강도 점수 (10은 매우 강한 감정)",\n'
-        '  "feedback": "사용자에게 전할 따뜻한 한 문장",\n'
-        '  "risk_level": "none | mild | moderate | high 중 하나"\n'
-        "}\n\n"
-        "⚠️ 반드시 JSON 형식만 출력하세요.\n"
-        "다른 문장은 출력하지 마세요.\n\n"
-        "※ 'risk_level' 기준:\n"
-        "- 'high': 자살, 죽고 싶다, 끝내고 싶다, 삶을 포기, 해를 입히고 싶다 등의 표현이 있을 때\n"
-        "- 'moderate': 극심한 무기력, 자책, 절망, '의욕이 없다', '너무 힘들다' 등의 반복적 표현\n"
-        "- 'mild': 일시적인 우울, 피로감\n"
-        "- 'none': 위험 징후 없음"
-    )
-
-    user_prompt = f"일기 내용:\n{text}"
-
+    started = time.perf_counter()
     try:
-        # --------------------------------------------------
-        # ✅ GPT 감정 분석 요청
-        # --------------------------------------------------
-        response = client.chat.completions.create(
-            model="gpt-4o",
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": user_prompt},
-            ],
-            temperature=0.3,
-            max_tokens=1500,
-        )
+        result = await analyze_emotion_or_raise(text)
+        record_analysis(started, result)
+        return result
+    except Exception as e:
+        return fallback_to_local(text, started, e)
 
-        content = response.choices[0].message.content
-        print("🧠 GPT 응답 원문:\n", content)
-
-        # --------------------------------------------------
-        # ✅ JSON 파싱 전 코드블록 제거
-        # --------------------------------------------------
-        cleaned = (
-            content.strip()
-            .replace("```json", "")
-            .replace("```", "")
-            .strip()
-        )
 
-        # --------------------------------------------------
-        # ✅ JSON 안전 파싱
-        # --------------------------------------------------
+# --------------------------------------------------
+# ✅ 감정 분석 (실패 시 예외 전파)
+#   - 백그라운드 워커처럼 재시도가 가능한 호출자가 사용
+# --------------------------------------------------
+async def analyze_emotion_or_raise(text: str, use_classifier: bool = True) -> dict:
+    """
+    analyze_emotion과 동일한 구조를 반환하되, GPT 호출/파싱 실패 시 예외를 그대로 올립니다.
+    동일 본문(정규화 기준) + 동일 프롬프트 버전이면 캐시된 결과를 반환합니다.
+    로컬 분류기가 확신하는 위험 징후 없는 일기는 LLM 없이 바로 반환합니다.
+    use_classifier=False: 분류기를 건너뛰고 LLM 판정을 받음 (재분석 스크립트용)
+    """
+    if use_classifier:
+        fast = classify_locally(text)
+        if fast is not None:
+            return fast
+
+    cache_key = make_cache_key(text, analysis_namespace())
+    cached = await get_cached_analysis(cache_key)
+    if cached is not None:
+        return cached
+
+    result = await _guarded_request(text)
+    await store_analysis(cache_key, result)
+    return result
+
+
+# --------------------------------------------------
+# ✅ 프롬프트 / 출력 형식
+#   analysis_output_mode
+#   - "json_schema": 구조화 출력(strict 스키마) — 기본
+#   - "json_object": JSON 모드 (스키마 미지원 모델/프록시용)
+#   - "text"       : 예전 방식 (프롬프트로만 JSON 요청)
+# --------------------------------------------------
+RISK_CRITERIA = (
+    "risk_level 기준:\n"
+    "- high: 자살, 죽고 싶다, 끝내고 싶다, 삶을 포기, 해를 입히고 싶다 등의 표현\n"
+    "- moderate: 극심한 무기력, 자책, 절망, '의욕이 없다', '너무 힘들다' 등의 반복적 표현\n"
+    "- mild: 일시적인 우울, 피로감\n"
+    "- none: 위험 징후 없음"
+)
+
+SYSTEM_PROMPT = (
+    "당신은 감정 분석 전문가이자 심리 상담 보조 시스템입니다. "
+    "사용자의 일기를 읽고 감정(label), 감정 강도 1~10(score), 위험 수준(risk_level), "
+    "판단 근거 한두 문장(reason), 따뜻한 한 문장(feedback)을 JSON으로 답하세요.\n"
+    + RISK_CRITERIA
+)
+
+# "text" 모드: 응답 형식 강제 수단이 없으므로 필드 형식을 프롬프트에 명시
+SYSTEM_PROMPT_TEXT = (
+    SYSTEM_PROMPT
+    + "\n\n반드시 아래 형식의 JSON만 출력하고 다른 문장은 출력하지 마세요.\n"
+    '{"label": "행복|슬픔|분노|불안|중립", "score": 1~10, "risk_level": "none|mild|moderate|high", '
+    '"reason": "...", "feedback": "..."}'
+)
+
+_analysis_stats = {"repairs": 0, "invalid": 0}
+
+
+def _response_format():
+    mode = settings.analysis_output_mode
+    if mode == "json_schema":
+        return {"type": "json_schema", "json_schema": EMOTION_ANALYSIS_JSON_SCHEMA}
+    if mode == "json_object":
+        return {"type": "json_object"}
+    return None
+
+
+def build_messages(text: str) -> list:
+    system = SYSTEM_PROMPT_TEXT if settings.analysis_output_mode == "text" else SYSTEM_PROMPT
+    return [
+        {"role": "system", "content": system},
+        {"role": "user", "content": f"일기 내용:\n{text}"},
+    ]
+
+
+def completion_options() -> dict:
+    opts = {
+        "model": settings.openai_model,
+        "temperature": 0.3,
+        "max_tokens": settings.analysis_max_output_tokens,
+    }
+    fmt = _response_format()
+    if fmt is not None:
+        opts["response_format"] = fmt
+    return opts
+
+
+def parse_output(content: str) -> EmotionAnalysisOutput:
+    """모델 응답 → 검증된 출력 (코드블록으로 감싼 응답도 허용). 실패 시 ValidationError"""
+    cleaned = (content or "").strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.strip("`").strip()
+        if cleaned.startswith("json"):
+            cleaned = cleaned[4:]
+    return EmotionAnalysisOutput.model_validate_json(cleaned.strip())
+
+
+def _brief_errors(e: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(str(p) for p in err['loc']) or 'json'}: {err['msg']}" for err in e.errors()[:3])
+
+
+# --------------------------------------------------
+# ✅ 검증된 출력 → 최종 분석 결과 (위험도 보정 + 리소스)
+# --------------------------------------------------
+def refine_risk(text: str, label: str, score: int, risk_level: str) -> str:
+    """모델이 준 위험도를 키워드 사전 + evaluate_risk_level로 보정"""
+    # 키워드 기반 위험 감정 감지 (백업)
+    matched = match_risk_keywords(text)
+    if "high" in matched:
+        risk_level = "high"
+    elif risk_level == "none" and "moderate" in matched:
+        risk_level = "moderate"
+
+    # safety.py 위험도 평가 결과 반영 (선택적)
+    if evaluate_risk_level:
         try:
-            parsed = json.loads(cleaned)
-        except json.JSONDecodeError as e:
-            print(f"⚠️ GPT 응답 JSON 디코딩 실패: {e}")
-            raise ValueError("GPT JSON 파싱 실패")
-
-        # --------------------------------------------------
-        # ✅ 기본값 처리
-        # --------------------------------------------------
-        label = parsed.get("label", "중립")
-        emoji = EMOTION_EMOJI_MAP.get(label, "😐")
-        reason = format_sentence(parsed.get("reason", "분석 실패"))
-        feedback = format_sentence(parsed.get("feedback", "감정을 정확히 인식하지 못했습니다."))
-        risk_level = parsed.get("risk_level", "none").lower()
+            refined = evaluate_risk_level(text, label, score)
+            if refined in ["high", "moderate", "mild"]:
+                risk_level = refined
+        except Exception as e:
+            logger.warning("evaluate_risk_level 호출 실패: %s", e)
+    return risk_level
+
+
+def finalize_analysis(text: str, out: EmotionAnalysisOutput) -> dict:
+    label = out.label
+    score = out.score
+    risk_level = refine_risk(text, label, score, out.risk_level)
+
+    return {
+        "analyzed_emotion": {"label": label, "emoji": EMOTION_EMOJI_MAP.get(label, "😐")},
+        "reason": format_sentence(out.reason),
+        "score": score,
+        "feedback": format_sentence(out.feedback),
+        "risk_level": risk_level,
+        "risk_resources": get_safety_resources(risk_level),  # List[dict]
+        "analysis_version": PROMPT_VERSION,
+        "analysis_source": "llm",
+    }
+
 
+# --------------------------------------------------
+# ✅ GPT 감정 분석 요청 (구조화 출력 + 검증, 형식 오류 시 1회 보정 요청)
+# --------------------------------------------------
+async def _request_analysis(text: str) -> dict:
+    messages = build_messages(text)
+    opts = completion_options()
+
+    started = time.monotonic()
+    response = await create_chat_completion(messages=messages, purpose="emotion_analysis", **opts)
+    content = response.choices[0].message.content or ""
+    usage = usage_of(response)
+    repaired = False
+
+    try:
+        out = parse_output(content)
+    except ValidationError as e:
+        # 같은 대화에 오류를 알려주고 한 번만 다시 요청 (호출 전체를 버리지 않음)
+        _analysis_stats["repairs"] += 1
+        repaired = True
+        logger.warning("GPT 응답 형식 오류 → 보정 요청: %s", _brief_errors(e))
+        repair_messages = messages + [
+            {"role": "assistant", "content": content},
+            {"role": "user", "content": f"응답이 형식에 맞지 않습니다 ({_brief_errors(e)}). 지정한 JSON 형식으로만 다시 답하세요."},
+        ]
+        response = await create_chat_completion(messages=repair_messages, purpose="emotion_analysis.repair", **opts)
+        extra = usage_of(response)
+        usage = {k: usage[k] + extra[k] for k in usage}
         try:
-            score = int(round(float(parsed.get("score", 5))))
-        except (ValueError, TypeError):
-            score = 5
-
-        # --------------------------------------------------
-        # ✅ 키워드 기반 위험 감정 감지 (백업)
-        # --------------------------------------------------
-        text_lower = text.lower()
-        high_keywords = ["죽고 싶", "자살", "끝내고 싶", "없어지고 싶", "살기 싫", "그만 살고"]
-        moderate_keywords = ["너무 힘들", "지쳤", "무기력", "포기", "괴로워", "버티기 힘들"]
-
-        if any(kw in text_lower for kw in high_keywords):
-            risk_level = "high"
-        elif risk_level == "none" and any(kw in text_lower for kw in moderate_keywords):
-            risk_level = "moderate"
-
-        # --------------------------------------------------
-        # ✅ safety.py 위험도 평가 결과 반영 (선택적)
-        # --------------------------------------------------
-        if evaluate_risk_level:
-            try:
-                refined = evaluate_risk_level(text, label, score)
-                if refined in ["high", "moderate", "mild"]:
-                    risk_level = refined
-            except Exception as e:
-                print(f"⚠️ evaluate_risk_level 호출 실패: {e}")
-
-        # --------------------------------------------------
-        # ✅ 리스크별 리소스 추천 추가 (리스트 형태)
-        # --------------------------------------------------
-        risk_resources = get_safety_resources(risk_level)
-
-        # --------------------------------------------------
-        # ✅ 최종 반환 구조
-        # --------------------------------------------------
-        return {
-            "analyzed_emotion": {"label": label, "emoji": emoji},
-            "reason": reason,
-            "score": score,
-            "feedback": feedback,
-            "risk_level": risk_level,
-            "risk_resources": risk_resources,  # List[dict]
-        }
+            out = parse_output(response.choices[0].message.content or "")
+        except ValidationError as e2:
+            _analysis_stats["invalid"] += 1
+            raise ValueError(f"GPT 응답 형식 오류: {_brief_errors(e2)}")
 
-    except Exception as e:
-        print("❌ 감정 분석 실패:", str(e))
-        return {
-            "analyzed_emotion": {"label": "중립", "emoji": "😐"},
-            "reason": "감정 분석에 실패했습니다.",
-            "score": 5,
-            "feedback": "오늘 하루도 수고 많으셨어요.",
-            "risk_level": "none",
-            "risk_resources": get_safety_resources("none"),  # List[dict]
-        }
+    latency_ms = round((time.monotonic() - started) * 1000, 1)
+    logger.info("감정 분석 LLM 응답", extra=hot(
+        latency_ms=latency_ms,
+        prompt_tokens=usage["prompt_tokens"],
+        completion_tokens=usage["completion_tokens"],
+        repaired=repaired,
+        label=out.label,
+        risk_level=out.risk_level,
+    ))
+    return finalize_analysis(text, out)
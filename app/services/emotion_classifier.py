@@ -0,0 +1,150 @@
+# app/services/emotion_classifier.py
+import json
+import logging
+import os
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+from app.services.text_features import hashed_counts
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# ✅ 로컬 감정 분류기 (다항 나이브 베이즈, 해시 글자 2~3-gram)
+#   - LLM이 이미 분석한 일기(analyzed_emotion.label, score)로 학습
+#     → app/scripts/train_emotion_classifier.py
+#   - 모델 파일(.npz) 하나: 라벨, log 사전확률, log 우도(float16), 라벨별 평균 점수
+#   - 점수 = 라벨별 평균 점수를 예측 확률로 가중한 값
+#   - 프로세스당 1회 로드, 추론은 희소 벡터 · 행렬 열 인덱싱 1회 (수십 µs)
+# --------------------------------------------------
+class NaiveBayesEmotion:
+    def __init__(
+        self,
+        labels: List[str],
+        log_prior: np.ndarray,
+        log_likelihood: np.ndarray,
+        mean_scores: np.ndarray,
+        meta: Optional[dict] = None,
+    ):
+        self.labels = list(labels)
+        self.log_prior = log_prior.astype(np.float32)
+        self.log_likelihood = log_likelihood.astype(np.float32)   # (라벨 수, dim)
+        self.mean_scores = mean_scores.astype(np.float32)
+        self.dim = int(log_likelihood.shape[1])
+        self.meta = meta or {}
+
+    # --- 학습
+    @classmethod
+    def fit(
+        cls,
+        samples: Iterable[Tuple[str, str, float]],
+        dim: int = 1 << 15,
+        alpha: float = 0.1,
+        meta: Optional[dict] = None,
+    ) -> "NaiveBayesEmotion":
+        """samples: (본문, 라벨, 점수)"""
+        samples = list(samples)
+        labels = sorted({label for _, label, _ in samples})
+        pos = {label: i for i, label in enumerate(labels)}
+
+        counts = np.zeros((len(labels), dim), dtype=np.float64)
+        docs = np.zeros(len(labels), dtype=np.float64)
+        score_sum = np.zeros(len(labels), dtype=np.float64)
+        for text, label, score in samples:
+            i = pos[label]
+            idx, cnt = hashed_counts(text, dim)
+            np.add.at(counts[i], idx, cnt)
+            docs[i] += 1
+            score_sum[i] += score
+
+        log_prior = np.log(docs / docs.sum())
+        smoothed = counts + alpha
+        log_likelihood = np.log(smoothed / smoothed.sum(axis=1, keepdims=True))
+        return cls(labels, log_prior, log_likelihood, score_sum / np.maximum(docs, 1), meta)
+
+    # --- 추론
+    def predict_proba(self, text: str) -> np.ndarray:
+        idx, cnt = hashed_counts(text, self.dim)
+        logits = self.log_prior + (self.log_likelihood[:, idx] @ cnt if idx.size else 0.0)
+        logits = logits - logits.max()
+        p = np.exp(logits)
+        return p / p.sum()
+
+    @property
+    def overall_score(self) -> float:
+        """학습 셋 전체 평균 점수 (사전확률 가중)"""
+        return float(np.exp(self.log_prior) @ self.mean_scores)
+
+    def predict(self, text: str) -> Tuple[str, float, int]:
+        """(라벨, 확신도, 추정 점수)"""
+        p = self.predict_proba(text)
+        i = int(np.argmax(p))
+        # 점수는 라벨별 평균 점수의 확률 가중 기댓값
+        #   (예측 라벨의 평균만 쓰면 같은 라벨의 답이 모두 같은 점수가 되어 위험도/통계가 뭉개짐)
+        return self.labels[i], float(p[i]), int(round(float(p @ self.mean_scores)))
+
+    # --- 저장/로드
+    def save(self, path: str) -> None:
+        np.savez_compressed(
+            path,
+            labels=np.array(self.labels),
+            log_prior=self.log_prior,
+            log_likelihood=self.log_likelihood.astype(np.float16),
+            mean_scores=self.mean_scores,
+            meta=np.array(json.dumps(self.meta, ensure_ascii=False)),
+        )
+
+    @classmethod
+    def load(cls, path: str) -> "NaiveBayesEmotion":
+        with np.load(path, allow_pickle=False) as f:
+            return cls(
+                [str(x) for x in f["labels"]],
+                f["log_prior"],
+                f["log_likelihood"],
+                f["mean_scores"],
+                json.loads(str(f["meta"])),
+            )
+
+
+# --------------------------------------------------
+# ✅ 프로세스 전역 모델 (최초 사용 시 1회 로드, 파일이 없으면 비활성)
+# --------------------------------------------------
+_model: Optional[NaiveBayesEmotion] = None
+_loaded = False
+_stats = {"answered": 0, "low_confidence": 0, "risky": 0}
+
+
+def get_classifier() -> Optional[NaiveBayesEmotion]:
+    global _model, _loaded
+    if _loaded:
+        return _model
+    _loaded = True
+    path = settings.emotion_classifier_path
+    if not path:
+        return None
+    if not os.path.exists(path):
+        logger.warning("감정 분류기 파일 없음: %s (LLM만 사용)", path)
+        return None
+    try:
+        _model = NaiveBayesEmotion.load(path)
+        logger.info("감정 분류기 로드: %s", path, extra={"fields": {"labels": _model.labels, "dim": _model.dim, **_model.meta}})
+    except Exception as e:
+        logger.warning("감정 분류기 로드 실패: %s (LLM만 사용)", e)
+        _model = None
+    return _model
+
+
+def record(outcome: str) -> None:
+    _stats[outcome] += 1
+
+
+def get_classifier_stats() -> dict:
+    model = get_classifier()
+    return {
+        **_stats,
+        "loaded": model is not None,
+        "min_confidence": settings.emotion_classifier_min_confidence,
+        "meta": model.meta if model else None,
+    }
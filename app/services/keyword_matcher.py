@@ -0,0 +1,115 @@
+# app/services/keyword_matcher.py
+from __future__ import annotations
+
+from collections import deque
+from typing import Dict, Iterable, List, Literal, Set, Tuple
+
+Risk = Literal["none", "mild", "moderate", "high"]
+
+_ORDER = {"none": 0, "mild": 1, "moderate": 2, "high": 3}
+
+# ==================================================
+# ✅ 다중 패턴 키워드 매처 (Aho-Corasick)
+#   - 모듈 로드 시 1회 구축, 본문은 한 번만 훑음
+#   - 비교 전 연속 공백을 한 칸으로 → "죽고 싶" / "죽고  싶" 동일 취급
+#     (공백을 지우면 "피자 살까"가 "자살"에 걸리므로 단어 경계는 유지)
+#   - 띄어쓰기가 있는 키워드는 붙여 쓴 표기도 함께 등록 → "죽고싶"도 매칭
+#   - 영문은 소문자화
+# ==================================================
+def _normalize(s: str) -> str:
+    return " ".join((s or "").split()).lower()
+
+
+def _variants(kw: str) -> Set[str]:
+    spaced = _normalize(kw)
+    return {spaced, spaced.replace(" ", "")} - {""}
+
+
+class KeywordMatcher:
+    def __init__(self, keywords: Dict[str, Iterable[str]]):
+        """keywords: 그룹명(예: 위험도) → 키워드 목록"""
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[str, str]]] = [[]]  # (그룹, 원래 키워드)
+        self.keywords = {g: list(kws) for g, kws in keywords.items()}
+
+        for group, kws in self.keywords.items():
+            for kw in kws:
+                for pattern in _variants(kw):
+                    self._add(pattern, (group, kw))
+        self._build()
+
+    def _add(self, pattern: str, payload: Tuple[str, str]) -> None:
+        if not pattern:
+            return
+        node = 0
+        for ch in pattern:
+            nxt = self._goto[node].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[node][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            node = nxt
+        self._out[node].append(payload)
+
+    def _build(self) -> None:
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, nxt in self._goto[node].items():
+                queue.append(nxt)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                cand = self._goto[f].get(ch, 0)
+                self._fail[nxt] = cand if cand != nxt else 0
+                # 실패 링크의 출력까지 합쳐 두면 탐색 중 링크를 따라갈 필요 없음
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    def find(self, text: str) -> Dict[str, Set[str]]:
+        """그룹 → 매칭된 (원래 표기) 키워드 집합"""
+        goto, fail, out = self._goto, self._fail, self._out
+        found: Dict[str, Set[str]] = {}
+        node = 0
+        for ch in _normalize(text):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for group, kw in out[node]:
+                found.setdefault(group, set()).add(kw)
+        return found
+
+
+# ==================================================
+# ✅ 위험 키워드 사전 (safety / emotion_analysis 공용)
+# ==================================================
+HIGH_KWS = [
+    "자살", "죽고 싶", "끝내고 싶", "없어지고 싶", "살기 싫", "그만 살고",
+    "해치고 싶다", "손목", "베고 싶", "목숨", "극단적 선택"
+]
+MODERATE_KWS = [
+    "너무 힘들", "지쳤", "무기력", "절망", "포기", "버티기 힘들", "괴로워",
+    "살 맛이", "희망이 없", "울고 싶"
+]
+MILD_KWS = [
+    "우울", "슬픔", "불안", "짜증", "걱정", "불편", "회의감", "공허"
+]
+
+RISK_MATCHER = KeywordMatcher({"high": HIGH_KWS, "moderate": MODERATE_KWS, "mild": MILD_KWS})
+
+
+def match_risk_keywords(text: str) -> Dict[str, Set[str]]:
+    """위험도 → 본문에서 발견된 키워드"""
+    return RISK_MATCHER.find(text)
+
+
+def detect_risk(text: str) -> Risk:
+    """가장 높은 위험도 (high → moderate → mild → none)"""
+    found = RISK_MATCHER.find(text)
+    best: Risk = "none"
+    for level in found:
+        if _ORDER[level] > _ORDER[best]:
+            best = level  # type: ignore[assignment]
+    return best
@@ -0,0 +1,216 @@
+# app/services/llm_client.py
+import asyncio
+import time
+from typing import AsyncIterator, Dict, Optional
+
+import httpx
+from openai import AsyncOpenAI
+
+from app.config import settings
+from app.services import metrics
+from app.services.resilience import LatencyTracker
+
+# --------------------------------------------------
+# ✅ 프로세스 전역 비동기 OpenAI 클라이언트
+#   - httpx 커넥션 풀을 재사용 (TLS 핸드셰이크 반복 방지)
+#   - 세마포어로 동시 호출 수 제한 → 이벤트 루프는 막지 않음
+# --------------------------------------------------
+_client: Optional[AsyncOpenAI] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+# 간단한 동시성 지표 (health/metrics 용)
+_stats = {"in_flight": 0, "waiting": 0, "completed": 0, "failed": 0}
+
+
+# --------------------------------------------------
+# ✅ 호출 용도(purpose)별 토큰/지연 집계
+# --------------------------------------------------
+class _PurposeTelemetry:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.latency = LatencyTracker(512)
+        self.first_token = LatencyTracker(512)   # 스트리밍 호출: 첫 토큰까지
+
+    def snapshot(self) -> dict:
+        ok = self.calls - self.errors
+        extra = {}
+        if len(self.first_token):
+            extra = {
+                "first_token_ms_p50": _ms(self.first_token.quantile(0.5, min_samples=1)),
+                "first_token_ms_p95": _ms(self.first_token.quantile(0.95, min_samples=1)),
+            }
+        return {
+            **extra,
+            "calls": self.calls,
+            "errors": self.errors,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "avg_prompt_tokens": round(self.prompt_tokens / ok, 1) if ok else 0.0,
+            "avg_completion_tokens": round(self.completion_tokens / ok, 1) if ok else 0.0,
+            "latency_ms_p50": _ms(self.latency.quantile(0.5, min_samples=1)),
+            "latency_ms_p95": _ms(self.latency.quantile(0.95, min_samples=1)),
+        }
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+_telemetry: Dict[str, _PurposeTelemetry] = {}
+
+llm_duration = metrics.histogram("llm_request_duration_seconds", "LLM 호출 시간 (세마포어 대기 제외)", ("purpose",))
+llm_requests = metrics.counter("llm_requests_total", "LLM 호출 수", ("purpose", "outcome"))
+
+
+def usage_of(response) -> dict:
+    usage = getattr(response, "usage", None)
+    return {
+        "prompt_tokens": getattr(usage, "prompt_tokens", 0) or 0,
+        "completion_tokens": getattr(usage, "completion_tokens", 0) or 0,
+    }
+
+
+def get_llm_client() -> AsyncOpenAI:
+    global _client
+    if _client is None:
+        http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=settings.llm_max_connections,
+                max_keepalive_connections=settings.llm_max_connections,
+                keepalive_expiry=60.0,
+            ),
+            timeout=httpx.Timeout(settings.llm_timeout_seconds, connect=5.0),
+        )
+        _client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            base_url=settings.openai_base_url,
+            timeout=settings.llm_timeout_seconds,
+            max_retries=settings.llm_max_retries,
+            http_client=http_client,
+        )
+    return _client
+
+
+def _get_semaphore() -> asyncio.Semaphore:
+    global _semaphore
+    if _semaphore is None:
+        _semaphore = asyncio.Semaphore(max(1, settings.llm_max_concurrency))
+    return _semaphore
+
+
+# --------------------------------------------------
+# ✅ Chat Completion 호출 (동시성 제한 + 호출별 타임아웃)
+# --------------------------------------------------
+async def create_chat_completion(*, timeout: Optional[float] = None, purpose: str = "default", **kwargs):
+    """
+    chat.completions.create의 비동기 래퍼.
+    - 전역 세마포어로 동시 호출 수를 llm_max_concurrency로 제한
+    - timeout 미지정 시 settings.llm_timeout_seconds 적용
+    - purpose별 토큰 사용량/지연 집계 (세마포어 대기 제외, 실제 호출 시간만)
+    """
+    tel = _telemetry.setdefault(purpose, _PurposeTelemetry())
+    sem = _get_semaphore()
+    _stats["waiting"] += 1
+    try:
+        await sem.acquire()
+    finally:
+        _stats["waiting"] -= 1
+
+    _stats["in_flight"] += 1
+    tel.calls += 1
+    started = time.monotonic()
+    try:
+        response = await get_llm_client().chat.completions.create(
+            timeout=timeout or settings.llm_timeout_seconds,
+            **kwargs,
+        )
+        _stats["completed"] += 1
+        elapsed = time.monotonic() - started
+        tel.latency.add(elapsed)
+        llm_duration.observe(elapsed, purpose)
+        llm_requests.inc(purpose, "ok")
+        usage = usage_of(response)
+        tel.prompt_tokens += usage["prompt_tokens"]
+        tel.completion_tokens += usage["completion_tokens"]
+        return response
+    except Exception:
+        _stats["failed"] += 1
+        tel.errors += 1
+        llm_requests.inc(purpose, "error")
+        raise
+    finally:
+        _stats["in_flight"] -= 1
+        sem.release()
+
+
+# --------------------------------------------------
+# ✅ 스트리밍 Chat Completion (본문 조각을 생성되는 대로 yield)
+#   - 스트림이 끝날 때까지 세마포어 1칸 점유
+#   - 마지막 청크의 usage로 토큰 집계 (stream_options.include_usage)
+# --------------------------------------------------
+async def stream_chat_completion(
+    *, timeout: Optional[float] = None, purpose: str = "default", **kwargs
+) -> AsyncIterator[str]:
+    tel = _telemetry.setdefault(purpose, _PurposeTelemetry())
+    sem = _get_semaphore()
+    _stats["waiting"] += 1
+    try:
+        await sem.acquire()
+    finally:
+        _stats["waiting"] -= 1
+
+    _stats["in_flight"] += 1
+    tel.calls += 1
+    started = time.monotonic()
+    first = True
+    try:
+        stream = await get_llm_client().chat.completions.create(
+            timeout=timeout or settings.llm_timeout_seconds,
+            stream=True,
+            stream_options={"include_usage": True},
+            **kwargs,
+        )
+        async for chunk in stream:
+            if chunk.usage is not None:
+                usage = usage_of(chunk)
+                tel.prompt_tokens += usage["prompt_tokens"]
+                tel.completion_tokens += usage["completion_tokens"]
+            if not chunk.choices:
+                continue
+            delta = chunk.choices[0].delta.content
+            if delta:
+                if first:
+                    tel.first_token.add(time.monotonic() - started)
+                    first = False
+                yield delta
+        _stats["completed"] += 1
+        elapsed = time.monotonic() - started
+        tel.latency.add(elapsed)
+        llm_duration.observe(elapsed, purpose)
+        llm_requests.inc(purpose, "ok")
+    except Exception:
+        _stats["failed"] += 1
+        tel.errors += 1
+        llm_requests.inc(purpose, "error")
+        raise
+    finally:
+        _stats["in_flight"] -= 1
+        sem.release()
+
+
+def get_llm_stats() -> dict:
+    return {
+        **_stats,
+        "max_concurrency": settings.llm_max_concurrency,
+        "by_purpose": {name: t.snapshot() for name, t in _telemetry.items()},
+    }
+
+
+async def close_llm_client():
+    global _client
+    if _client is not None:
+        await _client.close()
+        _client = None
@@ -0,0 +1,321 @@
+# app/services/metrics.py
+import logging
+import threading
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+# ==================================================
+# ✅ Prometheus 텍스트 형식 지표 (외부 라이브러리 없이)
+#   - 기록: 스레드별 샤드(dict)에 자기 스레드만 씀 → 락 없음
+#     (이벤트 루프 스레드, pymongo 모니터 스레드, argon2 풀 스레드가 서로 경합하지 않음)
+#   - 수집(/metrics): 모든 샤드를 복사해 합산 — 스크레이프 때만 비용 발생
+#   - 기존 /health/* 통계(dict)는 수집 시점에 콜백으로 읽어 게이지로 노출
+# ==================================================
+LabelValues = Tuple[str, ...]
+Sample = Tuple[Dict[str, str], float]
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+DB_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+
+_local = threading.local()
+_shards: List[dict] = []
+_shards_lock = threading.Lock()   # 스레드가 처음 기록할 때 샤드 등록에만 사용
+
+
+def _new_shard() -> dict:
+    data = _local.data = {}
+    with _shards_lock:
+        _shards.append(data)
+    return data
+
+
+def _snapshot_shards() -> List[dict]:
+    with _shards_lock:
+        shards = list(_shards)
+    # dict.copy()는 GIL 아래 한 번에 수행 → 다른 스레드가 키를 추가하는 중에도 안전
+    return [s.copy() for s in shards]
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.doc = doc
+        self.labels = tuple(labels)
+
+    def _check(self, values: LabelValues) -> None:
+        # 새 라벨 조합이 처음 기록될 때만 검사 (이후 같은 조합은 dict 조회 1회)
+        if len(values) != len(self.labels) or not all(isinstance(v, str) for v in values):
+            raise ValueError(f"{self.name}: 라벨 {self.labels}에 맞지 않는 값: {values}")
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, *labels: str, amount: float = 1.0) -> None:
+        try:
+            data = _local.data
+        except AttributeError:
+            data = _new_shard()
+        key = (self.name, labels)
+        value = data.get(key)
+        if value is None:
+            self._check(labels)
+            value = 0.0
+        data[key] = value + amount
+
+    def collect(self, shards: List[dict]) -> Iterable[str]:
+        totals: Dict[LabelValues, float] = {}
+        for shard in shards:
+            for (name, values), v in shard.items():
+                if name == self.name:
+                    totals[values] = totals.get(values, 0.0) + v
+        for values, v in sorted(totals.items()):
+            yield f"{self.name}{_fmt_labels(self.labels, values)} {_fmt(v)}"
+
+
+class Gauge(Counter):
+    """inc/dec 합산형 게이지 (진행 중 요청 수 등). 샤드 합 = 현재 값"""
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0) -> None:
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, doc: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        super().__init__(name, doc, labels)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, *labels: str) -> None:
+        try:
+            data = _local.data
+        except AttributeError:
+            data = _new_shard()
+        key = (self.name, labels)
+        cells = data.get(key)
+        if cells is None:
+            self._check(labels)
+            # [버킷별 개수..., +Inf, 합계, 개수] (비누적 — 수집 시 누적)
+            cells = data[key] = [0] * (len(self.buckets) + 1) + [0.0, 0]
+        cells[bisect_left(self.buckets, value)] += 1
+        cells[-2] += value
+        cells[-1] += 1
+
+    def time(self, *labels: str) -> "_Timer":
+        return _Timer(self, labels)
+
+    def collect(self, shards: List[dict]) -> Iterable[str]:
+        totals: Dict[LabelValues, list] = {}
+        for shard in shards:
+            for (name, values), cells in shard.items():
+                if name != self.name:
+                    continue
+                acc = totals.get(values)
+                if acc is None:
+                    totals[values] = list(cells)
+                else:
+                    for i, c in enumerate(cells):
+                        acc[i] += c
+        for values, cells in sorted(totals.items()):
+            running = 0
+            bounds = [_fmt(b) for b in self.buckets] + ["+Inf"]
+            for bound, c in zip(bounds, cells):
+                running += c
+                yield f"{self.name}_bucket{_fmt_labels(self.labels + ('le',), values + (bound,))} {running}"
+            base = _fmt_labels(self.labels, values)
+            yield f"{self.name}_sum{base} {_fmt(cells[-2])}"
+            yield f"{self.name}_count{base} {cells[-1]}"
+
+
+class _Timer:
+    """with histogram.time("label"): ... — 블록 실행 시간을 기록"""
+
+    def __init__(self, hist: Histogram, labels: LabelValues):
+        self._hist = hist
+        self._labels = labels
+
+    def __enter__(self):
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self._hist.observe(time.perf_counter() - self._started, *self._labels)
+        return False
+
+
+# ==================================================
+# ✅ 레지스트리
+# ==================================================
+_metrics: Dict[str, _Metric] = {}
+# 수집 시점 콜백: (이름, 종류, 설명, [(라벨 dict, 값)])
+_collectors: List[Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]] = []
+
+
+def _register(metric: _Metric) -> _Metric:
+    existing = _metrics.get(metric.name)
+    if existing is not None:
+        return existing   # 모듈 재임포트 등으로 같은 이름을 다시 만들면 기존 것을 공유
+    _metrics[metric.name] = metric
+    return metric
+
+
+def counter(name: str, doc: str, labels: Sequence[str] = ()) -> Counter:
+    return _register(Counter(name, doc, labels))
+
+
+def gauge(name: str, doc: str, labels: Sequence[str] = ()) -> Gauge:
+    return _register(Gauge(name, doc, labels))
+
+
+def histogram(name: str, doc: str, labels: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return _register(Histogram(name, doc, labels, buckets))
+
+
+def register_collector(fn: Callable[[], Iterable[Tuple[str, str, str, List[Sample]]]]) -> None:
+    _collectors.append(fn)
+
+
+def register_stats(prefix: str, doc: str, fn: Callable[[], dict], labelled: Optional[Dict[str, str]] = None) -> None:
+    """
+    기존 통계 dict(get_*_stats)를 게이지로 노출.
+    숫자/불리언 값만 사용, 중첩 dict는 이름을 이어 붙임.
+    labelled={"by_purpose": "purpose"} → 해당 dict의 키를 라벨 값으로 사용.
+    """
+    labelled = labelled or {}
+
+    def collect():
+        grouped: Dict[str, List[Sample]] = {}
+        _flatten(prefix, fn(), {}, labelled, grouped)
+        for name, samples in grouped.items():
+            yield name, "gauge", doc, samples
+
+    register_collector(collect)
+
+
+def _flatten(prefix: str, stats: dict, labels: Dict[str, str], labelled: Dict[str, str], out: Dict[str, List[Sample]]) -> None:
+    for key, value in stats.items():
+        name = f"{prefix}_{_sanitize(key)}"
+        if isinstance(value, dict):
+            if key in labelled:
+                for sub_key, sub in value.items():
+                    if isinstance(sub, dict):
+                        _flatten(name, sub, {**labels, labelled[key]: str(sub_key)}, labelled, out)
+            else:
+                _flatten(name, value, labels, labelled, out)
+        elif isinstance(value, bool):
+            out.setdefault(name, []).append((labels, 1.0 if value else 0.0))
+        elif isinstance(value, (int, float)):
+            out.setdefault(name, []).append((labels, float(value)))
+
+
+def enum_samples(current: str, states: Sequence[str]) -> List[Sample]:
+    """상태 문자열 → state 라벨별 0/1 (Prometheus enum 관례)"""
+    return [({"state": s}, 1.0 if s == current else 0.0) for s in states]
+
+
+# ==================================================
+# ✅ HTTP 요청 지표 (순수 ASGI 미들웨어 — BaseHTTPMiddleware의 태스크/큐 비용 없음)
+#   - route 라벨은 실제 경로가 아닌 라우트 템플릿 (/diary/diary/{diary_id}) → 라벨 수 고정
+#   - 스트리밍 응답은 마지막 바이트 전송까지 시간에 포함
+# ==================================================
+http_requests = counter("http_requests_total", "HTTP 요청 수", ("method", "route", "status"))
+http_duration = histogram("http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route"))
+http_exceptions = counter("http_request_exceptions_total", "처리되지 않은 예외로 끝난 요청 수", ("method", "route"))
+http_in_flight = gauge("http_requests_in_flight", "처리 중인 HTTP 요청 수")
+
+
+def _route_label(scope) -> str:
+    route = scope.get("route")
+    path = getattr(route, "path_format", None) or getattr(route, "path", None)
+    return path or "unmatched"
+
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        http_in_flight.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            http_exceptions.inc(scope["method"], _route_label(scope))
+            raise
+        finally:
+            http_in_flight.dec()
+            route = _route_label(scope)
+            http_duration.observe(time.perf_counter() - started, scope["method"], route)
+            http_requests.inc(scope["method"], route, str(status))
+
+
+# ==================================================
+# ✅ 텍스트 형식 출력 (text/plain; version=0.0.4)
+# ==================================================
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def render() -> str:
+    shards = _snapshot_shards()
+    lines: List[str] = []
+    for metric in _metrics.values():
+        lines.append(f"# HELP {metric.name} {metric.doc}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+        lines.extend(metric.collect(shards))
+
+    for fn in _collectors:
+        try:
+            families = list(fn())
+        except Exception as e:
+            # 통계 하나가 실패해도 나머지 지표는 내보냄
+            logger.warning("지표 수집 실패(%s): %s", getattr(fn, "__qualname__", fn), e)
+            continue
+        for name, kind, doc, samples in families:
+            lines.append(f"# HELP {name} {doc}")
+            lines.append(f"# TYPE {name} {kind}")
+            for labels, value in samples:
+                keys = tuple(labels)
+                lines.append(f"{name}{_fmt_labels(keys, tuple(labels[k] for k in keys))} {_fmt(value)}")
+    lines.append("")
+    return "\n".join(lines)
+
+
+def _sanitize(key: str) -> str:
+    return "".join(ch if ch.isalnum() or ch == "_" else "_" for ch in str(key))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in zip(names, values)) + "}"
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
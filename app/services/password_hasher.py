@@ -0,0 +1,101 @@
+# app/services/password_hasher.py
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+
+from passlib.context import CryptContext
+
+from app.config import settings
+from app.services import metrics
+
+# ====================================================
+# ✅ argon2 해시/검증 전용 실행기
+#   - argon2-cffi는 해시 계산 중 GIL을 놓으므로 스레드 풀로 충분
+#   - 이벤트 루프 스레드에서는 계산하지 않음
+#   - 대기열 상한을 넘으면 PasswordHasherBusy (→ 503)
+# ====================================================
+def _argon2_options() -> dict:
+    opts = {}
+    if settings.argon2_time_cost:
+        # 기존 해시의 time_cost가 더 낮으면 needs_update → 로그인 시 재해시
+        opts["argon2__rounds"] = settings.argon2_time_cost
+        opts["argon2__min_rounds"] = settings.argon2_time_cost
+    if settings.argon2_memory_cost:
+        opts["argon2__memory_cost"] = settings.argon2_memory_cost
+    if settings.argon2_parallelism:
+        opts["argon2__parallelism"] = settings.argon2_parallelism
+    return opts
+
+
+pwd_context = CryptContext(schemes=["argon2"], deprecated="auto", **_argon2_options())
+
+_executor = ThreadPoolExecutor(
+    max_workers=max(1, settings.password_hash_workers),
+    thread_name_prefix="argon2",
+)
+_pending = 0
+
+
+class PasswordHasherBusy(RuntimeError):
+    """해시 대기열이 가득 참 (잠시 후 재시도)"""
+
+
+hash_duration = metrics.histogram(
+    "password_hash_duration_seconds", "argon2 해시/검증 시간 (스레드 풀 대기 포함)", ("op",),
+    buckets=(0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+hash_rejected = metrics.counter("password_hash_rejected_total", "대기열 초과로 거절된 해시/검증 수", ("op",))
+
+
+async def _run(op: str, fn, *args):
+    global _pending
+    if _pending >= settings.password_hash_max_queue:
+        hash_rejected.inc(op)
+        raise PasswordHasherBusy("요청이 많아 잠시 후 다시 시도해주세요.")
+    _pending += 1
+    started = time.perf_counter()
+    try:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_executor, fn, *args)
+    finally:
+        _pending -= 1
+        hash_duration.observe(time.perf_counter() - started, op)
+
+
+# ====================================================
+# ✅ 비밀번호 해시
+# ====================================================
+async def hash_password(password: str) -> str:
+    return await _run("hash", pwd_context.hash, password)
+
+
+# ====================================================
+# ✅ 비밀번호 검증 (+ 파라미터 변경 시 새 해시 반환)
+# ====================================================
+def _verify_and_update(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    try:
+        return pwd_context.verify_and_update(password, hashed)
+    except Exception:
+        # 손상된 해시 등 → 검증 실패로 처리
+        return False, None
+
+
+async def verify_and_update_password(password: str, hashed: str) -> Tuple[bool, Optional[str]]:
+    """
+    (일치 여부, 새 해시 또는 None) 반환.
+    새 해시가 있으면 현재 argon2 설정으로 재해시가 필요하다는 뜻.
+    """
+    return await _run("verify", _verify_and_update, password, hashed)
+
+
+def get_hasher_stats() -> dict:
+    return {
+        "pending": _pending,
+        "max_queue": settings.password_hash_max_queue,
+        "workers": settings.password_hash_workers,
+    }
+
+
+def shutdown_hasher() -> None:
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,191 @@
+# app/services/resilience.py
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Awaitable, Callable, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# --------------------------------------------------
+# ✅ 외부 호출 보호 도구 (LLM 감정 분석용)
+#   - CircuitBreaker : 최근 호출 실패/지연 비율이 높으면 일정 시간 호출 자체를 차단
+#   - LatencyTracker : 최근 성공 지연 시간 분위수 (헤징 기준)
+#   - hedged()       : 첫 요청이 p95를 넘기면 두 번째 요청을 보내 먼저 끝난 결과 사용
+# --------------------------------------------------
+class CircuitOpen(RuntimeError):
+    """차단기 열림 → 호출하지 않고 즉시 실패"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"circuit open (retry after {retry_after:.1f}s)")
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    closed    : 정상. 최근 window건 중 실패(예외 또는 SLO 초과) 비율이 failure_rate 이상이면 open
+    open      : open_seconds 동안 즉시 CircuitOpen
+    half_open : 시험 호출 half_open_max_calls건만 허용 → 성공 시 closed, 실패 시 다시 open
+    """
+
+    def __init__(
+        self,
+        name: str,
+        window: int = 20,
+        min_calls: int = 5,
+        failure_rate: float = 0.5,
+        open_seconds: float = 30.0,
+        slo_seconds: Optional[float] = None,
+        half_open_max_calls: int = 1,
+    ):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.slo_seconds = slo_seconds
+        self.half_open_max_calls = max(1, half_open_max_calls)
+
+        self.state = "closed"
+        self._outcomes: deque = deque(maxlen=max(1, window))   # True = 실패
+        self._opened_at = 0.0
+        self._half_open_calls = 0
+        self.stats = {"calls": 0, "failures": 0, "slow": 0, "rejected": 0, "opened": 0}
+
+    # --- 상태
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _open(self) -> None:
+        if self.state != "open":
+            self.stats["opened"] += 1
+            logger.warning("차단기 열림", extra={"fields": {"breaker": self.name, "open_seconds": self.open_seconds}})
+        self.state = "open"
+        self._opened_at = self._now()
+        self._half_open_calls = 0
+
+    def _close(self) -> None:
+        if self.state != "closed":
+            logger.info("차단기 닫힘", extra={"fields": {"breaker": self.name}})
+        self.state = "closed"
+        self._outcomes.clear()
+
+    def allow(self) -> None:
+        """호출 전 확인 (거절 시 CircuitOpen)"""
+        if self.state == "open":
+            remaining = self.open_seconds - (self._now() - self._opened_at)
+            if remaining > 0:
+                self.stats["rejected"] += 1
+                raise CircuitOpen(remaining)
+            self.state = "half_open"
+            self._half_open_calls = 0
+        if self.state == "half_open":
+            if self._half_open_calls >= self.half_open_max_calls:
+                self.stats["rejected"] += 1
+                raise CircuitOpen(1.0)
+            self._half_open_calls += 1
+        self.stats["calls"] += 1
+
+    def record(self, ok: bool, elapsed: Optional[float] = None) -> None:
+        slow = ok and self.slo_seconds is not None and elapsed is not None and elapsed > self.slo_seconds
+        failed = (not ok) or slow
+        if slow:
+            self.stats["slow"] += 1
+        if not ok:
+            self.stats["failures"] += 1
+
+        if self.state == "half_open":
+            if failed:
+                self._open()
+            else:
+                self._close()
+            return
+
+        self._outcomes.append(failed)
+        if len(self._outcomes) >= self.min_calls:
+            rate = sum(self._outcomes) / len(self._outcomes)
+            if rate >= self.failure_rate:
+                self._open()
+
+    async def call(self, fn: Callable[[], Awaitable[T]]) -> T:
+        self.allow()
+        started = self._now()
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            # 호출자 취소는 외부 서비스 상태와 무관
+            if self.state == "half_open":
+                self._half_open_calls = max(0, self._half_open_calls - 1)
+            raise
+        except Exception:
+            self.record(False)
+            raise
+        self.record(True, self._now() - started)
+        return result
+
+    def snapshot(self) -> dict:
+        outcomes = list(self._outcomes)
+        return {
+            "state": self.state,
+            "recent_failure_rate": round(sum(outcomes) / len(outcomes), 3) if outcomes else 0.0,
+            "slo_seconds": self.slo_seconds,
+            **self.stats,
+        }
+
+
+class LatencyTracker:
+    def __init__(self, size: int = 256):
+        self._samples: deque = deque(maxlen=size)
+
+    def add(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def quantile(self, q: float, min_samples: int = 20) -> Optional[float]:
+        if len(self._samples) < min_samples:
+            return None
+        ordered = sorted(self._samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+
+# --------------------------------------------------
+# ✅ 헤지 요청
+# --------------------------------------------------
+async def hedged(
+    fn: Callable[[], Awaitable[T]],
+    delay: Optional[float],
+    on_hedge: Optional[Callable[[], None]] = None,
+) -> T:
+    """
+    fn()을 시작하고 delay초 안에 끝나지 않으면 fn()을 한 번 더 시작.
+    먼저 성공한 결과를 반환하고 나머지는 취소. 둘 다 실패하면 마지막 예외.
+    delay가 None이면 헤지 없이 1회 호출.
+    """
+    if delay is None:
+        return await fn()
+
+    tasks = [asyncio.ensure_future(fn())]
+    try:
+        done, _ = await asyncio.wait(tasks, timeout=delay)
+        if done:
+            return tasks[0].result()
+
+        if on_hedge is not None:
+            on_hedge()
+        tasks.append(asyncio.ensure_future(fn()))
+        pending = set(tasks)
+        error: Optional[BaseException] = None
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error  # type: ignore[misc]
+    finally:
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,164 @@
+# app/services/response_cache.py
+import asyncio
+import logging
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Awaitable, Callable, Optional, Tuple
+
+from pymongo import IndexModel
+
+from app.config import settings
+import app.db.mongo as mongo
+from app.models.data_version import get_data_version
+from app.models.rollup import local_day
+
+logger = logging.getLogger(__name__)
+
+# --------------------------------------------------
+# ✅ 사용자별 응답 캐시 (통계/안전 엔드포인트)
+#   - 키: endpoint + user_id + 사용자 데이터 버전 + 현지 날짜
+#     (일기가 바뀌면 버전이 올라가고, 날짜가 바뀌면 기간 창이 바뀜)
+#   - 같은 키의 동시 요청은 한 번만 계산 (singleflight)
+#   - 백엔드: memory(프로세스 내 LRU) | mongo(워커 간 공유) | off
+# --------------------------------------------------
+RESPONSE_CACHE_COLLECTION = "response_cache"
+INDEXES = [IndexModel("expires_at", name="expires_at_ttl", expireAfterSeconds=0)]
+
+
+class MemoryBackend:
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: "OrderedDict[str, Tuple[datetime, Any]]" = OrderedDict()
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._data.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= datetime.utcnow():
+            self._data.pop(key, None)
+            return None
+        self._data.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        self._data[key] = (datetime.utcnow() + timedelta(seconds=ttl), value)
+        self._data.move_to_end(key)
+        while len(self._data) > self.max_entries:
+            self._data.popitem(last=False)
+
+    def size(self) -> int:
+        return len(self._data)
+
+
+class MongoBackend:
+    """여러 워커가 공유하는 캐시 (expires_at TTL 인덱스로 정리)"""
+
+    def _col(self):
+        if mongo.db is None:
+            raise RuntimeError("❌ MongoDB 연결 전 상태입니다. connect_to_mongo() 실행 필요")
+        return mongo.db[RESPONSE_CACHE_COLLECTION]
+
+    async def get(self, key: str) -> Optional[Any]:
+        doc = await self._col().find_one({"_id": key, "expires_at": {"$gt": datetime.utcnow()}})
+        return doc["value"] if doc else None
+
+    async def set(self, key: str, value: Any, ttl: int) -> None:
+        await self._col().update_one(
+            {"_id": key},
+            {"$set": {"value": value, "expires_at": datetime.utcnow() + timedelta(seconds=ttl)}},
+            upsert=True,
+        )
+
+    def size(self) -> int:
+        return -1
+
+
+def _make_backend():
+    kind = (settings.response_cache_backend or "memory").lower()
+    if kind == "off":
+        return None
+    if kind == "mongo":
+        return MongoBackend()
+    return MemoryBackend(settings.response_cache_max_entries)
+
+
+_backend = _make_backend()
+_inflight: "dict[str, asyncio.Future]" = {}
+_stats = {"hits": 0, "misses": 0, "coalesced": 0, "errors": 0}
+
+
+async def cached_user_response(
+    user_id: str,
+    endpoint: str,
+    compute: Callable[[], Awaitable[Any]],
+    ttl: Optional[int] = None,
+) -> Any:
+    """
+    캐시에 있으면 반환, 없으면 compute() 결과를 저장 후 반환.
+    캐시 백엔드 오류는 무시하고 compute()로 진행합니다.
+    """
+    if _backend is None:
+        return await compute()
+
+    try:
+        version = await get_data_version(user_id)
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning("데이터 버전 조회 실패: %s", e)
+        return await compute()
+
+    key = f"{endpoint}:{user_id}:{version}:{local_day(datetime.utcnow())}"
+
+    try:
+        cached = await _backend.get(key)
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning("응답 캐시 조회 실패: %s", e)
+        cached = None
+    if cached is not None:
+        _stats["hits"] += 1
+        return cached
+
+    # 같은 키를 이미 계산 중이면 결과를 기다림
+    pending = _inflight.get(key)
+    if pending is not None:
+        _stats["coalesced"] += 1
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise  # 이 요청 자체가 취소됨
+            return await compute()  # 계산하던 요청이 취소됨 → 직접 계산
+
+    _stats["misses"] += 1
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
+    try:
+        value = await compute()
+    except asyncio.CancelledError:
+        fut.cancel()
+        raise
+    except Exception as e:
+        fut.set_exception(e)
+        fut.exception()  # 기다리는 쪽이 없을 때 경고 방지
+        raise
+    finally:
+        _inflight.pop(key, None)
+
+    fut.set_result(value)
+    try:
+        await _backend.set(key, value, ttl or settings.response_cache_ttl_seconds)
+    except Exception as e:
+        _stats["errors"] += 1
+        logger.warning("응답 캐시 저장 실패: %s", e)
+    return value
+
+
+def get_response_cache_stats() -> dict:
+    return {
+        **_stats,
+        "backend": settings.response_cache_backend,
+        "entries": _backend.size() if _backend else 0,
+        "inflight": len(_inflight),
+    }
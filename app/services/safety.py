@@ -3,13 +3,17 @@ from __future__ import annotations
 import re
 from typing import Literal
 
+from app.services.keyword_matcher import detect_risk
+
 Risk = Literal["none", "mild", "moderate", "high"]
 
+_WS_RE = re.compile(r"\s+")
+
 # 한글/영문 혼용 대비 간단 정규화
 def _norm(s: str) -> str:
     s = (s or "").strip()
     # 공백 축약 + 소문자화
-    s = re.sub(r"\s+", " ", s)
+    s = _WS_RE.sub(" ", s)
     return s.lower()
 
 # 점수 → 위험도 보정 (감정 강도 기반)
@@ -27,28 +31,12 @@ def _score_to_risk(score: int) -> Risk:
     return "none"
 
 # 키워드 기반 위험 탐지(백업 규칙)
-HIGH_KWS = [
-    "자살", "죽고 싶", "끝내고 싶", "없어지고 싶", "살기 싫", "그만 살고",
-    "해치고 싶다", "손목", "베고 싶", "목숨", "극단적 선택"
-]
-MODERATE_KWS = [
-    "너무 힘들", "지쳤", "무기력", "절망", "포기", "버티기 힘들", "괴로워",
-    "살 맛이", "희망이 없", "울고 싶"
-]
-MILD_KWS = [
-    "우울", "슬픔", "불안", "짜증", "걱정", "불편", "회의감", "공허"
-]
+#   - 사전/매처는 keyword_matcher에서 1회 구축 (emotion_analysis와 공용)
+#   - 공백 변형("죽고싶" / "죽고 싶")도 동일하게 매칭
 
 def _kw_detect(text: str) -> Risk:
-    t = _norm(text)
-    # 우선순위: high → moderate → mild
-    if any(kw in t for kw in HIGH_KWS):
-        return "high"
-    if any(kw in t for kw in MODERATE_KWS):
-        return "moderate"
-    if any(kw in t for kw in MILD_KWS):
-        return "mild"
-    return "none"
+    # 우선순위: high → moderate → mild (단일 패스)
+    return detect_risk(text)
 
 def _label_bias(label: str) -> Risk:
     # 모델 레이블이 강한 부정일 때 약간 가중
@@ -0,0 +1,107 @@
+# app/services/similar_diaries.py
+import asyncio
+from collections import OrderedDict
+from typing import List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+import app.models.diary_vector as vector_model
+from app.models.data_version import get_data_version
+from app.services import text_features
+
+# --------------------------------------------------
+# ✅ "비슷한 지난 일기" 검색
+#   - 사용자 벡터 전체를 TF-IDF 정규화 행렬로 만들어 프로세스 내 LRU에 보관
+#   - 캐시 항목은 사용자 데이터 버전과 함께 저장 → 일기 쓰기(버전 +1) 후 첫 조회에서 재구성
+#     (다른 워커에서 쓴 일기도 버전으로 감지)
+#   - 조회 = 행렬-벡터 곱 1회 (수천 건도 수 ms)
+# --------------------------------------------------
+class _UserIndex(NamedTuple):
+    version: int
+    ids: List[object]
+    positions: dict          # diary _id → 행 번호
+    matrix: np.ndarray       # 행 정규화된 TF-IDF
+    idf: np.ndarray
+
+
+_cache: "OrderedDict[str, _UserIndex]" = OrderedDict()
+# 사용자별 재구성 락 + 대기 중인 코루틴 수 (0이 되면 제거 → 사용자 수만큼 쌓이지 않음)
+_locks: "dict[str, Tuple[asyncio.Lock, int]]" = {}
+_stats = {"hits": 0, "rebuilds": 0, "evictions": 0}
+
+
+def _cache_bytes() -> int:
+    return sum(e.matrix.nbytes for e in _cache.values())
+
+
+def _remember(user_id: str, entry: _UserIndex) -> None:
+    _cache[user_id] = entry
+    _cache.move_to_end(user_id)
+    budget = settings.similar_cache_max_mb * 1024 * 1024
+    while len(_cache) > 1 and (len(_cache) > settings.similar_cache_max_users or _cache_bytes() > budget):
+        _cache.popitem(last=False)
+        _stats["evictions"] += 1
+
+
+def invalidate(user_id: Optional[str] = None) -> None:
+    if user_id is None:
+        _cache.clear()
+    else:
+        _cache.pop(user_id, None)
+
+
+async def _get_index(user_id: str) -> _UserIndex:
+    version = await get_data_version(user_id)
+    entry = _cache.get(user_id)
+    if entry is not None and entry.version == version:
+        _cache.move_to_end(user_id)
+        _stats["hits"] += 1
+        return entry
+
+    # 같은 사용자의 동시 재구성은 한 번만
+    #   락 해제 직후에는 locked()가 False여도 깨어날 대기자가 남아 있을 수 있으므로
+    #   참조 수로 마지막 사용자가 나갈 때만 제거 (그 전에 지우면 새 요청이 다른 락을 만들어 중복 재구성)
+    lock, users = _locks.get(user_id) or (asyncio.Lock(), 0)
+    _locks[user_id] = (lock, users + 1)
+    try:
+        async with lock:
+            entry = _cache.get(user_id)
+            if entry is not None and entry.version == version:
+                _stats["hits"] += 1
+                return entry
+            ids, matrix = await vector_model.load_user_vectors(user_id)
+            # CPU 작업(수천 x 512)은 짧지만 이벤트 루프를 막지 않도록 스레드에서
+            index, idf = await asyncio.to_thread(text_features.build_index, matrix)
+            entry = _UserIndex(version, ids, {oid: i for i, oid in enumerate(ids)}, index, idf)
+            _remember(user_id, entry)
+            _stats["rebuilds"] += 1
+            return entry
+    finally:
+        lock, users = _locks[user_id]
+        if users <= 1:
+            del _locks[user_id]
+        else:
+            _locks[user_id] = (lock, users - 1)
+
+
+async def find_similar(user_id: str, diary_id, text: str, limit: int) -> List[Tuple[object, float]]:
+    """[(diary _id, 코사인 유사도)] — 자기 자신 제외, min_score 미만 제외"""
+    entry = await _get_index(user_id)
+    # 행렬에는 정규화된 값만 있으므로 질의 벡터는 본문에서 다시 계산 (512차원, 수십 µs)
+    query = text_features.vectorize(text)
+    pos = entry.positions.get(diary_id)
+    ranked = text_features.top_k(entry.matrix, entry.idf, query, limit, exclude=pos)
+    return [
+        (entry.ids[i], round(score, 4))
+        for i, score in ranked
+        if score >= settings.similar_min_score
+    ]
+
+
+def get_similar_cache_stats() -> dict:
+    return {
+        **_stats,
+        "users": len(_cache),
+        "bytes": _cache_bytes(),
+    }
@@ -0,0 +1,231 @@
+# app/services/structured_log.py
+import atexit
+import json
+import logging
+import queue
+import random
+import re
+import sys
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional, TextIO
+
+from app.config import settings
+from app.services import metrics
+
+# ==================================================
+# ✅ 구조화 로그 파이프라인 (print 대체)
+#   - 호출 스레드(이벤트 루프): 샘플링/마스킹 + 요청 ID 부착 후 큐에 넣기만 함
+#   - 전용 스레드(QueueListener): JSON 직렬화 + stdout 쓰기 → 로그 드레인이 막혀도 루프는 안 막힘
+#   - 큐가 가득 차면 기다리지 않고 버림 (log_records_dropped_total)
+#
+#   사용:
+#     logger = logging.getLogger(__name__)
+#     logger.info("일기 가져오기 완료", extra={"fields": {"inserted": 10}})
+#     logger.info("LLM 응답", extra=hot(latency_ms=812))   # 고빈도 이벤트 → 샘플링 대상
+# ==================================================
+APP_LOGGER = "app"
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+records_dropped = metrics.counter("log_records_dropped_total", "로그 큐가 가득 차 버린 레코드 수")
+records_sampled_out = metrics.counter("log_records_sampled_out_total", "샘플링으로 생략한 고빈도 로그 수")
+
+_listener: Optional[QueueListener] = None
+
+
+def hot(**fields) -> dict:
+    """고빈도(요청마다) 이벤트용 extra — WARNING 미만이면 log_hot_sample_rate로 샘플링"""
+    return {"fields": fields, "hot": True}
+
+
+# --------------------------------------------------
+# ✅ 필터: 샘플링 / 민감 필드 마스킹 (호출 스레드에서 실행 → 버릴 레코드는 큐에 넣지도 않음)
+# --------------------------------------------------
+class HotPathSampler(logging.Filter):
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = max(0.0, min(1.0, rate))
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if not getattr(record, "hot", False) or record.levelno >= logging.WARNING:
+            return True
+        if self.rate >= 1.0 or random.random() < self.rate:
+            return True
+        records_sampled_out.inc()
+        return False
+
+
+class Redactor(logging.Filter):
+    """fields의 민감 키(본문/피드백/토큰 등)는 길이만 남기고 값을 가림"""
+
+    def __init__(self, keys):
+        super().__init__()
+        self.keys = {k.strip().lower() for k in keys if k.strip()}
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        fields = getattr(record, "fields", None)
+        if fields and self.keys:
+            record.fields = {k: self._mask(k, v) for k, v in fields.items()}
+        return True
+
+    def _mask(self, key: str, value):
+        if key.lower() not in self.keys:
+            return value
+        if isinstance(value, str):
+            return f"<redacted {len(value)} chars>"
+        return "<redacted>"
+
+
+# --------------------------------------------------
+# ✅ 큐 핸들러: 대기 없이 put_nowait, 포맷은 리스너 스레드에서
+# --------------------------------------------------
+class NonBlockingQueueHandler(QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # 기본 prepare는 호출 스레드에서 레코드 복사 + 전체 포맷을 수행
+        # → app 로거의 핸들러는 이것 하나(propagate=False)라 복사 없이 메시지 인자만 확정, 포맷은 리스너로 미룸
+        record.message = record.getMessage()
+        record.msg, record.args = record.message, None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        record.request_id = request_id_var.get()
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            records_dropped.inc()
+
+
+# --------------------------------------------------
+# ✅ 포매터
+# --------------------------------------------------
+_RESERVED = {"ts", "level", "logger", "msg", "request_id", "exc"}
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        body = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+            "request_id": getattr(record, "request_id", None),
+        }
+        for k, v in (getattr(record, "fields", None) or {}).items():
+            body[f"f_{k}" if k in _RESERVED else k] = v
+        if record.exc_text:
+            body["exc"] = record.exc_text
+        return json.dumps(body, ensure_ascii=False, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """로컬 개발용 한 줄 형식"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        ts = datetime.fromtimestamp(record.created).strftime("%H:%M:%S.%f")[:-3]
+        fields = getattr(record, "fields", None)
+        line = f"{ts} {record.levelname:<7} [{getattr(record, 'request_id', None) or '-'}] {record.name}: {record.getMessage()}"
+        if fields:
+            line += " " + " ".join(f"{k}={v}" for k, v in fields.items())
+        if record.exc_text:
+            line += "\n" + record.exc_text
+        return line
+
+
+# --------------------------------------------------
+# ✅ 설치/종료 (main 모듈 로드 시 1회)
+# --------------------------------------------------
+def setup_logging(stream: Optional[TextIO] = None) -> logging.Logger:
+    """app.* 로거에 큐 핸들러를 연결하고 리스너 스레드를 시작 (재호출 시 교체)"""
+    global _listener
+    shutdown_logging()
+
+    sink = logging.StreamHandler(stream or sys.stdout)
+    sink.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+
+    handler = NonBlockingQueueHandler(queue.Queue(maxsize=max(1, settings.log_queue_size)))
+    handler.addFilter(HotPathSampler(settings.log_hot_sample_rate))
+    if settings.log_redact_fields:
+        handler.addFilter(Redactor(settings.log_redact_fields.split(",")))
+
+    logger = logging.getLogger(APP_LOGGER)
+    for h in list(logger.handlers):
+        logger.removeHandler(h)
+    logger.addHandler(handler)
+    logger.setLevel(settings.log_level.upper())
+    logger.propagate = False   # uvicorn/루트 로거 설정과 분리
+
+    _listener = QueueListener(handler.queue, sink, respect_handler_level=True)
+    _listener.start()
+    return logger
+
+
+def shutdown_logging() -> None:
+    """큐에 남은 레코드를 모두 쓰고 리스너 스레드 종료"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+atexit.register(shutdown_logging)
+
+
+# ==================================================
+# ✅ 요청 ID 미들웨어 (순수 ASGI)
+#   - X-Request-ID가 있으면 그대로 사용(형식 검사), 없으면 생성 → 응답 헤더에도 포함
+#   - 요청 안에서 만든 태스크(SSE 분석 등)도 contextvar를 물려받음
+#   - 요청 1건당 access 로그 1줄 (고빈도 이벤트 → 샘플링, 5xx는 항상 기록)
+# ==================================================
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+access_logger = logging.getLogger("app.access")
+
+
+def _incoming_request_id(scope) -> Optional[str]:
+    for name, value in scope.get("headers") or ():
+        if name == b"x-request-id":
+            rid = value.decode("latin-1")
+            return rid if _REQUEST_ID_RE.match(rid) else None
+    return None
+
+
+class RequestIdMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        rid = _incoming_request_id(scope) or uuid.uuid4().hex[:16]
+        token = request_id_var.set(rid)
+        status = 500
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message.setdefault("headers", [])
+                message["headers"] = list(message["headers"]) + [(b"x-request-id", rid.encode("latin-1"))]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            level = logging.WARNING if status >= 500 else logging.INFO
+            if access_logger.isEnabledFor(level):
+                access_logger.log(level, "request", extra=hot(
+                    method=scope["method"],
+                    path=scope["path"],
+                    status=status,
+                    duration_ms=round((time.perf_counter() - started) * 1000, 2),
+                ))
+            request_id_var.reset(token)
@@ -0,0 +1,94 @@
+# app/services/text_features.py
+import math
+import unicodedata
+import zlib
+from collections import Counter
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from app.config import settings
+
+# ==================================================
+# ✅ 로컬 텍스트 벡터 (외부 임베딩 API 없이 "비슷한 일기" 찾기용)
+#   - 공백 제거 본문의 글자 2~3-gram → crc32 해시로 dim 차원에 투영 (hashing trick)
+#   - 저장 값: 1 + log(tf) 가중치 (float32) — 문서 빈도(IDF)는 검색 시 사용자 행렬에서 계산
+#   - 검색: (행렬 * idf) 행 정규화 → 질의 벡터와 내적 = 코사인 유사도
+# ==================================================
+NGRAM_SIZES = (2, 3)
+
+
+def _grams(text: str) -> List[str]:
+    s = "".join(unicodedata.normalize("NFC", text or "").lower().split())
+    return [s[i:i + n] for n in NGRAM_SIZES for i in range(len(s) - n + 1)]
+
+
+def vector_dim() -> int:
+    return settings.similar_vector_dim
+
+
+def vectorize(text: str, dim: Optional[int] = None) -> np.ndarray:
+    """본문 → 해시 n-gram 로그 TF 벡터 (float32, 정규화 전)"""
+    dim = dim or vector_dim()
+    vec = np.zeros(dim, dtype=np.float32)
+    for gram, tf in Counter(_grams(text)).items():
+        h = zlib.crc32(gram.encode("utf-8"))
+        # 상위 비트로 부호를 정해 해시 충돌끼리 서로 상쇄되도록 (부호 해싱)
+        sign = 1.0 if h & 0x80000000 else -1.0
+        vec[h % dim] += sign * (1.0 + math.log(tf))
+    return vec
+
+
+def hashed_counts(text: str, dim: int) -> Tuple[np.ndarray, np.ndarray]:
+    """본문 → (해시 칸 번호, 등장 횟수) 희소 표현 (부호 없음, 분류기 학습/추론용)"""
+    grams = _grams(text)
+    if not grams:
+        return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.float32)
+    idx = np.fromiter((zlib.crc32(g.encode("utf-8")) % dim for g in grams), dtype=np.int64, count=len(grams))
+    uniq, counts = np.unique(idx, return_counts=True)
+    return uniq, counts.astype(np.float32)
+
+
+def to_bytes(vec: np.ndarray) -> bytes:
+    return np.asarray(vec, dtype=np.float32).tobytes()
+
+
+def from_bytes(raw: bytes, dim: Optional[int] = None) -> Optional[np.ndarray]:
+    vec = np.frombuffer(raw, dtype=np.float32)
+    if dim is not None and vec.shape[0] != dim:
+        return None   # 차원 설정이 바뀐 뒤의 옛 벡터 → 재색인 필요
+    return vec
+
+
+# ==================================================
+# ✅ 사용자 행렬 → 검색용 가중 행렬
+# ==================================================
+def build_index(matrix: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    (정규화된 TF-IDF 행렬, idf 벡터)
+    idf = log((1 + N) / (1 + df)) + 1  (해시 칸마다 값이 있는 행 수로 df 계산)
+    """
+    n = matrix.shape[0]
+    df = np.count_nonzero(matrix, axis=0).astype(np.float32)
+    idf = (np.log((1.0 + n) / (1.0 + df)) + 1.0).astype(np.float32)
+    weighted = matrix * idf
+    norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return (weighted / norms).astype(np.float32), idf
+
+
+def top_k(index: np.ndarray, idf: np.ndarray, query: np.ndarray, k: int, exclude: Optional[int] = None) -> List[Tuple[int, float]]:
+    """코사인 유사도 상위 k개 [(행 번호, 점수)] — 행렬-벡터 곱 1회 + argpartition"""
+    if index.shape[0] == 0:
+        return []
+    q = query * idf
+    norm = float(np.linalg.norm(q))
+    if norm == 0.0:
+        return []
+    scores = index @ (q / norm)
+    if exclude is not None:
+        scores[exclude] = -np.inf
+    k = min(k, scores.shape[0])
+    part = np.argpartition(-scores, k - 1)[:k]
+    order = part[np.argsort(-scores[part])]
+    return [(int(i), float(scores[i])) for i in order if np.isfinite(scores[i])]